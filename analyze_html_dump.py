@@ -2,36 +2,62 @@
 Утилита для анализа HTML дампов и поиска элементов по ориентирам
 """
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import soupsieve
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 
-def find_impressions_in_html(html_content: str) -> List[Dict[str, str]]:
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'  # C-парсер, в разы быстрее html.parser на больших дампах
+except ImportError:
+    # Если lxml не установлен, используем встроенный парсер
+    HTML_PARSER = 'html.parser'
+
+
+# Селекторы и регулярные выражения компилируются один раз при импорте
+_DATA_COUNT_ITEMS = soupsieve.compile('div.data-count div.item')
+_NAME_DIVS = soupsieve.compile('div.name')
+_AGE_RE = re.compile(r'(\d{1,2}-\d{1,2})')
+_FIRST_DATE_RE = re.compile(r'([A-Z][a-z]{2}\s+\d{1,2}\s+\d{4})')
+
+
+def parse_html(html_content: str) -> BeautifulSoup:
+    """
+    Разобрать HTML дамп (один раз на файл - результат передается во все find_*_in_html)
+    """
+    return BeautifulSoup(html_content, HTML_PARSER)
+
+
+def _as_soup(html: Union[str, BeautifulSoup]) -> BeautifulSoup:
+    """Принимает строку HTML или уже разобранный документ"""
+    return html if isinstance(html, BeautifulSoup) else parse_html(html)
+
+def find_impressions_in_html(html_content: Union[str, BeautifulSoup]) -> List[Dict[str, str]]:
     """
     Ищет impressions в HTML по структуре:
     <div class="data-count"><div class="item"><p class="value">33</p><p class="caption">Impression</p></div></div>
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = _as_soup(html_content)
     results = []
     
     # Метод 1: Ищем через структуру div.data-count > div.item
-    data_count_divs = soup.find_all('div', class_='data-count')
-    for data_count in data_count_divs:
-        items = data_count.find_all('div', class_='item')
-        for item in items:
-            caption = item.find('p', class_='caption')
-            if caption and 'Impression' in caption.get_text():
-                value_p = item.find('p', class_='value')
-                if value_p:
-                    value_text = value_p.get_text().strip()
-                    results.append({
-                        'method': 'DOM structure (data-count)',
-                        'value': value_text,
-                        'html': str(item)[:200]
-                    })
+    for item in _DATA_COUNT_ITEMS.select(soup):
+        caption = item.find('p', class_='caption')
+        if caption and 'Impression' in caption.get_text():
+            value_p = item.find('p', class_='value')
+            if value_p:
+                value_text = value_p.get_text().strip()
+                results.append({
+                    'method': 'DOM structure (data-count)',
+                    'value': value_text,
+                    'html': str(item)[:200]
+                })
     
     # Метод 2: Ищем div.name с текстом "Impression" и рядом div.value
-    name_divs = soup.find_all('div', class_='name')
+    name_divs = _NAME_DIVS.select(soup)
     for name_div in name_divs:
         name_text = name_div.get_text().strip()
         if 'Impression' in name_text:
@@ -49,13 +75,13 @@ def find_impressions_in_html(html_content: str) -> List[Dict[str, str]]:
     
     return results
 
-def find_script_hook_in_html(html_content: str) -> Dict[str, List[Dict[str, str]]]:
+def find_script_hook_in_html(html_content: Union[str, BeautifulSoup]) -> Dict[str, List[Dict[str, str]]]:
     """
     Ищет Script и Hook в HTML по структуре:
     <span class="tit-text">Scripts</span> или <span class="tit-text">Hooks</span>
     с последующим <p class="content-text slot-wrap">
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = _as_soup(html_content)
     results = {'script': [], 'hook': []}
     
     # Ищем span.tit-text
@@ -92,12 +118,12 @@ def find_script_hook_in_html(html_content: str) -> Dict[str, List[Dict[str, str]
     
     return results
 
-def find_audience_in_html(html_content: str) -> List[Dict[str, str]]:
+def find_audience_in_html(html_content: Union[str, BeautifulSoup]) -> List[Dict[str, str]]:
     """
     Ищет Audience в HTML по структуре:
     <div class="audience-info-info">25-35...Android...</div>
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = _as_soup(html_content)
     results = []
     
     audience_divs = soup.find_all('div', class_='audience-info-info')
@@ -111,7 +137,7 @@ def find_audience_in_html(html_content: str) -> List[Dict[str, str]]:
                 'html': str(div)[:200]
             })
         # Ищем возраст
-        age_match = re.search(r'(\d{1,2}-\d{1,2})', text)
+        age_match = _AGE_RE.search(text)
         if age_match:
             results.append({
                 'method': 'div.audience-info-info (age)',
@@ -121,15 +147,15 @@ def find_audience_in_html(html_content: str) -> List[Dict[str, str]]:
     
     return results
 
-def find_country_in_html(html_content: str) -> List[Dict[str, str]]:
+def find_country_in_html(html_content: Union[str, BeautifulSoup]) -> List[Dict[str, str]]:
     """
     Ищет Country в HTML по структуре:
     <div class="name">Country/Region</div> рядом с <div class="el-tooltip ellipsis">Philippines</div>
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = _as_soup(html_content)
     results = []
     
-    name_divs = soup.find_all('div', class_='name')
+    name_divs = _NAME_DIVS.select(soup)
     for name_div in name_divs:
         name_text = name_div.get_text().strip()
         if 'Country' in name_text or 'Страна' in name_text:
@@ -146,15 +172,15 @@ def find_country_in_html(html_content: str) -> List[Dict[str, str]]:
     
     return results
 
-def find_first_seen_in_html(html_content: str) -> List[Dict[str, str]]:
+def find_first_seen_in_html(html_content: Union[str, BeautifulSoup]) -> List[Dict[str, str]]:
     """
     Ищет First seen в HTML по структуре:
     <div class="name">First seen - Last seen</div> рядом с <div class="value">Nov 07 2025 ~ Nov 13 2025</div>
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = _as_soup(html_content)
     results = []
     
-    name_divs = soup.find_all('div', class_='name')
+    name_divs = _NAME_DIVS.select(soup)
     for name_div in name_divs:
         name_text = name_div.get_text().strip()
         if 'First seen' in name_text:
@@ -164,7 +190,7 @@ def find_first_seen_in_html(html_content: str) -> List[Dict[str, str]]:
                 if value_div:
                     value_text = value_div.get_text().strip()
                     # Извлекаем первую дату
-                    date_match = re.search(r'([A-Z][a-z]{2}\s+\d{1,2}\s+\d{4})', value_text)
+                    date_match = _FIRST_DATE_RE.search(value_text)
                     if date_match:
                         results.append({
                             'method': 'div.name (First seen) + div.value',
@@ -174,19 +200,38 @@ def find_first_seen_in_html(html_content: str) -> List[Dict[str, str]]:
     
     return results
 
-def analyze_html_dump(file_path: Path):
+def collect_html_dump(file_path: Path) -> Dict[str, object]:
+    """
+    Разбирает HTML дамп и ищет все нужные элементы (без вывода - можно запускать в отдельном процессе)
+    """
+    # Разбираем HTML один раз для всех поисков
+    soup = parse_html(file_path.read_text(encoding='utf-8'))
+    return {
+        'impressions': find_impressions_in_html(soup),
+        'script_hook': find_script_hook_in_html(soup),
+        'audience': find_audience_in_html(soup),
+        'country': find_country_in_html(soup),
+        'first_seen': find_first_seen_in_html(soup),
+    }
+
+def analyze_html_dump(file_path: Path, found: Optional[Dict[str, object]] = None):
     """
     Анализирует HTML дамп и ищет все нужные элементы
+    
+    Args:
+        file_path: Путь к HTML дампу
+        found: Уже собранные результаты collect_html_dump (если None - собираются здесь)
     """
+    if found is None:
+        found = collect_html_dump(file_path)
+    
     print(f"\n{'='*80}")
     print(f"Анализ файла: {file_path.name}")
     print(f"{'='*80}\n")
     
-    html_content = file_path.read_text(encoding='utf-8')
-    
     # Ищем impressions
     print("📊 IMPRESSIONS:")
-    impressions = find_impressions_in_html(html_content)
+    impressions = found['impressions']
     if impressions:
         for i, imp in enumerate(impressions, 1):
             print(f"  {i}. Метод: {imp['method']}")
@@ -197,7 +242,7 @@ def analyze_html_dump(file_path: Path):
     
     # Ищем Script и Hook
     print("\n📝 SCRIPT & HOOK:")
-    script_hook = find_script_hook_in_html(html_content)
+    script_hook = found['script_hook']
     if script_hook['script']:
         print("  Script:")
         for i, script in enumerate(script_hook['script'], 1):
@@ -216,7 +261,7 @@ def analyze_html_dump(file_path: Path):
     
     # Ищем Audience
     print("\n👥 AUDIENCE:")
-    audience = find_audience_in_html(html_content)
+    audience = found['audience']
     if audience:
         for i, aud in enumerate(audience, 1):
             print(f"  {i}. Метод: {aud['method']}")
@@ -226,7 +271,7 @@ def analyze_html_dump(file_path: Path):
     
     # Ищем Country
     print("\n🌍 COUNTRY:")
-    country = find_country_in_html(html_content)
+    country = found['country']
     if country:
         for i, cnt in enumerate(country, 1):
             print(f"  {i}. Метод: {cnt['method']}")
@@ -236,7 +281,7 @@ def analyze_html_dump(file_path: Path):
     
     # Ищем First seen
     print("\n📅 FIRST SEEN:")
-    first_seen = find_first_seen_in_html(html_content)
+    first_seen = found['first_seen']
     if first_seen:
         for i, fs in enumerate(first_seen, 1):
             print(f"  {i}. Метод: {fs['method']}")
@@ -246,6 +291,15 @@ def analyze_html_dump(file_path: Path):
     
     print(f"\n{'='*80}\n")
 
+def analyze_html_dumps(files: List[Path]):
+    """
+    Анализирует несколько дампов: разбор HTML (CPU) идет параллельно в процессах,
+    вывод - по порядку файлов
+    """
+    with ProcessPoolExecutor() as pool:
+        for file_path, found in zip(files, pool.map(collect_html_dump, files)):
+            analyze_html_dump(file_path, found)
+
 if __name__ == "__main__":
     # Ищем последний HTML дамп
     html_dir = Path("html_dumps")
@@ -260,21 +314,14 @@ if __name__ == "__main__":
         print("❌ HTML дампы не найдены")
         exit(1)
     
+    # Все файлы - только с флагом --all (разбираются параллельно)
+    if "--all" in sys.argv[1:]:
+        analyze_html_dumps(html_files)
+        exit(0)
+    
     # Анализируем последний файл
     latest_file = html_files[0]
     analyze_html_dump(latest_file)
     
-    # Спрашиваем, анализировать ли все файлы
     if len(html_files) > 1:
-        print(f"\nНайдено {len(html_files)} HTML файлов. Анализировать все? (y/n): ", end="")
-        # Для автоматизации просто анализируем последний
-        # response = input()
-        # if response.lower() == 'y':
-        #     for file in html_files:
-        #         analyze_html_dump(file)
-
-
-
-
-
-
+        print(f"\nНайдено {len(html_files)} HTML файлов. Для анализа всех запустите с флагом --all")
@@ -5,7 +5,8 @@
 
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+from analyze_html_dump import parse_html
 
 def find_elements_in_html(html_file: str, search_terms: list):
     """Найти элементы в HTML по ключевым словам"""
@@ -19,7 +20,7 @@ def find_elements_in_html(html_file: str, search_terms: list):
     with open(html_file, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    soup = BeautifulSoup(content, 'html.parser')
+    soup = parse_html(content)
     
     for term in search_terms:
         print(f"\n{'='*60}")
@@ -6,11 +6,12 @@ import asyncio
 import json
 import random
 import time
+import traceback
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route, TimeoutError as PlaywrightTimeoutError
 
 from . import config
 from . import logger
@@ -18,6 +19,29 @@ from . import logger
 # Глобальный логгер
 log = logger.get_logger("BrowserManager")
 
+# Индикаторы каптч - объединены в один CSS-список селекторов
+_CAPTCHA_INDICATORS = (
+    "iframe[src*='recaptcha']",
+    "iframe[src*='hcaptcha']",
+    ".g-recaptcha",
+    "[data-sitekey]",
+    ':text("Please verify you are human")',
+    ':text("Подтвердите, что вы не робот")',
+)
+_CAPTCHA_SELECTOR = ", ".join(_CAPTCHA_INDICATORS)
+
+# Ключевые слова каптч - одна регулярка без копии страницы в нижнем регистре
+_CAPTCHA_KEYWORDS_PATTERN = r"recaptcha|hcaptcha|verify you are human|подтвердите что вы не робот|captcha"
+
+# Поиск ключевых слов каптч прямо в браузере: наружу возвращается только найденное слово,
+# а не весь HTML страницы
+_CAPTCHA_KEYWORDS_JS = """
+    (pattern) => {
+        const match = document.documentElement.outerHTML.match(new RegExp(pattern, 'i'));
+        return match ? match[0] : null;
+    }
+"""
+
 # User agents для ротации
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -29,6 +53,13 @@ USER_AGENTS = [
 
 # Путь для сохранения cookies
 COOKIES_FILE = config.CONFIG_DIR / "cookies.json"
+# Ресурсы, не нужные для парсинга (текст и атрибуты доступны и без их загрузки).
+# Стили не блокируем: от них зависит видимость элементов (is_visible)
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+_BLOCKED_URL_PARTS = ("google-analytics.com", "googletagmanager.com", "hotjar.com")
+
+# Полное состояние сессии (cookies + localStorage) - новый контекст стартует уже авторизованным
+STORAGE_STATE_FILE = config.CONFIG_DIR / "storage_state.json"
 
 
 class BrowserManager:
@@ -75,7 +106,7 @@ class BrowserManager:
             )
             
             # Создание контекста с реалистичными параметрами
-            self.context = await self.browser.new_context(
+            context_options = dict(
                 user_agent=user_agent,
                 viewport={"width": 1920, "height": 1080},
                 locale="en-US",  # Английский язык для оригинальной версии сайта
@@ -87,6 +118,17 @@ class BrowserManager:
                 java_script_enabled=True,
                 bypass_csp=True,
             )
+            self.context = None
+            if STORAGE_STATE_FILE.exists():
+                try:
+                    self.context = await self.browser.new_context(
+                        **context_options, storage_state=str(STORAGE_STATE_FILE)
+                    )
+                except Exception as e:
+                    # Поврежденный storage_state.json не должен мешать запуску - начинаем без сессии
+                    log.warning(f"Не удалось загрузить сохраненную сессию ({STORAGE_STATE_FILE}): {e}")
+            if self.context is None:
+                self.context = await self.browser.new_context(**context_options)
             
             # Добавляем скрипты для скрытия автоматизации
             await self.context.add_init_script("""
@@ -117,6 +159,26 @@ class BrowserManager:
             log.error(f"Ошибка инициализации браузера: {e}")
             return False
     
+    async def block_heavy_resources(self):
+        """
+        Блокирует загрузку картинок, шрифтов, медиа и аналитики во всем контексте
+        (ускоряет навигацию; для тестовых и отладочных запусков)
+        """
+        if not self.context:
+            return
+        
+        async def handle(route: Route):
+            request = route.request
+            if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+                part in request.url for part in _BLOCKED_URL_PARTS
+            ):
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        await self.context.route("**/*", handle)
+        log.info("✅ Загрузка картинок/шрифтов/медиа и аналитики отключена")
+    
     async def human_delay(self, min_seconds: Optional[float] = None, max_seconds: Optional[float] = None):
         """
         Имитация человеческой задержки (random delay)
@@ -173,6 +235,9 @@ class BrowserManager:
             with open(COOKIES_FILE, 'w', encoding='utf-8') as f:
                 json.dump(cookies, f, indent=2, ensure_ascii=False)
             
+            # Сохраняем и localStorage, чтобы следующий запуск не проходил логин заново
+            await self.context.storage_state(path=str(STORAGE_STATE_FILE))
+            
             log.info(f"✅ Сохранено {len(cookies)} cookies")
             return True
         except Exception as e:
@@ -282,40 +347,20 @@ class BrowserManager:
             return False
         
         try:
-            # Проверка различных индикаторов каптч
-            captcha_indicators = [
-                "iframe[src*='recaptcha']",
-                "iframe[src*='hcaptcha']",
-                ".g-recaptcha",
-                "[data-sitekey]",
-                "text=Please verify you are human",
-                "text=Подтвердите, что вы не робот",
-            ]
-            
-            for selector in captcha_indicators:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        log.warning(f"Обнаружена каптч: {selector}")
-                        return True
-                except:
-                    continue
+            # Все индикаторы каптч одним запросом (один проход по DOM вместо N)
+            try:
+                element = await self.page.query_selector(_CAPTCHA_SELECTOR)
+                if element:
+                    log.warning("Обнаружена каптч: найден элемент каптчи (iframe/контейнер reCAPTCHA, hCaptcha и т.п.)")
+                    return True
+            except Exception as e:
+                log.debug(f"Ошибка при поиске элементов каптч: {e}")
             
             # Проверка по тексту на странице
-            page_text = await self.page.content()
-            captcha_keywords = [
-                "recaptcha",
-                "hcaptcha",
-                "verify you are human",
-                "подтвердите что вы не робот",
-                "captcha",
-            ]
-            
-            page_text_lower = page_text.lower()
-            for keyword in captcha_keywords:
-                if keyword in page_text_lower:
-                    log.warning(f"Обнаружено ключевое слово каптч: {keyword}")
-                    return True
+            keyword = await self.page.evaluate(_CAPTCHA_KEYWORDS_JS, _CAPTCHA_KEYWORDS_PATTERN)
+            if keyword:
+                log.warning(f"Обнаружено ключевое слово каптч: {keyword.lower()}")
+                return True
             
             return False
             
@@ -542,7 +587,6 @@ class BrowserManager:
                 
         except Exception as e:
             log.error(f"Ошибка при авторизации: {e}")
-            import traceback
             log.error(traceback.format_exc())
             # Сохраняем скриншот при ошибке
             try:
@@ -56,6 +56,11 @@ BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
 BROWSER_TIMEOUT = int(os.getenv("BROWSER_TIMEOUT", "30000"))  # 30 секунд
 RANDOM_DELAY_MIN = int(os.getenv("RANDOM_DELAY_MIN", "2"))  # секунды
 RANDOM_DELAY_MAX = int(os.getenv("RANDOM_DELAY_MAX", "5"))  # секунды
+# Пересоздавать страницу каждые N видео (ограничивает рост памяти Chromium)
+PAGE_RECYCLE_EVERY = int(os.getenv("PAGE_RECYCLE_EVERY", "50"))
+
+# Сколько карточек видео обрабатывать параллельно
+CARD_EXTRACT_CONCURRENCY = int(os.getenv("CARD_EXTRACT_CONCURRENCY", "8"))
 
 # Retry настройки
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
@@ -64,6 +69,8 @@ RETRY_DELAY_BASE = int(os.getenv("RETRY_DELAY_BASE", "2"))  # секунды
 # Структура Google Sheets
 SHEET_START_ROW = 3  # Начальная строка для данных (строка 2 - пример, не трогать)
 SHEET_SKIP_COLUMN = "C"  # Столбец C не трогать (для другого ИИ)
+# Перечитывать записанные ячейки для проверки (одним запросом, только для отладки)
+SHEETS_VERIFY_WRITES = os.getenv("SHEETS_VERIFY_WRITES", "false").lower() == "true"
 
 # Столбцы Google Sheets
 SHEET_COLUMNS = {
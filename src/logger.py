@@ -2,15 +2,29 @@
 Логирование - настройка и управление логами
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from .config import LOGS_DIR
 
 
+# Фоновые потоки записи логов (по имени логгера)
+_listeners: Dict[str, QueueListener] = {}
+
+
+@atexit.register
+def _stop_listeners():
+    """Дописывает очереди логов при завершении процесса"""
+    for listener in _listeners.values():
+        listener.stop()
+
+
 def setup_logger(
     name: str = "ProductRadar",
     log_level: str = "INFO",
@@ -32,8 +46,14 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
     
-    # Очищаем существующие обработчики
+    # Очищаем существующие обработчики (и останавливаем прежний поток записи)
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
     logger.handlers.clear()
+    handlers = []
     
     # Формат логов
     formatter = logging.Formatter(
@@ -46,7 +66,7 @@ def setup_logger(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # Логирование в файл
     if log_to_file:
@@ -55,7 +75,15 @@ def setup_logger(
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)  # В файл пишем все уровни
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Запись в консоль/файл - в фоновом потоке, вызов log.* только кладет запись в очередь
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
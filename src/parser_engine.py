@@ -5,10 +5,12 @@ Parser Engine - парсинг данных с Pipiads
 import asyncio
 import re
 import time
+import traceback
+from collections import OrderedDict
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Locator, Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 
 from . import config
 from . import logger
@@ -16,9 +18,322 @@ from . import validator
 
 log = logger.get_logger("ParserEngine")
 
+# XPath ближайшей секции вокруг заголовка поля (li / section / блок *item*).
+# Объединение с ".." дает родителя, если такой секции нет: один запрос
+# возвращает правильную область поиска вместо произвольного родителя.
+_SECTION_XPATH = "xpath=ancestor::*[self::li or self::section or contains(@class, 'item')][1] | .."
+
+# Стоп-слова: текст обрезается по первому вхождению любого из них.
+# Одна альтернация = один проход по строке вместо split() на каждое слово.
+_SCRIPT_STOP_WORDS = (
+    "Hook", "Хук", "Target Audience", "Целевая аудитория",
+    "First seen", "Впервые замечено", "Impressions", "Показы",
+    "Limited Time Offer", "Annual Plan", "Promotion Period", "50% OFF",
+    "Privacy", "Terms", "Copyright", "PIPIADS", "All Rights Reserved",
+    "AI-agent", "cosmobeauty", "credits", "subscription", "invoice",
+    "Monthly Credits", "Extra Credits", "data cost", "detail costs",
+    "Team Setting", "Affiliate Dashboard", "Logout",
+)
+_HOOK_STOP_WORDS = (
+    "Target Audience", "Целевая аудитория", "First seen", "Впервые замечено",
+    "Transcript", "Анализ транскрипта", "Impressions", "Показы",
+    "Limited Time Offer", "Annual Plan", "Promotion Period", "50% OFF",
+    "Privacy", "Terms", "Copyright", "PIPIADS", "All Rights Reserved",
+    "AI-agent", "cosmobeauty", "credits", "subscription", "invoice",
+    "Monthly Credits", "Extra Credits", "data cost", "detail costs",
+    "Team Setting", "Affiliate Dashboard", "Logout",
+)
+_HOOK_SECTION_STOP_WORDS = (
+    "Target Audience", "Целевая аудитория", "First seen", "Впервые замечено",
+    "Impressions", "Показы", "Country", "Страна", "Country/Region", "Страна/регион",
+)
+_SCRIPT_STOP_RE = re.compile("|".join(map(re.escape, _SCRIPT_STOP_WORDS)))
+_HOOK_STOP_RE = re.compile("|".join(map(re.escape, _HOOK_STOP_WORDS)))
+_HOOK_SECTION_STOP_RE = re.compile("|".join(map(re.escape, _HOOK_SECTION_STOP_WORDS)))
+
+
+# Ключевые слова полей страницы ad-search (общие для всех вызовов экстракторов)
+_DATA_KWS = ("Data", "Данные")
+_SCRIPT_KWS = ("Script", "Сценарий", "Transcript", "Анализ транскрипта", "Транскрипт")
+_HOOK_SCRIPT_KWS = ("Script", "Сценарий", "Transcript", "Анализ транскрипта")
+_HOOK_KWS = ("Hooks", "Hook", "Хуки", "Хук")
+_AUDIENCE_KWS = ("Audience", "Аудитория", "Target Audience", "Целевая аудитория")
+_COUNTRY_KWS = ("Country/Region", "Страна/регион", "Country", "Страна", "Region", "Регион")
+_FIRST_SEEN_KWS = ("First seen - Last seen", "First seen", "Впервые замечено", "First Seen")
+_FOOTER_MENU_KWS = (
+    "Privacy", "Terms", "Copyright", "PIPIADS", "AI-agent",
+    "cosmobeauty", "credits", "subscription", "invoice",
+    "Monthly Credits", "Extra Credits", "@gmail.com",
+)
+_METADATA_KWS = (
+    "Video Text Translator", "Translator", "Quality", "Size", "Resolution",
+    "Width", "Height", "Duration", "Format", "Codec", "Frame Rate",
+)
+_SIBLING_METADATA_KWS = _METADATA_KWS[:5]
+_SKIP_LINE_WORDS = ("Tags", "Script", "Hooks", "Tag", "Hook")
+
+
+def _literal_union(words) -> "re.Pattern[str]":
+    """Один проход по тексту вместо any(word in text for word in words)"""
+    return re.compile("|".join(map(re.escape, words)))
+
+
+_FOOTER_MENU_RE = _literal_union(_FOOTER_MENU_KWS)
+_METADATA_RE = _literal_union(_METADATA_KWS)
+_SIBLING_METADATA_RE = _literal_union(_SIBLING_METADATA_KWS)
+_SKIP_LINE_RE = _literal_union(_SKIP_LINE_WORDS)
+
+# Готовые text-селекторы Playwright для каждого ключевого слова
+_KW_TEXT_SELECTORS = {
+    kw: f'text=/{kw}/i'
+    for kw in (_DATA_KWS + _SCRIPT_KWS + _HOOK_KWS + _AUDIENCE_KWS
+               + _COUNTRY_KWS + _FIRST_SEEN_KWS)
+}
+
+# Метаданные видео (Quality, Size, Resolution и т.д.) и разделители "--" в тексте hook
+_HOOK_METADATA_RE = re.compile(
+    r'(?:Quality|Size|Resolution|Width|Height|Duration|Format|Codec|Frame Rate)\s*:?\s*[^\n]*|--',
+    re.IGNORECASE,
+)
+_MULTI_NEWLINE_RE = re.compile(r'\n{2,}')
+
+# Первая ссылка на видео TikTok среди <a href*="tiktok.com">: приоритет m.tiktok.com/v/,
+# затем tiktok.com/v/, затем любая ссылка с /v/ или m.tiktok.com; ссылки на товары пропускаются
+_TIKTOK_VIDEO_HREF_JS = """
+    (links) => {
+        const hrefs = links
+            .map(a => a.getAttribute('href') || '')
+            .filter(h => !h.includes('/view/product') && (h.includes('/v/') || h.includes('m.tiktok.com')));
+        return hrefs.find(h => h.includes('m.tiktok.com/v/'))
+            || hrefs.find(h => h.includes('tiktok.com/v/'))
+            || hrefs[0]
+            || null;
+    }
+"""
+
+# Пары (caption, value) всех счетчиков карточки видео за один вызов
+_CARD_COUNTS_JS = """
+    (items) => items.map(item => {
+        const caption = item.querySelector('p.caption');
+        const value = item.querySelector('p.value');
+        return [caption ? caption.innerText : '', value ? value.innerText : null];
+    })
+"""
+
+# Impressions в разделе Data: ключевые слова и оба падежа сведены в одно выражение
+_IMPRESSION_VALUE_RE = re.compile(r'(?:Impressions?|Показы?)[:\s]*([\d.,]+[KM]?)', re.IGNORECASE)
+
+# То же по снимку текста страницы. Pipiads выводит значение НАД подписью
+# ("Data\n25.7K\nImpression\n144\nLikes"), поэтому берем строку перед "Impression"
+# или форму подсказки "Impression: 25.7K" - иначе захватывается следующее значение (Likes)
+_DATA_SECTION_RE = re.compile(r'^[ \t]*(?:Data|Данные)[ \t]*$', re.MULTILINE)
+_BODY_IMPRESSION_RE = re.compile(
+    r'^[ \t]*([\d.,]+[KM]?)[ \t]*\n[ \t]*(?:Impressions?|Показы?)[ \t]*$'
+    r'|(?:Impressions?|Показы?)[ \t]*:[ \t]*([\d.,]+[KM]?)',
+    re.MULTILINE | re.IGNORECASE,
+)
+# Сколько символов после заголовка Data считать разделом (значения идут сразу за ним)
+_DATA_SECTION_SPAN = 300
+
+# Поиск полей по снимку текста страницы (document.body.innerText) без запросов к браузеру
+_BODY_AUDIENCE_RE = re.compile(
+    r'^[ \t]*(?:Target Audience|Целевая аудитория|Audience|Аудитория)[ \t]*:?[^\d\n]{0,60}?\n?[^\d\n]{0,60}?(\d{1,2}-\d{1,2})',
+    re.MULTILINE,
+)
+_BODY_COUNTRY_RE = re.compile(
+    r'^[ \t]*(?:Country/Region|Страна/регион)[ \t]*:?[ \t]*\n[ \t]*([^\n(]+)',
+    re.MULTILINE | re.IGNORECASE,
+)
+_BODY_FIRST_SEEN_RE = re.compile(
+    r'(?i:First seen|Впервые замечено)[^~]{0,80}?'
+    r'([A-Z][a-z]{2}\s+\d{1,2},?\s+\d{4}|\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})'
+)
+
+# Страны в поле Country/Region одной альтернацией (один проход по тексту вместо ~20).
+# Счетчик "(1)" вне именованной группы; длинные названия раньше коротких (USA до US).
+_COUNTRY_UNION = re.compile(
+    r'\b(?P<name>United States|United Kingdom|USA|US|UK|Philippines|Филиппины|Russia|Россия'
+    r'|China|Китай|India|Индия|Brazil|Бразилия|Germany|Германия|France|Франция)\b'
+    r'(?:\([0-9]+\))?',
+    re.IGNORECASE,
+)
+# Даты First seen ("Oct 27 2025", "Oct 27, 2025", "27 Oct 2025") одним выражением:
+# одна проверка текста вместо трех, первая (самая левая) дата - начало диапазона
+_DATE_RE = re.compile(r'([A-Z][a-z]{2}\s+\d{1,2},?\s+\d{4}|\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})')
+# Быстрая проверка наличия даты перед запуском регулярных выражений
+_MONTH_TOKENS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Возраст аудитории: с подписью (RU/EN) или просто диапазон "25-35"
+_AGE_RANGE_RE = re.compile(r'(\d{1,2}-\d{1,2})')
+_AGE_PATTERNS = (
+    re.compile(r'Возраст[:\s]+(\d{1,2}-\d{1,2})', re.IGNORECASE),
+    re.compile(r'Age[:\s]+(\d{1,2}-\d{1,2})', re.IGNORECASE),
+    _AGE_RANGE_RE,
+)
+
+# Кнопка "More detail" на карточке видео: варианты объединены в один CSS-список,
+# чтобы ждать их одновременно, а не по 5 секунд на каждый.
+# :visible у каждого варианта - иначе скрытое более раннее совпадение
+# перекрывает видимую кнопку (wait_for_selector проверяет только первое)
+_MORE_DETAIL_SELECTORS = (
+    ':text-is("More detail"):visible',
+    ':text-is("More Detail"):visible',
+    'button:has-text("More detail"):visible',
+    'a:has-text("More detail"):visible',
+)
+_MORE_DETAIL_SELECTOR = ", ".join(_MORE_DETAIL_SELECTORS)
+# Текстовые метки блока TikTok Post (английский приоритет, русский fallback)
+_TIKTOK_POST_SELECTORS = ('text=/TikTok Post/i', 'text=/Пост TikTok/i')
+
+# Название и категория внутри карточки товара на странице поиска
+_SEARCH_NAME_SELECTORS = ('h1', 'h2', 'h3', '[class*="title"]', '[class*="name"]', 'a')
+_SEARCH_CATEGORY_SELECTORS = ('[class*="category"]', '[class*="tag"]', 'span')
+
+# Карточки товаров на странице поиска
+_PRODUCT_CARD_SELECTORS = (
+    'a[href*="/tiktok-shop-product/"]',
+    '[class*="product"]',
+    '[class*="card"]',
+    'div[class*="item"]',
+)
+
+# Переключатель языка на странице товара
+_LANG_SELECTORS = (
+    'a[href*="/en/"]',
+    'button:has-text("English")',
+    '[class*="language"]',
+    '[class*="lang"]',
+    'select[name*="lang"]',
+)
+
+# Название товара на странице товара
+_PRODUCT_NAME_SELECTORS = (
+    'h4.pro-title',  # Приоритетный селектор для Pipiads (из example_of_product_page.html)
+    'h4[class*="pro-title"]',
+    'h1:first-of-type',
+    'h1[class*="product"]',
+    'h1[class*="title"]',
+    '[class*="product-title"]',
+    '[class*="product-name"]',
+    '[class*="product_title"]',
+    '[class*="product_name"]',
+    'h1',
+    'h2:first-of-type',
+    '[data-testid*="title"]',
+    '[data-testid*="name"]',
+    '[data-testid*="product-title"]',
+)
+# Служебные слова, по которым текст отбрасывается как не-название
+_PRODUCT_NAME_SKIP_WORDS = (
+    'остаток', 'remain', 'stock', 'месяц', 'month', 'комиссия', 'commission',
+    'tiktok shop product detail', 'category', 'категория', 'view product',
+    'link:', 'delivery type:', 'is affiliate', 'total sold', 'gmv', 'store',
+    'store sold:', 'number of products:', 'average price:', 'commission rate:',
+)
+
+# Категория товара на странице товара
+_PRODUCT_CATEGORY_SELECTORS = (
+    '[class*="category"]',
+    '[class*="tag"]',
+    'span:has-text("Category")',
+    'span:has-text("Категория")',
+    'text=/Category/i',
+    'text=/Категория/i',
+    'div:has-text("Category")',
+    'div:has-text("Категория")',
+)
+
+# Варианты заголовка блока "TikTok Ads" (английский и русский)
+_TIKTOK_ADS_TEXTS = (
+    "TikTok Ads",  # Английский
+    "Реклама ТикТок",  # Русский вариант 1
+    "Реклама TikTok",  # Русский вариант 2
+    "TikTok Реклама",  # Русский вариант 3
+)
+
+# Dropdown сортировки и опция "First seen"
+_SORT_SELECTORS = (
+    'select:has-text("Sort by")',
+    'select',
+    '[class*="sort"]',
+    'text="Sort by: First seen"',
+    'text="Sort by"',
+)
+_SORT_OPTION_SELECTORS = (
+    'text="First seen"',
+    'text="Sort by: First seen"',
+    '[role="option"]:has-text("First seen")',
+)
+
+# Карточки видео в блоке TikTok Ads
+_VIDEO_CARD_SELECTORS = (
+    'li.item-wrap.wt-block-grid__item',  # Основной селектор (из VIDEO_CARDS_STRUCTURE.md)
+    'li.item-wrap',  # Fallback
+    'ul.lists-wrap li.item-wrap',  # С контекстом
+)
+
+# Country и First seen одним page.evaluate: один снимок body.innerText и по одному
+# регулярному выражению на поле (fallback, когда не сработал разбор в Python)
+_EXTRACT_TEXT_FIELDS_JS = """
+    () => {
+        const text = document.body ? document.body.innerText : '';
+        // Ключевое слово поля, затем первая страна в пределах 200 символов
+        const country = text.match(/(?:Country\\/Region|Страна\\/регион|Country|Страна)[\\s\\S]{0,200}?\\b(United States|USA|Philippines|Russia|China|India)(?:\\([0-9]+\\))?/i);
+        // Первая дата после ключевого слова и до "~" (начало диапазона)
+        const firstSeen = text.match(/(?:[Ff]irst [Ss]een|Впервые замечено)[^~]{0,200}?([A-Z][a-z]{2}\\s+\\d{1,2},?\\s+\\d{4}|\\d{1,2}\\s+[A-Z][a-z]{2}\\s+\\d{4})/);
+        return {
+            country: country ? country[1].trim() : null,
+            first_seen: firstSeen ? firstSeen[1].replace(',', '').trim() : null,
+        };
+    }
+"""
+
+
+def _cut_at_stop_word(text: str, stop_re: "re.Pattern[str]") -> str:
+    """Обрезать текст по первому стоп-слову (один проход регулярным выражением)"""
+    match = stop_re.search(text)
+    if match:
+        text = text[:match.start()]
+    return text.strip()
+
+
+def _text_after_first_keyword(text: str, keywords) -> Optional[str]:
+    """
+    Текст после самого раннего вхождения любого из ключевых слов
+    
+    Один str.find на каждое слово вместо цепочки "in" + split.
+    
+    Returns:
+        Остаток строки после ключевого слова или None, если ни одно не найдено
+    """
+    best_kw, best_pos = None, len(text)
+    for kw in keywords:
+        pos = text.find(kw)
+        if 0 <= pos < best_pos:
+            best_kw, best_pos = kw, pos
+    if best_kw is None:
+        return None
+    return text[best_pos + len(best_kw):]
+
+
+# Максимум запомненных значений полей (country/first_seen) по URL страниц ad-search
+FIELD_CACHE_SIZE = 256
+
+# Лимиты ожидания при извлечении country/first_seen: чтение текста секции (мс) и JS fallback (с)
+FIELD_TEXT_TIMEOUT_MS = 500
+FIELD_EVALUATE_TIMEOUT = 1.0
+
 
 class ProductData:
     """Структура данных товара"""
+    # Без __dict__ на каждый товар; _sheets_row/_insufficient_videos/_videos_found
+    # задаются по ходу парсинга и проверяются через hasattr
+    __slots__ = (
+        "product_name", "category", "pipiads_link", "videos",
+        "_all_videos_raw", "_all_filtered_videos",
+        "_sheets_row", "_insufficient_videos", "_videos_found",
+    )
+    
     def __init__(self):
         self.product_name: str = ""
         self.category: str = ""
@@ -35,6 +350,10 @@ class ParserEngine:
     def __init__(self, page: Page):
         self.page = page
         self.browser_manager = None  # Для доступа к human_delay
+        self._video_count = 0  # Счетчик обработанных видео для пересоздания страницы
+        self._locator_cache: Dict[str, Locator] = {}  # text-локаторы по ключевым словам
+        self._text_fields_cache: Optional[tuple] = None  # (url, поля из _EXTRACT_TEXT_FIELDS_JS)
+        self._field_cache: "OrderedDict[tuple, str]" = OrderedDict()  # (url, поле) -> значение
     
     def set_browser_manager(self, browser_manager):
         """Установить ссылку на browser_manager для использования human_delay"""
@@ -48,6 +367,67 @@ class ParserEngine:
             delay = asyncio.sleep(1)  # Fallback
             await delay
     
+    async def _recycle_page_if_needed(self):
+        """
+        Пересоздать страницу после каждых N обработанных видео
+        
+        Chromium копит память (DOM, V8 heap) при долгой навигации одной вкладкой.
+        Новая страница в том же контексте сохраняет cookies и логин.
+        """
+        self._video_count += 1
+        if config.PAGE_RECYCLE_EVERY <= 0 or self._video_count < config.PAGE_RECYCLE_EVERY:
+            return
+        
+        self._video_count = 0
+        try:
+            context = self.page.context
+            new_page = await context.new_page()
+            old_page = self.page
+            self.page = new_page
+            self._locator_cache.clear()  # Локаторы привязаны к старой странице
+            if self.browser_manager:
+                self.browser_manager.page = new_page
+            await old_page.close()
+            log.info("    ♻️ Страница пересоздана после %s видео", config.PAGE_RECYCLE_EVERY)
+        except Exception as e:
+            log.warning("    ⚠️ Не удалось пересоздать страницу: %s", e)
+    
+    def _keyword_locator(self, keyword: str) -> Locator:
+        """
+        Локатор первого элемента с текстом ключевого слова (кэшируется на странице)
+        
+        Локаторы Playwright ленивые и переживают навигацию той же страницы,
+        поэтому кэш сбрасывается только при пересоздании страницы.
+        """
+        locator = self._locator_cache.get(keyword)
+        if locator is None:
+            locator = self.page.locator(_KW_TEXT_SELECTORS[keyword]).first
+            self._locator_cache[keyword] = locator
+        return locator
+    
+    async def _evaluate_text_fields(self) -> Dict[str, Optional[str]]:
+        """
+        Country и First seen одним page.evaluate (результат кэшируется для текущего URL)
+        
+        Returns:
+            Словарь {"country": ..., "first_seen": ...} (None для ненайденных полей)
+        """
+        url = self.page.url
+        if self._text_fields_cache is None or self._text_fields_cache[0] != url:
+            # Ограничиваем время: на еще грузящейся странице не ждем дольше FIELD_EVALUATE_TIMEOUT
+            fields = await asyncio.wait_for(self.page.evaluate(_EXTRACT_TEXT_FIELDS_JS), timeout=FIELD_EVALUATE_TIMEOUT)
+            self._text_fields_cache = (url, fields or {})
+        return self._text_fields_cache[1]
+    
+    def _remember_field(self, key: tuple, value: Optional[str]):
+        """Запомнить найденное значение поля для URL (не больше FIELD_CACHE_SIZE записей)"""
+        if not value:
+            return
+        self._field_cache[key] = value
+        self._field_cache.move_to_end(key)
+        if len(self._field_cache) > FIELD_CACHE_SIZE:
+            self._field_cache.popitem(last=False)
+    
     def normalize_ad_search_url(self, url: str) -> str:
         """
         Нормализовать ad_search_url (убрать параметры запроса, слэш в конце, привести к единому формату)
@@ -120,7 +500,7 @@ class ParserEngine:
         Returns:
             Список словарей с данными товаров: [{"name": "...", "category": "...", "url": "..."}]
         """
-        log.info(f"Получение {count} товаров со страницы поиска...")
+        log.info("Получение %s товаров со страницы поиска...", count)
         
         try:
             # Ждем загрузки страницы (domcontentloaded быстрее, чем networkidle)
@@ -137,13 +517,6 @@ class ParserEngine:
             await self.human_delay(2, 3)
             
             # Ищем карточки товаров - пробуем разные селекторы
-            product_selectors = [
-                'a[href*="/tiktok-shop-product/"]',
-                '[class*="product"]',
-                '[class*="card"]',
-                'div[class*="item"]',
-            ]
-            
             products = []
             product_ids = set()  # Для избежания дубликатов по product_id
             
@@ -155,10 +528,10 @@ class ParserEngine:
                 parts = url_normalized.split('/')
                 return parts[-1] if parts else ""
             
-            for selector in product_selectors:
+            for selector in _PRODUCT_CARD_SELECTORS:
                 try:
                     elements = await self.page.query_selector_all(selector)
-                    log.info(f"🔍 Найдено {len(elements)} элементов с селектором '{selector}'")
+                    log.info("🔍 Найдено %s элементов с селектором '%s'", len(elements), selector)
                     
                     for element in elements:
                         if len(products) >= count:
@@ -189,27 +562,20 @@ class ParserEngine:
                                 product_id = extract_product_id(url)
                                 
                                 if not product_id:
-                                    log.warning(f"⚠️ Не удалось извлечь product_id из URL: {url}")
+                                    log.warning("⚠️ Не удалось извлечь product_id из URL: %s", url)
                                     continue
                                 
                                 # Проверяем, что это новый товар (по product_id)
                                 if product_id in product_ids:
-                                    log.info(f"⏭️  Пропуск дубликата (product_id={product_id}): {url}")
+                                    log.info("⏭️  Пропуск дубликата (product_id=%s): %s", product_id, url)
                                     continue
                                 
                                 product_ids.add(product_id)
-                                log.info(f"   ✅ Добавлен товар #{len(products) + 1}: product_id={product_id}, url={url}")
+                                log.info("   ✅ Добавлен товар #%s: product_id=%s, url=%s", len(products) + 1, product_id, url)
                                 
                                 # Пробуем получить название товара
                                 name = ""
-                                name_selectors = [
-                                    'h1', 'h2', 'h3',
-                                    '[class*="title"]',
-                                    '[class*="name"]',
-                                    'a',
-                                ]
-                                
-                                for name_sel in name_selectors:
+                                for name_sel in _SEARCH_NAME_SELECTORS:
                                     try:
                                         name_elem = await element.query_selector(name_sel)
                                         if name_elem:
@@ -221,13 +587,7 @@ class ParserEngine:
                                 
                                 # Пробуем получить категорию
                                 category = ""
-                                category_selectors = [
-                                    '[class*="category"]',
-                                    '[class*="tag"]',
-                                    'span',
-                                ]
-                                
-                                for cat_sel in category_selectors:
+                                for cat_sel in _SEARCH_CATEGORY_SELECTORS:
                                     try:
                                         cat_elem = await element.query_selector(cat_sel)
                                         if cat_elem:
@@ -245,28 +605,27 @@ class ParserEngine:
                                         "url": url,
                                         "product_id": product_id  # Добавляем product_id для удобства
                                     })
-                                    log.info(f"   📦 Товар {len(products)}: {name[:50] if name else 'N/A'}... (ID: {product_id})")
+                                    log.info("   📦 Товар %s: %s... (ID: %s)", len(products), name[:50] if name else 'N/A', product_id)
                                 
                         except Exception as e:
-                            log.debug(f"Ошибка при обработке элемента: {e}")
+                            log.debug("Ошибка при обработке элемента: %s", e)
                             continue
                     
                     if len(products) >= count:
                         break
                         
                 except Exception as e:
-                    log.debug(f"Ошибка с селектором {selector}: {e}")
+                    log.debug("Ошибка с селектором %s: %s", selector, e)
                     continue
             
             if len(products) < count:
-                log.warning(f"Найдено только {len(products)} товаров из {count} запрошенных")
+                log.warning("Найдено только %s товаров из %s запрошенных", len(products), count)
             
-            log.info(f"✅ Получено {len(products)} товаров")
+            log.info("✅ Получено %s товаров", len(products))
             return products[:count]
             
         except Exception as e:
-            log.error(f"Ошибка при получении товаров: {e}")
-            import traceback
+            log.error("Ошибка при получении товаров: %s", e)
             log.error(traceback.format_exc())
             return []
     
@@ -281,12 +640,13 @@ class ParserEngine:
             ProductData с данными товара и видео
         """
         log.info("=" * 80)
-        log.info(f"🔄 НАЧАЛО ОБРАБОТКИ ТОВАРА")
-        log.info(f"URL: {product_url}")
+        log.info("🔄 НАЧАЛО ОБРАБОТКИ ТОВАРА")
+        log.info("URL: %s", product_url)
         log.info("=" * 80)
         
         product_data = ProductData()
         product_data.pipiads_link = product_url
+        basic_write_task: Optional[asyncio.Task] = None
         
         # Проверка наличия page
         if not self.page:
@@ -297,58 +657,49 @@ class ParserEngine:
             # ШАГ 1: Переход на страницу товара
             log.info("\n📌 ШАГ 1: Переход на страницу товара...")
             try:
-                log.info(f"  → Загрузка страницы: {product_url}")
+                log.info("  → Загрузка страницы: %s", product_url)
                 if not self.page:
                     raise Exception("Page не инициализирован!")
                 await self.page.goto(product_url, wait_until="domcontentloaded", timeout=30000)
                 log.info("  ✅ Страница загружена")
             except Exception as e:
-                log.error(f"  ❌ ОШИБКА при загрузке страницы: {e}")
-                log.error(f"  → Тип ошибки: {type(e).__name__}")
-                import traceback
-                log.error(f"  → Трассировка:\n{traceback.format_exc()}")
+                log.error("  ❌ ОШИБКА при загрузке страницы: %s", e)
+                log.error("  → Тип ошибки: %s", type(e).__name__)
+                log.error("  → Трассировка:\n%s", traceback.format_exc())
                 # Пробуем подождать еще немного и проверить состояние
                 try:
                     await self.human_delay(2, 3)
                     # Проверяем, что страница все еще доступна
                     if self.page:
                         current_url = self.page.url
-                        log.info(f"  → Текущий URL: {current_url}")
+                        log.info("  → Текущий URL: %s", current_url)
                 except Exception as e2:
-                    log.error(f"  ❌ Критическая ошибка: {e2}")
+                    log.error("  ❌ Критическая ошибка: %s", e2)
                     return product_data
             
             try:
                 await self.human_delay(0.5, 1)
             except Exception as e:
-                log.warning(f"  ⚠️ Ошибка при задержке: {e}")
+                log.warning("  ⚠️ Ошибка при задержке: %s", e)
             
             # ШАГ 1.5: Перевод страницы на английский язык
             log.info("\n📌 ШАГ 1.5: Перевод страницы на английский язык...")
             try:
                 current_url = self.page.url
-                log.info(f"  → Текущий URL: {current_url}")
+                log.info("  → Текущий URL: %s", current_url)
                 
                 # Если URL содержит /ru/, заменяем на /en/
                 if "/ru/" in current_url:
                     english_url = current_url.replace("/ru/", "/en/")
-                    log.info(f"  → Переход на английскую версию: {english_url}")
+                    log.info("  → Переход на английскую версию: %s", english_url)
                     await self.page.goto(english_url, wait_until="domcontentloaded", timeout=30000)
                     await self.human_delay(1, 2)
                     log.info("  ✅ Страница переведена на английский")
                 else:
                     # Пробуем найти переключатель языка
                     log.info("  → Поиск переключателя языка...")
-                    lang_selectors = [
-                        'a[href*="/en/"]',
-                        'button:has-text("English")',
-                        '[class*="language"]',
-                        '[class*="lang"]',
-                        'select[name*="lang"]',
-                    ]
-                    
                     lang_found = False
-                    for selector in lang_selectors:
+                    for selector in _LANG_SELECTORS:
                         try:
                             lang_element = await self.page.query_selector(selector)
                             if lang_element:
@@ -356,7 +707,7 @@ class ParserEngine:
                                 if is_visible:
                                     await lang_element.click()
                                     await self.human_delay(1, 2)
-                                    log.info(f"  ✅ Переключатель языка найден и нажат: {selector}")
+                                    log.info("  ✅ Переключатель языка найден и нажат: %s", selector)
                                     lang_found = True
                                     break
                         except:
@@ -365,7 +716,7 @@ class ParserEngine:
                     if not lang_found:
                         log.warning("  ⚠️ Переключатель языка не найден, продолжаем на текущем языке")
             except Exception as e:
-                log.warning(f"  ⚠️ Ошибка при переводе страницы: {e}, продолжаем...")
+                log.warning("  ⚠️ Ошибка при переводе страницы: %s, продолжаем...", e)
             
             # ШАГ 2: Извлечение Product Name
             log.info("\n📌 ШАГ 2: Извлечение Product Name...")
@@ -377,31 +728,14 @@ class ParserEngine:
                 await self.page.evaluate("window.scrollTo(0, 0)")
                 await self.human_delay(0.3, 0.5)
             except Exception as e:
-                log.error(f"  ❌ Ошибка при скролле: {e}")
+                log.error("  ❌ Ошибка при скролле: %s", e)
                 # Продолжаем работу
             
             # Получение названия товара - пробуем больше селекторов и методов
             log.info("  → Поиск названия товара через селекторы...")
             try:
                 # Метод 1: Поиск через селекторы (приоритет)
-                name_selectors = [
-                    'h4.pro-title',  # Приоритетный селектор для Pipiads (из example_of_product_page.html)
-                    'h4[class*="pro-title"]',
-                    'h1:first-of-type',
-                    'h1[class*="product"]',
-                    'h1[class*="title"]',
-                    '[class*="product-title"]',
-                    '[class*="product-name"]',
-                    '[class*="product_title"]',
-                    '[class*="product_name"]',
-                    'h1',
-                    'h2:first-of-type',
-                    '[data-testid*="title"]',
-                    '[data-testid*="name"]',
-                    '[data-testid*="product-title"]',
-                ]
-                
-                for selector in name_selectors:
+                for selector in _PRODUCT_NAME_SELECTORS:
                     try:
                         elements = await self.page.query_selector_all(selector)
                         for element in elements:
@@ -410,18 +744,12 @@ class ParserEngine:
                                 # Фильтруем HTML-разметку и служебные тексты
                                 name_lower = name.lower()
                                 
-                                # Пропускаем если содержит HTML-теги или служебные слова
-                                skip_words = ['остаток', 'remain', 'stock', 'месяц', 'month', 'комиссия', 'commission', 
-                                            'tiktok shop product detail', 'category', 'категория', 'view product', 
-                                            'link:', 'delivery type:', 'is affiliate', 'total sold', 'gmv', 'store',
-                                            'store sold:', 'number of products:', 'average price:', 'commission rate:']
-                                
                                 # Пропускаем если содержит HTML-теги (например, <div>, <span>, <a>)
                                 if '<' in name and '>' in name:
                                     continue
                                 
                                 # Пропускаем если содержит множественные служебные слова (это не название товара)
-                                skip_count = sum(1 for word in skip_words if word in name_lower)
+                                skip_count = sum(1 for word in _PRODUCT_NAME_SKIP_WORDS if word in name_lower)
                                 if skip_count >= 2:
                                     continue
                                 
@@ -429,7 +757,7 @@ class ParserEngine:
                                 if len(name) > 200:
                                     continue
                                 
-                                if any(skip in name_lower for skip in skip_words):
+                                if any(skip in name_lower for skip in _PRODUCT_NAME_SKIP_WORDS):
                                     continue
                                 # Убираем префикс "TikTok Shop Product Detail:" если есть
                                 if "TikTok Shop Product Detail:" in name:
@@ -450,7 +778,7 @@ class ParserEngine:
                                 
                                 product_data.product_name = name.strip()
                                 if len(product_data.product_name) > 5:
-                                    log.info(f"  ✅ Название товара найдено: {product_data.product_name[:50]}...")
+                                    log.info("  ✅ Название товара найдено: %s...", product_data.product_name[:50])
                                     break
                         if product_data.product_name and len(product_data.product_name) > 5:
                             break
@@ -564,11 +892,11 @@ class ParserEngine:
                                 product_name = None
                             if product_name and len(product_name) > 5:
                                 product_data.product_name = product_name
-                                log.info(f"  ✅ Название товара найдено (через JS): {product_data.product_name[:50]}...")
+                                log.info("  ✅ Название товара найдено (через JS): %s...", product_data.product_name[:50])
                     except Exception as e:
-                        log.debug(f"  → Ошибка при поиске через JS: {e}")
+                        log.debug("  → Ошибка при поиске через JS: %s", e)
             except Exception as e:
-                log.error(f"  ❌ Ошибка при извлечении названия товара: {e}")
+                log.error("  ❌ Ошибка при извлечении названия товара: %s", e)
             
             if not product_data.product_name or len(product_data.product_name) <= 5:
                 log.warning("  ⚠️ Название товара не найдено, будет установлено 'N/A'")
@@ -580,18 +908,7 @@ class ParserEngine:
                 log.info("  → Поиск категории товара...")
                 
                 # Метод 1: Поиск через селекторы
-                category_selectors = [
-                    '[class*="category"]',
-                    '[class*="tag"]',
-                    'span:has-text("Category")',
-                    'span:has-text("Категория")',
-                    'text=/Category/i',
-                    'text=/Категория/i',
-                    'div:has-text("Category")',
-                    'div:has-text("Категория")',
-                ]
-                
-                for selector in category_selectors:
+                for selector in _PRODUCT_CATEGORY_SELECTORS:
                     try:
                         elements = await self.page.query_selector_all(selector)
                         for element in elements:
@@ -614,7 +931,7 @@ class ParserEngine:
                                     category = category[:100]
                                 if category and len(category) > 3:
                                     product_data.category = category
-                                    log.info(f"  ✅ Категория найдена: {product_data.category}")
+                                    log.info("  ✅ Категория найдена: %s", product_data.category)
                                     break
                         if product_data.category:
                             break
@@ -661,48 +978,23 @@ class ParserEngine:
                         """)
                         if category and len(category) > 3:
                             product_data.category = category.strip()
-                            log.info(f"  ✅ Категория найдена (через JS): {product_data.category}")
+                            log.info("  ✅ Категория найдена (через JS): %s", product_data.category)
                     except Exception as e:
-                        log.debug(f"  → Ошибка при поиске категории через JS: {e}")
+                        log.debug("  → Ошибка при поиске категории через JS: %s", e)
                 
                 if not product_data.category:
                     log.warning("  ⚠️ Категория не найдена, будет установлена 'N/A'")
                     product_data.category = "N/A"
             except Exception as e:
-                log.error(f"  ❌ Ошибка при извлечении категории: {e}")
+                log.error("  ❌ Ошибка при извлечении категории: %s", e)
                 product_data.category = "N/A"
             
             # ШАГ 3.5: Запись базовых данных в Google Sheets (если sheets_writer передан)
             # ВАЖНО: Если ячейки защищены, пропускаем запись базовых данных и записываем только видео
+            # Запись идет в фоне параллельно с поиском видео; результат нужен только на ШАГЕ 9
             if sheets_writer:
-                log.info("\n📌 ШАГ 3.5: Запись базовых данных в Google Sheets...")
-                try:
-                    row_number = sheets_writer.write_basic_product_data(
-                        product_data.product_name,
-                        product_data.category,
-                        product_data.pipiads_link
-                    )
-                    if row_number > 0:
-                        # Сохраняем номер строки для последующей записи видео
-                        product_data._sheets_row = row_number
-                        log.info(f"  ✅ Базовые данные записаны в Google Sheets (строка {row_number})")
-                    else:
-                        # Если не удалось записать базовые данные (возможно, ячейки защищены),
-                        # находим пустую строку для записи только видео данных
-                        log.warning("  ⚠️ Ошибка при записи базовых данных (возможно, ячейки защищены)")
-                        log.info("  → Находим пустую строку для записи видео данных...")
-                        row_number = sheets_writer.find_next_empty_row()
-                        product_data._sheets_row = row_number
-                        log.info(f"  ✅ Будем записывать видео данные в строку {row_number}")
-                except Exception as e:
-                    log.warning(f"  ⚠️ Ошибка при записи базовых данных: {e}")
-                    # Находим пустую строку для записи только видео
-                    try:
-                        row_number = sheets_writer.find_next_empty_row()
-                        product_data._sheets_row = row_number
-                        log.info(f"  → Будем записывать видео данные в строку {row_number}")
-                    except:
-                        pass
+                log.info("\n📌 ШАГ 3.5: Запись базовых данных в Google Sheets (в фоне)...")
+                basic_write_task = asyncio.create_task(self._write_basic_product_row(sheets_writer, product_data))
             
             # ШАГ 4: Поиск блока "TikTok Ads"
             log.info("\n📌 ШАГ 4: Поиск блока 'TikTok Ads'...")
@@ -715,7 +1007,7 @@ class ParserEngine:
                 # Получаем высоту страницы
                 page_height = await self.page.evaluate("document.body.scrollHeight")
                 viewport_height = await self.page.evaluate("window.innerHeight")
-                log.info(f"  → Высота страницы: {page_height}px, высота viewport: {viewport_height}px")
+                log.info("  → Высота страницы: %spx, высота viewport: %spx", page_height, viewport_height)
                 
                 # Прокручиваем постепенно (как человек)
                 scroll_steps = max(3, page_height // viewport_height)
@@ -725,14 +1017,14 @@ class ParserEngine:
                     scroll_position = scroll_step * (step + 1)
                     await self.page.evaluate(f"window.scrollTo(0, {scroll_position})")
                     await self.human_delay(0.3, 0.5)
-                    log.debug(f"  → Прокрутка: {scroll_position}/{page_height}px")
+                    log.debug("  → Прокрутка: %s/%spx", scroll_position, page_height)
                 
                 # Прокручиваем до самого низа
                 await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 await self.human_delay(1, 2)  # Ждем загрузки контента
                 log.info("  ✅ Страница прокручена вниз")
             except Exception as e:
-                log.warning(f"  ⚠️ Ошибка при прокрутке: {e}, продолжаем...")
+                log.warning("  ⚠️ Ошибка при прокрутке: %s, продолжаем...", e)
             
             log.info("  → Используем текстовый поиск (как Ctrl+F)...")
             tiktok_ads_found = False
@@ -741,17 +1033,9 @@ class ParserEngine:
             # Сначала ждем загрузки контента
             await self.human_delay(0.5, 1)
             
-            # Варианты текста для поиска (английский и русский)
-            tiktok_ads_texts = [
-                "TikTok Ads",  # Английский
-                "Реклама ТикТок",  # Русский вариант 1
-                "Реклама TikTok",  # Русский вариант 2
-                "TikTok Реклама",  # Русский вариант 3
-            ]
-            
             # Пробуем найти блок через локатор с текстом (самый надежный способ)
             log.info("  → Попытка 1: Поиск через Playwright locator...")
-            for text_variant in tiktok_ads_texts:
+            for text_variant in _TIKTOK_ADS_TEXTS:
                 try:
                     # Ищем элемент, содержащий текст (регистронезависимо)
                     locator = self.page.locator(f'text=/{text_variant}/i').first
@@ -762,16 +1046,16 @@ class ParserEngine:
                             await tiktok_ads_element.scroll_into_view_if_needed()
                             await self.human_delay(0.3, 0.5)
                             tiktok_ads_found = True
-                            log.info(f"  ✅ Блок '{text_variant}' найден через Playwright locator")
+                            log.info("  ✅ Блок '%s' найден через Playwright locator", text_variant)
                             break
                 except Exception as e:
-                    log.debug(f"Поиск '{text_variant}' через локатор не удался: {e}")
+                    log.debug("Поиск '%s' через локатор не удался: %s", text_variant, e)
                     continue
             
             # Если не нашли, пробуем через JavaScript поиск (как Ctrl+F)
             if not tiktok_ads_found:
                 log.info("  → Попытка 2: Поиск через JavaScript TreeWalker...")
-                for text_variant in tiktok_ads_texts:
+                for text_variant in _TIKTOK_ADS_TEXTS:
                     try:
                         # Используем JavaScript для поиска элемента с текстом
                         # Экранируем специальные символы для regex
@@ -807,10 +1091,10 @@ class ParserEngine:
                             await element.scroll_into_view_if_needed()
                             await self.human_delay(0.3, 0.5)
                             tiktok_ads_found = True
-                            log.info(f"  ✅ Блок '{text_variant}' найден через JavaScript TreeWalker")
+                            log.info("  ✅ Блок '%s' найден через JavaScript TreeWalker", text_variant)
                             break
                     except Exception as e:
-                        log.debug(f"JavaScript поиск '{text_variant}' не удался: {e}")
+                        log.debug("JavaScript поиск '%s' не удался: %s", text_variant, e)
                         continue
             
             # Если все еще не нашли, пробуем через query_selector
@@ -819,7 +1103,7 @@ class ParserEngine:
                 try:
                     # Пробуем разные варианты текста (английский и русский)
                     text_variants = []
-                    for text in tiktok_ads_texts:
+                    for text in _TIKTOK_ADS_TEXTS:
                         text_variants.extend([
                             f'text="{text}"',
                             f'text={text}',
@@ -836,12 +1120,12 @@ class ParserEngine:
                                     await self.human_delay(0.3, 0.5)
                                     tiktok_ads_found = True
                                     tiktok_ads_element = element
-                                    log.info(f"  ✅ Блок найден через query_selector: {variant}")
+                                    log.info("  ✅ Блок найден через query_selector: %s", variant)
                                     break
                         except:
                             continue
                 except Exception as e:
-                    log.debug(f"Query selector поиск не удался: {e}")
+                    log.debug("Query selector поиск не удался: %s", e)
             
             # Попытка 4: Если все еще не нашли, пробуем прокрутить еще раз и поискать снова
             if not tiktok_ads_found:
@@ -860,7 +1144,7 @@ class ParserEngine:
                         await self.human_delay(0.2, 0.3)
                         
                         # Пробуем найти на каждой позиции (все варианты текста)
-                        for text_variant in tiktok_ads_texts:
+                        for text_variant in _TIKTOK_ADS_TEXTS:
                             try:
                                 # Заменяем пробелы на \s+ для regex
                                 regex_pattern = text_variant.replace(" ", "\\s+")
@@ -871,7 +1155,7 @@ class ParserEngine:
                                         await tiktok_ads_element.scroll_into_view_if_needed()
                                         await self.human_delay(0.3, 0.5)
                                         tiktok_ads_found = True
-                                        log.info(f"  ✅ Блок '{text_variant}' найден при прокрутке на позиции {scroll_pos}px")
+                                        log.info("  ✅ Блок '%s' найден при прокрутке на позиции %spx", text_variant, scroll_pos)
                                         break
                             except:
                                 continue
@@ -885,7 +1169,7 @@ class ParserEngine:
                         await self.human_delay(1, 2)
                         
                         # Последняя попытка поиска (все варианты текста)
-                        for text_variant in tiktok_ads_texts:
+                        for text_variant in _TIKTOK_ADS_TEXTS:
                             try:
                                 # Заменяем пробелы на \s+ для regex
                                 regex_pattern = text_variant.replace(" ", "\\s+")
@@ -896,23 +1180,25 @@ class ParserEngine:
                                         await tiktok_ads_element.scroll_into_view_if_needed()
                                         await self.human_delay(0.3, 0.5)
                                         tiktok_ads_found = True
-                                        log.info(f"  ✅ Блок '{text_variant}' найден в самом низу страницы")
+                                        log.info("  ✅ Блок '%s' найден в самом низу страницы", text_variant)
                                         break
                             except:
                                 continue
                 except Exception as e:
-                    log.debug(f"Повторная прокрутка не помогла: {e}")
+                    log.debug("Повторная прокрутка не помогла: %s", e)
             
             if not tiktok_ads_found:
                 log.error("  ❌ Блок 'TikTok Ads' не найден после всех попыток")
                 # Сохраняем скриншот для отладки
                 try:
-                    screenshot_path = config.SCREENSHOTS_DIR / f"tiktok_ads_not_found_{int(time.time())}.png"
-                    await self.page.screenshot(path=str(screenshot_path), full_page=True)
-                    log.info(f"  📸 Скриншот сохранен: {screenshot_path}")
+                    # Только видимая область в JPEG: полностраничный PNG длинной страницы снимается секунды
+                    screenshot_path = config.SCREENSHOTS_DIR / f"tiktok_ads_not_found_{int(time.time())}.jpg"
+                    await self.page.screenshot(path=str(screenshot_path), type="jpeg", quality=60, timeout=5000)
+                    log.info("  📸 Скриншот сохранен: %s", screenshot_path)
                 except:
                     pass
                 log.error("  ❌ Остановка обработки: блок 'TikTok Ads' не найден")
+                await self._finish_task(basic_write_task)
                 return product_data
             
             log.info("  ✅ Блок 'TikTok Ads' успешно найден")
@@ -926,40 +1212,41 @@ class ParserEngine:
             # ШАГ 6: Получение списка видео
             log.info("\n📌 ШАГ 6: Получение списка видео из блока 'TikTok Ads'...")
             videos = await self._get_videos_from_tiktok_ads_block()
-            log.info(f"  → Найдено {len(videos)} видео в блоке")
+            log.info("  → Найдено %s видео в блоке", len(videos))
             
             # ШАГ 7: Фильтрация видео и сохранение ВСЕХ подходящих в памяти
-            log.info(f"\n📌 ШАГ 7: Фильтрация видео (impression >= {config.MIN_IMPRESSIONS}, дата <= {config.DAYS_BACK} дней)...")
+            log.info("\n📌 ШАГ 7: Фильтрация видео (impression >= %s, дата <= %s дней)...", config.MIN_IMPRESSIONS, config.DAYS_BACK)
             
             # Сохраняем ВСЕ видео (для аналитики) в ProductData
             product_data._all_videos_raw = videos[:20]  # Сохраняем первые 20 для аналитики
             
             # Фильтруем ВСЕ подходящие видео (не только топ-3)
             all_filtered_videos = await self._filter_videos_all(videos)
-            log.info(f"  → После фильтрации: {len(all_filtered_videos)} подходящих видео")
+            log.info("  → После фильтрации: %s подходящих видео", len(all_filtered_videos))
             
             # Сохраняем ВСЕ подходящие видео в памяти для последующего выбора топ-3
             product_data._all_filtered_videos = all_filtered_videos
             
             # ВАЖНО: Если после фильтрации 0 видео - пропускаем товар
             if len(all_filtered_videos) == 0:
-                log.warning(f"  ⚠️ После фильтрации не осталось подходящих видео (>= {config.MIN_IMPRESSIONS} impressions, <= {config.DAYS_BACK} дней)")
-                log.warning(f"  ⚠️ Товар будет пропущен")
+                log.warning("  ⚠️ После фильтрации не осталось подходящих видео (>= %s impressions, <= %s дней)", config.MIN_IMPRESSIONS, config.DAYS_BACK)
+                log.warning("  ⚠️ Товар будет пропущен")
                 # Возвращаем специальный статус для пропуска товара
                 product_data._insufficient_videos = True
                 product_data._videos_found = len(videos)
+                await self._finish_task(basic_write_task)
                 return product_data
             
             # Выбираем топ-3 из всех подходящих видео (сортировка: сначала по дате, потом по impression)
             filtered_videos = self._select_top_videos(all_filtered_videos, top_n=3)
-            log.info(f"  → Выбрано топ-3 видео из {len(all_filtered_videos)} подходящих")
+            log.info("  → Выбрано топ-3 видео из %s подходящих", len(all_filtered_videos))
             
             # ШАГ 8: Получение детальных метрик для каждого видео
-            log.info(f"\n📌 ШАГ 8: Получение детальных метрик для видео...")
+            log.info("\n📌 ШАГ 8: Получение детальных метрик для видео...")
             
             # Сохраняем URL страницы товара для возврата после каждого видео
             product_page_url = self.page.url
-            log.info(f"  → Сохранен URL страницы товара: {product_page_url}")
+            log.info("  → Сохранен URL страницы товара: %s", product_page_url)
             
             # Бан-лист для обработанных видео (по нормализованному ad_search_url)
             # ВАЖНО: Бан-лист очищается в начале обработки каждого товара (создается заново здесь)
@@ -969,7 +1256,7 @@ class ParserEngine:
             # Выбираем топ-3 из всех подходящих видео (уже отсортированы и дедуплицированы)
             # Это список видео, которые мы будем обрабатывать по прямой ссылке
             top_videos_to_process = filtered_videos[:video_count]
-            log.info(f"  → Подготовлено {len(top_videos_to_process)} видео для обработки")
+            log.info("  → Подготовлено %s видео для обработки", len(top_videos_to_process))
             
             # Обрабатываем видео из списка топ-3
             for video_index, video in enumerate(top_videos_to_process, 1):
@@ -977,7 +1264,7 @@ class ParserEngine:
                 if len(product_data.videos) >= video_count:
                     break
                 
-                log.info(f"\n  🎬 Обработка видео {video_index}/{len(top_videos_to_process)}...")
+                log.info("\n  🎬 Обработка видео %s/%s...", video_index, len(top_videos_to_process))
                 
                 # Нормализуем ad_search_url для проверки дубликатов
                 video_ad_search_url = video.get("ad_search_url", "")
@@ -986,25 +1273,25 @@ class ParserEngine:
                     
                     # Проверяем бан-лист (дополнительная проверка)
                     if video_ad_search_url in processed_videos:
-                        log.warning(f"  ⏭️  Видео {video_index} пропущено: уже обработано (ad_search_url={video_ad_search_url})")
+                        log.warning("  ⏭️  Видео %s пропущено: уже обработано (ad_search_url=%s)", video_index, video_ad_search_url)
                         continue
                 
-                log.info(f"    → Impression: {video.get('impression', 0)}, First seen: {video.get('first_seen', 'N/A')}")
+                log.info("    → Impression: %s, First seen: %s", video.get('impression', 0), video.get('first_seen', 'N/A'))
                 if video_ad_search_url:
-                    log.info(f"    → Ad-search URL: {video_ad_search_url}")
+                    log.info("    → Ad-search URL: %s", video_ad_search_url)
                 
                 # ВАЖНО: Убеждаемся, что мы на странице товара перед переходом на ad-search
                 # (для первого видео мы уже на странице товара, для последующих - возвращаемся)
                 if video_index > 1:
                     current_url = self.page.url
                     if "/ad-search/" in current_url or current_url != product_page_url:
-                        log.info(f"    → Возврат на страницу товара перед обработкой видео {video_index}...")
+                        log.info("    → Возврат на страницу товара перед обработкой видео %s...", video_index)
                         try:
                             await self.page.goto(product_page_url, wait_until="domcontentloaded", timeout=30000)
                             await self.human_delay(1, 2)
-                            log.info(f"    ✅ Возврат на страницу товара успешен")
+                            log.info("    ✅ Возврат на страницу товара успешен")
                         except Exception as e:
-                            log.error(f"    ❌ Ошибка при возврате на страницу товара: {e}")
+                            log.error("    ❌ Ошибка при возврате на страницу товара: %s", e)
                             # Продолжаем обработку даже при ошибке возврата
                 
                 # Обработка видео (переход на ad-search и извлечение данных)
@@ -1016,19 +1303,20 @@ class ParserEngine:
                     # Добавляем в бан-лист после успешной обработки
                     if video_ad_search_url:
                         processed_videos.add(video_ad_search_url)
-                        log.info(f"    ✅ Видео {video_index} обработано успешно и добавлено в бан-лист")
+                        log.info("    ✅ Видео %s обработано успешно и добавлено в бан-лист", video_index)
                     else:
-                        log.info(f"    ✅ Видео {video_index} обработано успешно")
+                        log.info("    ✅ Видео %s обработано успешно", video_index)
                 else:
-                    log.warning(f"    ⚠️ Не удалось получить детали для видео {video_index}")
+                    log.warning("    ⚠️ Не удалось получить детали для видео %s", video_index)
                     # Добавляем в бан-лист даже при ошибке, чтобы не пытаться обработать снова
                     if video_ad_search_url:
                         processed_videos.add(video_ad_search_url)
                 
                 # ВАЖНО: Возврат на страницу товара после обработки КАЖДОГО видео (кроме последнего, если это последнее)
                 # Это нужно для того, чтобы после обработки всех видео скрипт был на странице товара, а не на ad-search
-                if video_index < len(top_videos_to_process):
-                    log.info(f"    → Возврат на страницу товара после обработки видео {video_index}...")
+                # Если нужное количество видео уже набрано, следующих не будет - возврат не нужен
+                if video_index < len(top_videos_to_process) and len(product_data.videos) < video_count:
+                    log.info("    → Возврат на страницу товара после обработки видео %s...", video_index)
                     try:
                         await self.page.goto(product_page_url, wait_until="domcontentloaded", timeout=30000)
                         await self.human_delay(1, 2)
@@ -1036,23 +1324,23 @@ class ParserEngine:
                         # Ждем загрузки блока TikTok Ads (чтобы можно было обработать следующее видео)
                         try:
                             await self.page.wait_for_selector('a[href*="/ad-search/"]', timeout=10000, state="visible")
-                            log.info(f"    ✅ Возврат на страницу товара успешен (видео {video_index})")
+                            log.info("    ✅ Возврат на страницу товара успешен (видео %s)", video_index)
                         except:
-                            log.warning(f"    ⚠️ Блок TikTok Ads не найден после возврата, продолжаем...")
+                            log.warning("    ⚠️ Блок TikTok Ads не найден после возврата, продолжаем...")
                     except Exception as e:
-                        log.error(f"    ❌ Ошибка при возврате на страницу товара: {e}")
+                        log.error("    ❌ Ошибка при возврате на страницу товара: %s", e)
                         # Продолжаем работу даже при ошибке возврата
                     
                     await self.human_delay(0.5, 1)
                 else:
                     # После последнего видео тоже возвращаемся на страницу товара
-                    log.info(f"    → Возврат на страницу товара после обработки последнего видео {video_index}...")
+                    log.info("    → Возврат на страницу товара после обработки последнего видео %s...", video_index)
                     try:
                         await self.page.goto(product_page_url, wait_until="domcontentloaded", timeout=30000)
                         await self.human_delay(1, 2)
-                        log.info(f"    ✅ Возврат на страницу товара успешен (последнее видео {video_index})")
+                        log.info("    ✅ Возврат на страницу товара успешен (последнее видео %s)", video_index)
                     except Exception as e:
-                        log.warning(f"    ⚠️ Ошибка при возврате на страницу товара: {e}")
+                        log.warning("    ⚠️ Ошибка при возврате на страницу товара: %s", e)
             
             # Заполняем N/A для отсутствующих видео (нужно 3 видео)
             while len(product_data.videos) < video_count:
@@ -1067,24 +1355,25 @@ class ParserEngine:
                     "ad_search_url": "N/A",
                 })
             
-            log.info(f"\n✅ Обработано {len(product_data.videos)} видео для товара")
+            log.info("\n✅ Обработано %s видео для товара", len(product_data.videos))
             # Примечание: мы уже на странице товара, так как возвращаемся после каждого видео (включая последнее)
             
             # ШАГ 9: Запись данных видео в Google Sheets (если sheets_writer передан)
+            # Дожидаемся фоновой записи базовых данных - от нее зависит номер строки
+            await self._finish_task(basic_write_task)
             if sheets_writer:
                 if hasattr(product_data, '_sheets_row') and product_data._sheets_row > 0:
-                    log.info(f"\n📌 ШАГ 9: Запись данных видео в Google Sheets (строка {product_data._sheets_row})...")
-                    log.info(f"  → Количество видео для записи: {len(product_data.videos)}")
+                    log.info("\n📌 ШАГ 9: Запись данных видео в Google Sheets (строка %s)...", product_data._sheets_row)
+                    log.info("  → Количество видео для записи: %s", len(product_data.videos))
                     
                     # Логируем данные каждого видео перед записью
                     for i, video in enumerate(product_data.videos[:3], 1):
-                        log.info(f"  → Видео {i}: tiktok={video.get('tiktok_link', 'N/A')[:50]}, "
-                                f"impression={video.get('impression', 'N/A')}, "
-                                f"script={len(str(video.get('script', 'N/A')))} символов, "
-                                f"hook={len(str(video.get('hook', 'N/A')))} символов, "
-                                f"audience={video.get('audience_age', 'N/A')}, "
-                                f"country={video.get('country', 'N/A')}, "
-                                f"first_seen={video.get('first_seen', 'N/A')}")
+                        log.info("  → Видео %s: tiktok=%s, impression=%s, script=%s символов, "
+                                 "hook=%s символов, audience=%s, country=%s, first_seen=%s",
+                                 i, video.get('tiktok_link', 'N/A')[:50], video.get('impression', 'N/A'),
+                                 len(str(video.get('script', 'N/A'))), len(str(video.get('hook', 'N/A'))),
+                                 video.get('audience_age', 'N/A'), video.get('country', 'N/A'),
+                                 video.get('first_seen', 'N/A'))
                     
                     try:
                         # Подготавливаем данные для записи
@@ -1096,22 +1385,22 @@ class ParserEngine:
                         }
                         
                         # Записываем данные видео (update_basic=False - обновляем только видео F-Z)
-                        success = sheets_writer.write_product_data(
+                        success = await asyncio.to_thread(
+                            sheets_writer.write_product_data,
                             product_data._sheets_row,
                             video_data_dict,
                             update_basic=False
                         )
                         
                         if success:
-                            log.info(f"  ✅ Данные видео записаны в Google Sheets (строка {product_data._sheets_row}, столбцы F-Z)")
+                            log.info("  ✅ Данные видео записаны в Google Sheets (строка %s, столбцы F-Z)", product_data._sheets_row)
                         else:
-                            log.warning(f"  ⚠️ Не удалось записать данные видео в Google Sheets")
+                            log.warning("  ⚠️ Не удалось записать данные видео в Google Sheets")
                     except Exception as e:
-                        log.error(f"  ❌ Ошибка при записи данных видео: {e}")
-                        import traceback
+                        log.error("  ❌ Ошибка при записи данных видео: %s", e)
                         log.error(traceback.format_exc())
                 else:
-                    log.warning(f"  ⚠️ Нет номера строки для записи видео данных (_sheets_row не установлен)")
+                    log.warning("  ⚠️ Нет номера строки для записи видео данных (_sheets_row не установлен)")
             
             log.info("=" * 80)
             log.info("✅ ОБРАБОТКА ТОВАРА ЗАВЕРШЕНА УСПЕШНО")
@@ -1120,12 +1409,56 @@ class ParserEngine:
             
         except Exception as e:
             log.error("\n" + "=" * 80)
-            log.error(f"❌ ОШИБКА ПРИ ОБРАБОТКЕ ТОВАРА: {e}")
+            log.error("❌ ОШИБКА ПРИ ОБРАБОТКЕ ТОВАРА: %s", e)
             log.error("=" * 80)
-            import traceback
             log.error(traceback.format_exc())
+            await self._finish_task(basic_write_task)
             return product_data
     
+    async def _finish_task(self, task: Optional[asyncio.Task]):
+        """Дождаться фоновой задачи (ошибки задача обрабатывает и логирует сама)"""
+        if task is None:
+            return
+        try:
+            await task
+        except Exception as e:
+            log.warning("  ⚠️ Ошибка фоновой задачи: %s", e)
+    
+    async def _write_basic_product_row(self, sheets_writer, product_data: ProductData):
+        """
+        ШАГ 3.5: записать базовые данные товара и запомнить строку в product_data._sheets_row
+        
+        gspread блокирующий - вызовы выполняются в потоке, чтобы не останавливать event loop
+        """
+        try:
+            row_number = await asyncio.to_thread(
+                sheets_writer.write_basic_product_data,
+                product_data.product_name,
+                product_data.category,
+                product_data.pipiads_link
+            )
+            if row_number > 0:
+                # Сохраняем номер строки для последующей записи видео
+                product_data._sheets_row = row_number
+                log.info("  ✅ Базовые данные записаны в Google Sheets (строка %s)", row_number)
+            else:
+                # Если не удалось записать базовые данные (возможно, ячейки защищены),
+                # находим пустую строку для записи только видео данных
+                log.warning("  ⚠️ Ошибка при записи базовых данных (возможно, ячейки защищены)")
+                log.info("  → Находим пустую строку для записи видео данных...")
+                row_number = await asyncio.to_thread(sheets_writer.find_next_empty_row)
+                product_data._sheets_row = row_number
+                log.info("  ✅ Будем записывать видео данные в строку %s", row_number)
+        except Exception as e:
+            log.warning("  ⚠️ Ошибка при записи базовых данных: %s", e)
+            # Находим пустую строку для записи только видео
+            try:
+                row_number = await asyncio.to_thread(sheets_writer.find_next_empty_row)
+                product_data._sheets_row = row_number
+                log.info("  → Будем записывать видео данные в строку %s", row_number)
+            except Exception as e:
+                log.warning("  ⚠️ Не удалось найти пустую строку для видео данных: %s", e)
+    
     async def return_to_main_page(self, main_page_url: str) -> bool:
         """
         Возврат на главную страницу со списком товаров
@@ -1141,8 +1474,8 @@ class ParserEngine:
             
             # Сохраняем текущий URL для проверки
             current_url = self.page.url
-            log.info(f"  → Текущий URL: {current_url}")
-            log.info(f"  → Целевой URL: {main_page_url}")
+            log.info("  → Текущий URL: %s", current_url)
+            log.info("  → Целевой URL: %s", main_page_url)
             
             # Проверяем, что мы не на главной странице
             if current_url == main_page_url:
@@ -1158,7 +1491,7 @@ class ParserEngine:
             
             # Проверяем, что мы вернулись на страницу поиска
             new_url = self.page.url
-            log.info(f"  → Новый URL: {new_url}")
+            log.info("  → Новый URL: %s", new_url)
             
             # Проверяем наличие карточек товаров
             try:
@@ -1174,8 +1507,7 @@ class ParserEngine:
                 return False
             
         except Exception as e:
-            log.error(f"  ❌ Ошибка при возврате на главную страницу: {e}")
-            import traceback
+            log.error("  ❌ Ошибка при возврате на главную страницу: %s", e)
             log.error(traceback.format_exc())
             return False
     
@@ -1201,13 +1533,13 @@ class ParserEngine:
             Dict со status="duplicate" если товар уже обработан
             None в случае ошибки
         """
-        log.info(f"\n{'='*80}")
-        log.info(f"🔄 ОБРАБОТКА ТОВАРА: {product_url}")
-        log.info(f"{'='*80}")
+        log.info("\n%s", '=' * 80)
+        log.info("🔄 ОБРАБОТКА ТОВАРА: %s", product_url)
+        log.info("%s", '=' * 80)
         
         # Сохраняем URL главной страницы
         main_page_url = self.page.url
-        log.info(f"  → Сохранен URL главной страницы: {main_page_url}")
+        log.info("  → Сохранен URL главной страницы: %s", main_page_url)
         
         def normalize_url(url: str) -> str:
             """Нормализовать URL (убрать слэш в конце, привести к единому виду)"""
@@ -1224,17 +1556,17 @@ class ParserEngine:
             product_url = normalize_url(product_url)
             
             if not product_url:
-                log.warning(f"  ⚠️ Не удалось нормализовать URL товара, пропускаем")
+                log.warning("  ⚠️ Не удалось нормализовать URL товара, пропускаем")
                 return None
             
             # КРИТИЧНО: Проверяем ban-list ПЕРЕД обработкой
             if banned_products is not None and product_url in banned_products:
-                log.warning(f"  🚫 ПРОПУСК: Товар уже в ban-list: {product_url}")
-                log.warning(f"     Это дубликат! Пропускаем обработку.")
+                log.warning("  🚫 ПРОПУСК: Товар уже в ban-list: %s", product_url)
+                log.warning("     Это дубликат! Пропускаем обработку.")
                 return {"status": "duplicate", "product_url": product_url}
             
             # ШАГ 1: Найти товар на странице по URL и кликнуть
-            log.info(f"\n📌 ШАГ 1: Поиск товара на странице по URL...")
+            log.info("\n📌 ШАГ 1: Поиск товара на странице по URL...")
             
             try:
                 # Ищем все карточки товаров
@@ -1267,10 +1599,10 @@ class ParserEngine:
                         break
                 
                 if not product_link:
-                    log.error(f"  ❌ Товар с URL {product_url} не найден на главной странице")
+                    log.error("  ❌ Товар с URL %s не найден на главной странице", product_url)
                     return None
                 
-                log.info(f"  ✅ Товар найден на странице: {product_url}")
+                log.info("  ✅ Товар найден на странице: %s", product_url)
                 
                 # Кликаем на товар
                 log.info("  → Клик на товар...")
@@ -1284,17 +1616,16 @@ class ParserEngine:
                 log.info("  ✅ Страница товара загружена")
                 
             except Exception as e:
-                log.error(f"  ❌ Ошибка при поиске/клике на товар: {e}")
-                import traceback
+                log.error("  ❌ Ошибка при поиске/клике на товар: %s", e)
                 log.error(traceback.format_exc())
                 return None
             
             # ШАГ 2: Обработка товара через get_product_details
-            log.info(f"\n📌 ШАГ 2: Обработка товара...")
+            log.info("\n📌 ШАГ 2: Обработка товара...")
             product_data = await self.get_product_details(product_url, sheets_writer=sheets_writer)
             
             # ШАГ 3: Проверка результата (до возврата на главную)
-            log.info(f"\n📌 ШАГ 3: Проверка результата...")
+            log.info("\n📌 ШАГ 3: Проверка результата...")
             
             # Проверяем, что товар обработан и есть видео
             if not product_data:
@@ -1306,7 +1637,7 @@ class ParserEngine:
             # Проверяем, был ли товар пропущен из-за недостаточного количества видео после фильтрации
             if hasattr(product_data, '_insufficient_videos') and product_data._insufficient_videos:
                 videos_found = getattr(product_data, '_videos_found', 0)
-                log.warning(f"  ⚠️ Товар пропущен: после фильтрации не осталось подходящих видео (найдено всего: {videos_found})")
+                log.warning("  ⚠️ Товар пропущен: после фильтрации не осталось подходящих видео (найдено всего: %s)", videos_found)
                 
                 # Возвращаемся на главную
                 await self.return_to_main_page(main_page_url)
@@ -1322,11 +1653,11 @@ class ParserEngine:
             
             # Проверяем количество видео
             videos_count = len(product_data.videos) if hasattr(product_data, 'videos') else 0
-            log.info(f"  → Найдено видео: {videos_count}")
+            log.info("  → Найдено видео: %s", videos_count)
             
             # Если видео меньше 3 - возвращаем специальный статус
             if videos_count < 3:
-                log.warning(f"  ⚠️ Недостаточно видео: {videos_count} < 3")
+                log.warning("  ⚠️ Недостаточно видео: %s < 3", videos_count)
                 
                 # Возвращаемся на главную
                 await self.return_to_main_page(main_page_url)
@@ -1341,16 +1672,15 @@ class ParserEngine:
                 }
             
             # ШАГ 4: Возврат на главную страницу
-            log.info(f"\n📌 ШАГ 4: Возврат на главную страницу...")
+            log.info("\n📌 ШАГ 4: Возврат на главную страницу...")
             await self.return_to_main_page(main_page_url)
             
             # Возвращаем успешно обработанный товар
-            log.info(f"  ✅ Товар обработан успешно ({videos_count} видео)")
+            log.info("  ✅ Товар обработан успешно (%s видео)", videos_count)
             return product_data
             
         except Exception as e:
-            log.error(f"\n❌ ОШИБКА при обработке товара по индексу {product_index}: {e}")
-            import traceback
+            log.error("\n❌ ОШИБКА при обработке товара по индексу %s: %s", product_index, e)
             log.error(traceback.format_exc())
             
             # Пытаемся вернуться на главную даже при ошибке
@@ -1371,22 +1701,14 @@ class ParserEngine:
         log.info("  → Поиск dropdown сортировки...")
         try:
             # Ищем dropdown "Sort by"
-            sort_selectors = [
-                'select:has-text("Sort by")',
-                'select',
-                '[class*="sort"]',
-                'text="Sort by: First seen"',
-                'text="Sort by"',
-            ]
-            
             dropdown = None
-            for selector in sort_selectors:
+            for selector in _SORT_SELECTORS:
                 try:
                     dropdown = await self.page.query_selector(selector)
                     if dropdown:
                         is_visible = await dropdown.is_visible()
                         if is_visible:
-                            log.debug(f"Найден dropdown сортировки: {selector}")
+                            log.debug("Найден dropdown сортировки: %s", selector)
                             break
                         else:
                             dropdown = None
@@ -1435,13 +1757,7 @@ class ParserEngine:
             
             # Ищем опцию "First seen"
             log.info("  → Поиск опции 'First seen'...")
-            option_selectors = [
-                'text="First seen"',
-                'text="Sort by: First seen"',
-                '[role="option"]:has-text("First seen")',
-            ]
-            
-            for opt_sel in option_selectors:
+            for opt_sel in _SORT_OPTION_SELECTORS:
                 try:
                     option = await self.page.query_selector(opt_sel)
                     if option:
@@ -1456,7 +1772,7 @@ class ParserEngine:
             return False
             
         except Exception as e:
-            log.error(f"  ❌ Ошибка при установке сортировки: {e}")
+            log.error("  ❌ Ошибка при установке сортировки: %s", e)
             return False
     
     async def _get_videos_from_tiktok_ads_block(self) -> List[Dict[str, Any]]:
@@ -1475,18 +1791,12 @@ class ParserEngine:
             
             # Ищем карточки видео - используем правильный селектор из структуры HTML
             log.info("  → Поиск карточек видео через селекторы...")
-            video_card_selectors = [
-                'li.item-wrap.wt-block-grid__item',  # Основной селектор (из VIDEO_CARDS_STRUCTURE.md)
-                'li.item-wrap',  # Fallback
-                'ul.lists-wrap li.item-wrap',  # С контекстом
-            ]
-            
             video_elements = []
-            for selector in video_card_selectors:
+            for selector in _VIDEO_CARD_SELECTORS:
                 try:
                     elements = await self.page.query_selector_all(selector)
                     if elements:
-                        log.debug(f"Найдено {len(elements)} элементов с селектором '{selector}'")
+                        log.debug("Найдено %s элементов с селектором '%s'", len(elements), selector)
                         # Проверяем, что это действительно карточки видео (имеют блок data-count)
                         for elem in elements:
                             # Проверяем наличие обязательных элементов карточки видео
@@ -1495,10 +1805,10 @@ class ParserEngine:
                             if has_data_count or has_ad_search_link:
                                 video_elements.append(elem)
                         if video_elements:
-                            log.info(f"  ✅ Использован селектор: '{selector}'")
+                            log.info("  ✅ Использован селектор: '%s'", selector)
                             break
                 except Exception as e:
-                    log.debug(f"  ⚠️ Ошибка с селектором '{selector}': {e}")
+                    log.debug("  ⚠️ Ошибка с селектором '%s': %s", selector, e)
                     continue
             
             if not video_elements:
@@ -1539,47 +1849,59 @@ class ParserEngine:
                             except:
                                 unique_elements.append(elem)
                         video_elements = unique_elements
-                        log.info(f"  → Найдено {len(video_elements)} карточек через альтернативный поиск")
+                        log.info("  → Найдено %s карточек через альтернативный поиск", len(video_elements))
                 except Exception as e:
-                    log.warning(f"  ⚠️ Ошибка при альтернативном поиске: {e}")
-                    import traceback
+                    log.warning("  ⚠️ Ошибка при альтернативном поиске: %s", e)
                     log.debug(traceback.format_exc())
             
-            log.info(f"  → Найдено {len(video_elements)} карточек видео")
+            log.info("  → Найдено %s карточек видео", len(video_elements))
             
             # ОГРАНИЧЕНИЕ: Обрабатываем только первые 50 карточек для скорости
             max_cards = 50
             if len(video_elements) > max_cards:
-                log.info(f"  → Ограничение: обрабатываем только первые {max_cards} из {len(video_elements)} карточек")
+                log.info("  → Ограничение: обрабатываем только первые %s из %s карточек", max_cards, len(video_elements))
                 video_elements = video_elements[:max_cards]
             
             # Извлекаем данные из каждой карточки
             log.info("  → Извлечение данных из карточек...")
-            log.info(f"  → Обработка {len(video_elements)} карточек...")
+            log.info("  → Обработка %s карточек...", len(video_elements))
+            
+            # Карточки независимы - извлекаем параллельно (с ограничением одновременных запросов)
+            semaphore = asyncio.Semaphore(config.CARD_EXTRACT_CONCURRENCY)
+            
+            async def extract_card(card, index):
+                async with semaphore:
+                    return await self._extract_video_data_from_card(card, index)
+            
+            results = await asyncio.gather(
+                *(extract_card(card, i) for i, card in enumerate(video_elements, 1)),
+                return_exceptions=True,
+            )
             
             successful_extractions = 0
-            for i, card in enumerate(video_elements, 1):
+            for i, video_data in enumerate(results, 1):
                 try:
-                    video_data = await self._extract_video_data_from_card(card, i)
+                    if isinstance(video_data, Exception):
+                        raise video_data
                     if video_data:
                         videos.append(video_data)
                         impression = video_data.get('impression', 0)
                         first_seen = video_data.get('first_seen', 'N/A')
                         
                         # ЛОГИРУЕМ КАЖДОЕ ВИДЕО (как просил пользователь)
-                        log.info(f"  📹 Видео {i}: impression={impression}, first_seen={first_seen}")
+                        log.info("  📹 Видео %s: impression=%s, first_seen=%s", i, impression, first_seen)
                         
                         if impression > 0 or first_seen != 'N/A':
                             successful_extractions += 1
                 except Exception as e:
-                    log.warning(f"  ⚠️ Ошибка при извлечении данных из карточки {i}: {e}")
+                    log.warning("  ⚠️ Ошибка при извлечении данных из карточки %s: %s", i, e)
                     continue
             
-            log.info(f"  ✅ Извлечено {len(videos)} видео из блока (успешно распарсено: {successful_extractions})")
+            log.info("  ✅ Извлечено %s видео из блока (успешно распарсено: %s)", len(videos), successful_extractions)
             return videos
             
         except Exception as e:
-            log.error(f"  ❌ Ошибка при получении видео: {e}")
+            log.error("  ❌ Ошибка при получении видео: %s", e)
             return []
     
     async def _extract_video_data_from_card(self, card_element, card_index: int = 0) -> Optional[Dict[str, Any]]:
@@ -1605,51 +1927,36 @@ class ParserEngine:
             # Используем структурные селекторы на основе HTML-структуры
             # Ищем div.data-count > div.item где caption = "Impression"
             try:
-                # Ищем все блоки data-count
-                data_count_items = await card_element.query_selector_all('div.data-count div.item')
+                # Все блоки data-count одним запросом: [(caption, value), ...]
+                data_counts = await card_element.eval_on_selector_all('div.data-count div.item', _CARD_COUNTS_JS)
                 
                 if card_index <= 3:
-                    log.info(f"  → Карточка {card_index}: найдено {len(data_count_items)} блоков div.item")
+                    log.info("  → Карточка %s: найдено %s блоков div.item", card_index, len(data_counts))
                 
-                for idx, item in enumerate(data_count_items):
+                for idx, (caption_text, value_text) in enumerate(data_counts):
+                    if card_index <= 3:
+                        log.info("  → Карточка %s, блок %s: caption = '%s'", card_index, idx, caption_text)
+                    
                     # Проверяем, что это блок с impression
-                    caption_elem = await item.query_selector('p.caption')
-                    if caption_elem:
-                        caption_text = await caption_elem.inner_text()
+                    if value_text is not None and ('Impression' in caption_text or 'Показ' in caption_text):
+                        impression_str = value_text.strip()
                         
+                        # ВСЕГДА логируем RAW-значение (для первых 3 карточек)
                         if card_index <= 3:
-                            log.info(f"  → Карточка {card_index}, блок {idx}: caption = '{caption_text}'")
+                            log.info("  → Карточка %s: impression RAW (inner_text) = '%s'", card_index, impression_str)
                         
-                        if 'Impression' in caption_text or 'Показ' in caption_text:
-                            # Нашли нужный блок, извлекаем значение
-                            value_elem = await item.query_selector('p.value')
-                            if value_elem:
-                                # Попробуем несколько методов извлечения
-                                impression_str_inner = (await value_elem.inner_text()).strip()
-                                impression_str_html = (await value_elem.inner_html()).strip()
-                                impression_str_content = (await value_elem.text_content()).strip()
-                                
-                                # ВСЕГДА логируем RAW-значение (для первых 3 карточек)
-                                if card_index <= 3:
-                                    log.info(f"  → Карточка {card_index}: impression RAW (inner_text) = '{impression_str_inner}'")
-                                    log.info(f"  → Карточка {card_index}: impression RAW (inner_html) = '{impression_str_html}'")
-                                    log.info(f"  → Карточка {card_index}: impression RAW (text_content) = '{impression_str_content}'")
-                                
-                                # Используем inner_text как основной источник
-                                impression_str = impression_str_inner
-                                impression = validator.parse_impressions(impression_str)
-                                if impression:
-                                    video_data["impression"] = impression
-                                    if card_index <= 3:
-                                        log.info(f"  → Карточка {card_index}: impression PARSED = {impression}")
-                                    break
-                                else:
-                                    if card_index <= 3:
-                                        log.warning(f"  → Карточка {card_index}: parse_impressions вернул None для '{impression_str}'")
+                        impression = validator.parse_impressions(impression_str)
+                        if impression:
+                            video_data["impression"] = impression
+                            if card_index <= 3:
+                                log.info("  → Карточка %s: impression PARSED = %s", card_index, impression)
+                            break
+                        else:
+                            if card_index <= 3:
+                                log.warning("  → Карточка %s: parse_impressions вернул None для '%s'", card_index, impression_str)
             except Exception as e:
                 if card_index <= 3:
-                    log.error(f"  → Карточка {card_index}: ошибка при извлечении impression: {e}")
-                    import traceback
+                    log.error("  → Карточка %s: ошибка при извлечении impression: %s", card_index, e)
                     log.error(traceback.format_exc())
             
             # ========== ИЗВЛЕЧЕНИЕ FIRST SEEN ==========
@@ -1659,7 +1966,7 @@ class ParserEngine:
                 if create_time_elem:
                     date_text = (await create_time_elem.inner_text()).strip()
                     # Логируем RAW-значение
-                    log.debug(f"  → Карточка {card_index}: first_seen RAW='{date_text}'")
+                    log.debug("  → Карточка %s: first_seen RAW='%s'", card_index, date_text)
                     
                     # Формат: "Nov 05 2025-Nov 11 2025" - берем ПЕРВУЮ дату (до дефиса)
                     # Используем regex для извлечения первой даты
@@ -1670,10 +1977,10 @@ class ParserEngine:
                         parsed_date = validator.parse_video_date(first_seen_str)
                         if parsed_date:
                             video_data["first_seen"] = first_seen_str
-                            log.debug(f"  → Карточка {card_index}: first_seen parsed='{first_seen_str}'")
+                            log.debug("  → Карточка %s: first_seen parsed='%s'", card_index, first_seen_str)
             except Exception as e:
                 if card_index <= 3:
-                    log.debug(f"  → Карточка {card_index}: ошибка при извлечении first_seen через селектор: {e}")
+                    log.debug("  → Карточка %s: ошибка при извлечении first_seen через селектор: %s", card_index, e)
             
             # ========== ИЗВЛЕЧЕНИЕ AD-SEARCH ССЫЛКИ ==========
             try:
@@ -1684,11 +1991,11 @@ class ParserEngine:
                         # Применяем нормализацию сразу после извлечения
                         video_data["ad_search_url"] = self.normalize_ad_search_url(href)
                         if card_index <= 3:
-                            log.debug(f"  → Карточка {card_index}: ad_search_url (до нормализации) = {href}")
-                            log.debug(f"  → Карточка {card_index}: ad_search_url (после нормализации) = {video_data['ad_search_url']}")
+                            log.debug("  → Карточка %s: ad_search_url (до нормализации) = %s", card_index, href)
+                            log.debug("  → Карточка %s: ad_search_url (после нормализации) = %s", card_index, video_data['ad_search_url'])
             except Exception as e:
                 if card_index <= 3:
-                    log.debug(f"  → Карточка {card_index}: ошибка при извлечении ad_search_url: {e}")
+                    log.debug("  → Карточка %s: ошибка при извлечении ad_search_url: %s", card_index, e)
             
             # Если не нашли ссылку, но есть карточка - можно будет кликнуть на неё
             if not video_data["ad_search_url"]:
@@ -1696,13 +2003,12 @@ class ParserEngine:
             
             # Логируем итоговые данные для первых 3 карточек
             if card_index <= 3:
-                log.debug(f"  → Карточка {card_index}: итого - impression={video_data['impression']}, first_seen={video_data['first_seen']}, ad_search_url={bool(video_data['ad_search_url'])}")
+                log.debug("  → Карточка %s: итого - impression=%s, first_seen=%s, ad_search_url=%s", card_index, video_data['impression'], video_data['first_seen'], bool(video_data['ad_search_url']))
             
             return video_data
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении данных из карточки {card_index}: {e}")
-            import traceback
+            log.debug("Ошибка при извлечении данных из карточки %s: %s", card_index, e)
             log.debug(traceback.format_exc())
             return None
     
@@ -1717,6 +2023,8 @@ class ParserEngine:
             Отфильтрованный список ВСЕХ подходящих видео (без дедупликации и сортировки)
         """
         filtered = []
+        # Текущее время - один раз на всю пачку видео
+        now = datetime.now()
         
         for video in videos:
             # Проверка impression (может быть строкой "170.6K" или числом)
@@ -1729,7 +2037,7 @@ class ParserEngine:
                 impression_num = int(impression)
             
             if not validator.validate_impressions(impression_num, config.MIN_IMPRESSIONS):
-                log.debug(f"Видео пропущено: impression {impression} ({impression_num}) < {config.MIN_IMPRESSIONS}")
+                log.debug("Видео пропущено: impression %s (%s) < %s", impression, impression_num, config.MIN_IMPRESSIONS)
                 continue
             
             # Проверка даты (если есть)
@@ -1737,19 +2045,19 @@ class ParserEngine:
             if first_seen and first_seen != "N/A" and first_seen is not None:
                 parsed_date = validator.parse_video_date(first_seen)
                 if parsed_date:
-                    if not validator.is_date_within_days(parsed_date, config.DAYS_BACK):
-                        log.debug(f"Видео пропущено: дата {first_seen} старше {config.DAYS_BACK} дней")
+                    if not validator.is_date_within_days(parsed_date, config.DAYS_BACK, now):
+                        log.debug("Видео пропущено: дата %s старше %s дней", first_seen, config.DAYS_BACK)
                         continue
                 else:
                     # Если не удалось распарсить, но есть impression >= минимума, пропускаем проверку даты
                     if impression_num >= config.MIN_IMPRESSIONS:
-                        log.debug(f"Видео принято: не удалось распарсить дату {first_seen}, но impression {impression_num} >= {config.MIN_IMPRESSIONS}")
+                        log.debug("Видео принято: не удалось распарсить дату %s, но impression %s >= %s", first_seen, impression_num, config.MIN_IMPRESSIONS)
                     else:
-                        log.debug(f"Видео пропущено: не удалось распарсить дату {first_seen} и impression {impression_num} < {config.MIN_IMPRESSIONS}")
+                        log.debug("Видео пропущено: не удалось распарсить дату %s и impression %s < %s", first_seen, impression_num, config.MIN_IMPRESSIONS)
                         continue
             # Если даты нет, но impression >= минимума, принимаем видео
             elif impression_num >= config.MIN_IMPRESSIONS:
-                log.debug(f"Видео принято: нет даты, но impression {impression_num} >= {config.MIN_IMPRESSIONS}")
+                log.debug("Видео принято: нет даты, но impression %s >= %s", impression_num, config.MIN_IMPRESSIONS)
             else:
                 log.debug("Видео пропущено: нет даты first_seen и impression < минимума")
                 continue
@@ -1758,7 +2066,7 @@ class ParserEngine:
             video["_impression_num"] = impression_num
             filtered.append(video)
         
-        log.info(f"✅ Отфильтровано {len(filtered)} подходящих видео из {len(videos)}")
+        log.info("✅ Отфильтровано %s подходящих видео из %s", len(filtered), len(videos))
         return filtered
     
     def _select_top_videos(self, videos: List[Dict[str, Any]], top_n: int = 3) -> List[Dict[str, Any]]:
@@ -1803,7 +2111,7 @@ class ParserEngine:
                 seen_videos.add(video_id)
                 unique_videos.append(video)
             else:
-                log.info(f"⏭️  Видео пропущено как дубликат: {video_id}")
+                log.info("⏭️  Видео пропущено как дубликат: %s", video_id)
         
         # Сортируем: сначала по дате (самые недавние), потом по impressions (самые большие)
         def sort_key(v):
@@ -1819,7 +2127,7 @@ class ParserEngine:
         # Берем топ-N
         top_videos = unique_videos[:top_n]
         
-        log.info(f"✅ Выбрано топ-{top_n} из {len(unique_videos)} уникальных видео")
+        log.info("✅ Выбрано топ-%s из %s уникальных видео", top_n, len(unique_videos))
         return top_videos
     
     async def _filter_videos(self, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1833,6 +2141,8 @@ class ParserEngine:
             Отфильтрованный список видео (топ-3)
         """
         filtered = []
+        # Текущее время - один раз на всю пачку видео
+        now = datetime.now()
         
         for video in videos:
             # Проверка impression (может быть строкой "170.6K" или числом)
@@ -1845,7 +2155,7 @@ class ParserEngine:
                 impression_num = int(impression)
             
             if not validator.validate_impressions(impression_num, config.MIN_IMPRESSIONS):
-                log.debug(f"Видео пропущено: impression {impression} ({impression_num}) < {config.MIN_IMPRESSIONS}")
+                log.debug("Видео пропущено: impression %s (%s) < %s", impression, impression_num, config.MIN_IMPRESSIONS)
                 continue
             
             # Проверка даты (если есть)
@@ -1853,19 +2163,19 @@ class ParserEngine:
             if first_seen and first_seen != "N/A" and first_seen is not None:
                 parsed_date = validator.parse_video_date(first_seen)
                 if parsed_date:
-                    if not validator.is_date_within_days(parsed_date, config.DAYS_BACK):
-                        log.debug(f"Видео пропущено: дата {first_seen} старше {config.DAYS_BACK} дней")
+                    if not validator.is_date_within_days(parsed_date, config.DAYS_BACK, now):
+                        log.debug("Видео пропущено: дата %s старше %s дней", first_seen, config.DAYS_BACK)
                         continue
                 else:
                     # Если не удалось распарсить, но есть impression >= 50k, пропускаем проверку даты
                     if impression >= config.MIN_IMPRESSIONS:
-                        log.debug(f"Видео принято: не удалось распарсить дату {first_seen}, но impression {impression} >= {config.MIN_IMPRESSIONS}")
+                        log.debug("Видео принято: не удалось распарсить дату %s, но impression %s >= %s", first_seen, impression, config.MIN_IMPRESSIONS)
                     else:
-                        log.debug(f"Видео пропущено: не удалось распарсить дату {first_seen} и impression {impression} < {config.MIN_IMPRESSIONS}")
+                        log.debug("Видео пропущено: не удалось распарсить дату %s и impression %s < %s", first_seen, impression, config.MIN_IMPRESSIONS)
                         continue
             # Если даты нет, но impression >= 50k, принимаем видео
             elif impression >= config.MIN_IMPRESSIONS:
-                log.debug(f"Видео принято: нет даты, но impression {impression} >= {config.MIN_IMPRESSIONS}")
+                log.debug("Видео принято: нет даты, но impression %s >= %s", impression, config.MIN_IMPRESSIONS)
             else:
                 log.debug("Видео пропущено: нет даты first_seen и impression < минимума")
                 continue
@@ -1903,7 +2213,7 @@ class ParserEngine:
                 seen_videos.add(video_id)
                 unique_videos.append(video)
             else:
-                log.info(f"⏭️  Видео пропущено как дубликат: {video_id}")
+                log.info("⏭️  Видео пропущено как дубликат: %s", video_id)
         
         # Сортируем: сначала по дате (самые недавние), потом по impressions (самые большие)
         def sort_key(v):
@@ -1919,7 +2229,7 @@ class ParserEngine:
         # Берем топ-3
         top_videos = unique_videos[:3]
         
-        log.info(f"✅ Отфильтровано {len(filtered)} видео из {len(videos)}, уникальных: {len(unique_videos)}, топ-3: {len(top_videos)}")
+        log.info("✅ Отфильтровано %s видео из %s, уникальных: %s, топ-3: %s", len(filtered), len(videos), len(unique_videos), len(top_videos))
         return top_videos
     
     async def _get_video_details(self, video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -1935,7 +2245,7 @@ class ParserEngine:
         try:
             # Если есть ad_search_url, переходим напрямую
             if video.get("ad_search_url"):
-                log.info(f"    → Переход на страницу ad-search: {video['ad_search_url']}")
+                log.info("    → Переход на страницу ad-search: %s", video['ad_search_url'])
                 await self.page.goto(video["ad_search_url"], wait_until="domcontentloaded", timeout=30000)
                 await self.human_delay(0.5, 1)
                 log.info("    ✅ Страница ad-search загружена")
@@ -1962,7 +2272,7 @@ class ParserEngine:
                     await self.human_delay(0.5, 1)
                     log.info("    ✅ Карточка видео открыта")
                 except Exception as e:
-                    log.error(f"    ❌ Ошибка при клике на карточку: {e}")
+                    log.error("    ❌ Ошибка при клике на карточку: %s", e)
                     log.warning("    ⚠️ Пытаемся найти элемент заново...")
                     # Если элемент исчез, возвращаем None
                     return None
@@ -1970,22 +2280,13 @@ class ParserEngine:
                 # Ждем открытия окна/модального окна
                 # Ищем кнопку "More detail"
                 log.info("    → Поиск кнопки 'More detail'...")
-                more_detail_selectors = [
-                    'text="More detail"',
-                    'text="More Detail"',
-                    'button:has-text("More detail")',
-                    'a:has-text("More detail")',
-                ]
-                
                 more_detail_button = None
-                for selector in more_detail_selectors:
-                    try:
-                        more_detail_button = await self.page.wait_for_selector(selector, timeout=5000, state="visible")
-                        if more_detail_button:
-                            log.info(f"    ✅ Найдена кнопка 'More detail' (селектор: {selector})")
-                            break
-                    except:
-                        continue
+                try:
+                    more_detail_button = await self.page.wait_for_selector(_MORE_DETAIL_SELECTOR, timeout=5000, state="visible")
+                    if more_detail_button:
+                        log.info("    ✅ Найдена кнопка 'More detail'")
+                except (PlaywrightError, AttributeError):
+                    pass
                 
                 if not more_detail_button:
                     log.error("    ❌ Кнопка 'More detail' не найдена")
@@ -2017,21 +2318,22 @@ class ParserEngine:
                 try:
                     # Пробуем найти хотя бы один из ключевых элементов
                     await self.page.wait_for_selector('li#ai-script, li#ai-hook, div.addel-info-item', timeout=5000, state="visible")
-                    log.info(f"    ✅ Ключевые элементы найдены на странице ad-search (попытка {attempt + 1})")
+                    log.info("    ✅ Ключевые элементы найдены на странице ad-search (попытка %s)", attempt + 1)
                     elements_found = True
                     break
-                except:
+                except (PlaywrightError, AttributeError):
                     if attempt < 2:
-                        log.debug(f"    → Попытка {attempt + 1}: элементы не найдены, ждем еще...")
+                        log.debug("    → Попытка %s: элементы не найдены, ждем еще...", attempt + 1)
                         await self.human_delay(2, 3)
                     else:
                         log.warning("    ⚠️ Ключевые элементы не найдены после 3 попыток, продолжаем извлечение...")
             
-            return await self._extract_ad_search_data(video)
+            video_data = await self._extract_ad_search_data(video)
+            await self._recycle_page_if_needed()
+            return video_data
             
         except Exception as e:
-            log.error(f"    ❌ Ошибка при получении деталей видео: {e}")
-            import traceback
+            log.error("    ❌ Ошибка при получении деталей видео: %s", e)
             log.error(traceback.format_exc())
             return None
     
@@ -2073,87 +2375,78 @@ class ParserEngine:
                 video_data["first_seen"] = original_first_seen
         
         try:
-            # Ждем загрузки страницы
-            await self.page.wait_for_load_state("domcontentloaded")
+            # domcontentloaded уже дождались при переходе; ждем отрисовки блока с данными
+            try:
+                await self.page.wait_for_selector(':text-matches("Impression|Показ", "i")', state="attached", timeout=5000)
+            except PlaywrightTimeoutError:
+                log.debug("      → Блок Impression/Показ не появился за 5 секунд, продолжаем извлечение...")
             await self.human_delay(0.3, 0.5)
             
+            # Поля из JS-fallback относятся только к текущей загрузке страницы
+            self._text_fields_cache = None
+            
+            # Один снимок текста страницы для всех полей (одна раскладка вместо запроса на каждое поле)
+            try:
+                body_text = await self.page.inner_text("body")
+            except PlaywrightError as e:
+                log.debug("      → Не удалось получить текст страницы: %s", e)
+                body_text = ""
+            
             # Если ad_search_url не был сохранен из original_video, извлекаем из URL текущей страницы
             if not video_data.get("ad_search_url"):
                 current_url = self.page.url
                 if "/ad-search/" in current_url:
                     video_data["ad_search_url"] = self.normalize_ad_search_url(current_url)
-                    log.debug(f"      → Ad-search URL извлечен из текущего URL: {video_data['ad_search_url']}")
-            
-            # Получаем весь текст страницы для поиска
-            page_text = await self.page.content()
+                    log.debug("      → Ad-search URL извлечен из текущего URL: %s", video_data['ad_search_url'])
             
             # 1. TikTok ссылка (из поля "TikTok Post" (англ.) или "Пост TikTok" (рус.))
             log.info("      → Извлечение TikTok ссылки...")
             
-            # Сначала ищем по тексту "TikTok Post" или "Пост TikTok"
-            tiktok_post_selectors = [
-                'text=/TikTok Post/i',  # Английский приоритет
-                'text=/Пост TikTok/i',  # Русский fallback
-            ]
-            
-            for selector in tiktok_post_selectors:
-                try:
-                    locator = self.page.locator(selector).first
-                    if await locator.count() > 0:
+            # Сначала прямой поиск ссылок на TikTok (срабатывает на большинстве страниц)
+            # ВАЖНО: Берем только ссылки на видео (m.tiktok.com/v/...), НЕ на товары (shop.tiktok.com/view/product/...)
+            # Все ссылки фильтруются в браузере за один вызов вместо get_attribute на каждую
+            try:
+                href = await self.page.eval_on_selector_all('a[href*="tiktok.com"]', _TIKTOK_VIDEO_HREF_JS)
+            except PlaywrightError:
+                href = None
+            if href:
+                video_data["tiktok_link"] = href
+                log.info("      ✅ TikTok ссылка найдена: %s...", href[:50])
+            
+            # Если прямой поиск не дал результата, ищем по тексту "TikTok Post" или "Пост TikTok"
+            if video_data["tiktok_link"] == "N/A":
+                for selector in _TIKTOK_POST_SELECTORS:
+                    try:
+                        locator = self.page.locator(selector).first
+                        if await locator.count() == 0:
+                            continue
                         # Ищем ссылку рядом
                         try:
                             parent_locator = locator.locator("..")
                             # Ищем ссылку на видео (приоритет ссылкам с /v/)
-                            link = await parent_locator.locator('a[href*="m.tiktok.com/v/"]').first.element_handle()
-                            if not link:
-                                link = await parent_locator.locator('a[href*="tiktok.com/v/"]').first.element_handle()
-                            if not link:
-                                link = await parent_locator.locator('a[href*="tiktok.com"]').first.element_handle()
+                            # Короткий таймаут сигнализирует об отсутствии ссылки без лишнего count()
+                            link = None
+                            for link_selector in ('a[href*="m.tiktok.com/v/"]', 'a[href*="tiktok.com/v/"]', 'a[href*="tiktok.com"]'):
+                                try:
+                                    link = await parent_locator.locator(link_selector).first.element_handle(timeout=500)
+                                    break
+                                except PlaywrightTimeoutError:
+                                    continue
                             if link:
                                 href = await link.get_attribute("href")
                                 if href:
                                     # КРИТИЧНО: Пропускаем ссылки на товары в TikTok Shop
                                     if "shop.tiktok.com/view/product" in href or "/view/product" in href:
-                                        log.debug(f"      → Пропущена ссылка на товар: {href[:50]}...")
+                                        log.debug("      → Пропущена ссылка на товар: %s...", href[:50])
                                         continue
                                     # Берем только ссылки на видео
                                     if "/v/" in href or "m.tiktok.com" in href:
                                         video_data["tiktok_link"] = href
-                                        log.info(f"      ✅ TikTok ссылка найдена: {href[:50]}...")
+                                        log.info("      ✅ TikTok ссылка найдена: %s...", href[:50])
                                         break
-                        except:
+                        except (PlaywrightError, AttributeError):
                             pass
-                except:
-                    continue
-            
-            # Если не нашли через текст, ищем все ссылки на TikTok
-            # ВАЖНО: Берем только ссылки на видео (m.tiktok.com/v/...), НЕ на товары (shop.tiktok.com/view/product/...)
-            if video_data["tiktok_link"] == "N/A":
-                tiktok_link_selectors = [
-                    'a[href*="m.tiktok.com/v/"]',  # Приоритет: ссылки на видео
-                    'a[href*="tiktok.com/v/"]',    # Альтернативный формат
-                    'a[href*="tiktok.com"]',       # Fallback
-                ]
-                
-                for selector in tiktok_link_selectors:
-                    try:
-                        links = await self.page.query_selector_all(selector)
-                        for link in links:
-                            href = await link.get_attribute("href")
-                            if href and "tiktok.com" in href:
-                                # КРИТИЧНО: Пропускаем ссылки на товары в TikTok Shop
-                                if "shop.tiktok.com/view/product" in href or "/view/product" in href:
-                                    log.debug(f"      → Пропущена ссылка на товар: {href[:50]}...")
-                                    continue
-                                
-                                # Берем только ссылки на видео (содержат /v/ в пути)
-                                if "/v/" in href or "m.tiktok.com" in href:
-                                    video_data["tiktok_link"] = href
-                                    log.info(f"      ✅ TikTok ссылка найдена: {href[:50]}...")
-                                    break
-                        if video_data["tiktok_link"] != "N/A":
-                            break
-                    except:
+                    except (PlaywrightError, AttributeError):
                         continue
             
             if video_data["tiktok_link"] == "N/A":
@@ -2163,17 +2456,17 @@ class ParserEngine:
             # Ищем в разделе "Data/Данные" в пункте "Impression/Показ"
             # Если не найдены на странице ad-search, используем из карточки (если есть)
             log.info("      → Извлечение impressions...")
-            impression_text = await self._extract_impressions()
+            impression_text = await self._extract_impressions(body_text)
             if impression_text:
                 # Сохраняем оригинальный формат (если он уже в формате "170.6K" или "339.9M")
                 if impression_text.upper().endswith(('K', 'M')):
                     video_data["impression"] = impression_text
-                    log.info(f"      ✅ Impressions (оригинальный формат): {impression_text}")
+                    log.info("      ✅ Impressions (оригинальный формат): %s", impression_text)
                 else:
                     # Парсим число и форматируем обратно
                     impression_num = validator.parse_impressions(impression_text) or 0
                     video_data["impression"] = validator.format_impressions(impression_num)
-                    log.info(f"      ✅ Impressions (сформатировано): {video_data['impression']}")
+                    log.info("      ✅ Impressions (сформатировано): %s", video_data['impression'])
             else:
                 # Если не найдены на странице ad-search, проверяем, есть ли они в исходных данных видео
                 # (из карточки на странице товара)
@@ -2181,10 +2474,10 @@ class ParserEngine:
                 if original_impression:
                     if isinstance(original_impression, (int, float)) and original_impression > 0:
                         video_data["impression"] = validator.format_impressions(int(original_impression))
-                        log.info(f"      ✅ Impressions из карточки: {video_data['impression']}")
+                        log.info("      ✅ Impressions из карточки: %s", video_data['impression'])
                     elif isinstance(original_impression, str) and original_impression != "N/A":
                         video_data["impression"] = original_impression
-                        log.info(f"      ✅ Impressions из карточки (строка): {original_impression}")
+                        log.info("      ✅ Impressions из карточки (строка): %s", original_impression)
                     else:
                         video_data["impression"] = "N/A"
                         log.warning("      ⚠️ Impressions не найдены ни на странице ad-search, ни в карточке")
@@ -2194,84 +2487,95 @@ class ParserEngine:
             
             # 3. Script (из "Transcript" или "Анализ транскрипта")
             log.info("      → Извлечение сценария (script)...")
-            log.info(f"      → Текущий URL страницы: {self.page.url}")
+            log.info("      → Текущий URL страницы: %s", self.page.url)
             script = await self._extract_script()
             if script:
                 video_data["script"] = script
-                log.info(f"      ✅ Script найден ({len(script)} символов): {script[:100]}...")
+                log.info("      ✅ Script найден (%s символов): %s...", len(script), script[:100])
             else:
                 video_data["script"] = "N/A"
                 log.warning("      ⚠️ Script не найден, установлено 'N/A'")
-                log.warning(f"      → Проверьте селектор li#ai-script p.content-text на странице: {self.page.url}")
+                log.warning("      → Проверьте селектор li#ai-script p.content-text на странице: %s", self.page.url)
             
             # 4. Hook (из секции Hook или Hooks)
             log.info("      → Извлечение hook...")
             hook = await self._extract_hook()
-            if not hook:
-                # Повторный поиск, если не найден
-                log.warning("      ⚠️ Hook не найден, повторный поиск...")
-                await self.human_delay(1, 2)  # Даем время на загрузку
-                hook = await self._extract_hook()
-            
             if hook:
                 video_data["hook"] = hook
-                log.info(f"      ✅ Hook найден ({len(hook)} символов): {hook[:100]}...")
+                log.info("      ✅ Hook найден (%s символов): %s...", len(hook), hook[:100])
             else:
                 video_data["hook"] = "N/A"
-                log.warning("      ⚠️ Hook не найден после повторного поиска, установлено 'N/A'")
-                log.warning(f"      → Проверьте селектор li#ai-hook p.content-text на странице: {self.page.url}")
+                log.warning("      ⚠️ Hook не найден, установлено 'N/A'")
+                log.warning("      → Проверьте селектор li#ai-hook p.content-text на странице: %s", self.page.url)
             
             # 5. Audience Age (из поля Audience/Аудитория)
             log.info("      → Извлечение данных аудитории...")
-            audience_data = await self._extract_audience()
+            audience_data = await self._extract_audience(body_text)
             if audience_data:
                 age = audience_data.get("age", "N/A")
                 platform = audience_data.get("platform", "N/A")
                 # Форматируем в формате "35-45" или "35-45 Android" (если есть платформа)
                 # В строке 6 только возраст "25-35", без платформы
                 video_data["audience_age"] = age if age != "N/A" else "N/A"
-                log.info(f"      ✅ Audience: {video_data['audience_age']}")
+                log.info("      ✅ Audience: %s", video_data['audience_age'])
             else:
                 video_data["audience_age"] = "N/A"
                 log.info("      ⚠️ Данные аудитории не найдены, установлено 'N/A'")
             
             # 6. Country (из поля "Country/Region" или "Страна/регион" - ОТДЕЛЬНО от Audience!)
             log.info("      → Извлечение страны...")
-            country = await self._extract_country()
+            country = await self._extract_country(body_text)
             if country:
                 video_data["country"] = country
-                log.info(f"      ✅ Country: {country}")
+                log.info("      ✅ Country: %s", country)
             else:
                 video_data["country"] = "N/A"
                 log.warning("      ⚠️ Country не найден, установлено 'N/A'")
-                log.warning(f"      → Проверьте селектор div.addel-info-item с 'Country/Region' на странице: {self.page.url}")
+                log.warning("      → Проверьте селектор div.addel-info-item с 'Country/Region' на странице: %s", self.page.url)
             
             # 7. First seen (формат "Oct 27 2025" - извлекаем только первую дату из "Oct 28 2025 ~ Nov 10 2025")
             log.info("      → Извлечение даты First seen...")
-            first_seen = await self._extract_first_seen()
+            first_seen = await self._extract_first_seen(body_text)
             if first_seen:
                 video_data["first_seen"] = first_seen
-                log.info(f"      ✅ First seen: {first_seen}")
+                log.info("      ✅ First seen: %s", first_seen)
             else:
                 video_data["first_seen"] = "N/A"
                 log.info("      ⚠️ First seen не найден, установлено 'N/A'")
             
-            log.info(f"    ✅ Все данные извлечены: impression={video_data['impression']}, first_seen={video_data['first_seen']}")
+            log.info("    ✅ Все данные извлечены: impression=%s, first_seen=%s", video_data['impression'], video_data['first_seen'])
             return video_data
             
         except Exception as e:
-            log.error(f"Ошибка при извлечении данных ad-search: {e}")
+            log.error("Ошибка при извлечении данных ad-search: %s", e)
             return video_data
     
-    async def _extract_impressions(self) -> Optional[str]:
+    async def _extract_impressions(self, body_text: str = "") -> Optional[str]:
         """
         Извлечь impressions - КРИТИЧНО: в разделе "Data/Данные" в пункте "Impression/Показ"
         ВАЖНО: НЕ брать шаблонные значения, только реальные данные со страницы!
         
+        Args:
+            body_text: Снимок текста страницы (если пустой - сразу поиск через браузер)
+        
         Returns:
             Строка с impressions (например "170.6K", "339.9M") или None
         """
         try:
+            # Метод 0: Регулярное выражение по снимку текста страницы (без запросов к браузеру),
+            # только внутри раздела Data. Первая строка "Data" на странице - вкладка
+            # "Video/Image / Data", поэтому берем первый раздел, где нашлись метрики
+            for section in _DATA_SECTION_RE.finditer(body_text or ""):
+                data_text = body_text[section.end():section.end() + _DATA_SECTION_SPAN]
+                match = _BODY_IMPRESSION_RE.search(data_text)
+                if match:
+                    impression_str = match.group(1) or match.group(2)
+                    num_value = validator.parse_impressions(impression_str)
+                    if num_value and 50000 <= num_value <= 1000000000:  # От 50K до 1B
+                        log.debug("Найдено impressions в разделе Data (текст страницы): %s", impression_str)
+                        return impression_str
+                    break
+            
             # Метод 1: Поиск через JavaScript по структуре DOM (более надежно)
             try:
                 impression_data = await self.page.evaluate("""
@@ -2280,64 +2584,68 @@ class ParserEngine:
                         const dataKeywords = ['Data', 'Данные'];
                         const impressionKeywords = ['Impression', 'Показ', 'Показы'];
                         
-                        // Ищем все элементы с текстом "Data" или "Данные"
-                        const allElements = document.querySelectorAll('*');
+                        // Регулярные выражения собираются один раз, а не для каждого элемента
+                        // ("170.6K", "403.2M" после или перед ключевым словом)
+                        const impressionPatterns = impressionKeywords.map(impKeyword => [
+                            impKeyword,
+                            [
+                                new RegExp(impKeyword + '[\\\\s:]*([\\\\d.,]+[KM]?)', 'i'),
+                                new RegExp('([\\\\d.,]+[KM]?)\\\\s*' + impKeyword, 'i')
+                            ]
+                        ]);
+                        
+                        const matchImpression = (text, patterns) => {
+                            for (const pattern of patterns) {
+                                const match = text.match(pattern);
+                                if (match && match[1]) {
+                                    const value = match[1];
+                                    // Проверяем, что это не слишком большое число (не шаблонное)
+                                    // Обычно реальные impressions от 50K до 500M
+                                    const numValue = parseFloat(value.replace(/[KM]/i, ''));
+                                    if (numValue >= 0.05 && numValue <= 1000) {
+                                        return value;
+                                    }
+                                }
+                            }
+                            return null;
+                        };
+                        
+                        // Только элементы body (без head/script); innerText читается один раз
+                        // и переиспользуется в fallback
+                        const texts = [];
+                        const allElements = document.body ? document.body.querySelectorAll('*') : [];
                         for (const el of allElements) {
                             const text = el.innerText || '';
+                            texts.push(text);
                             
                             // Проверяем, содержит ли элемент "Data" или "Данные"
-                            for (const dataKeyword of dataKeywords) {
-                                if (text.includes(dataKeyword)) {
-                                    // В этом разделе ищем "Impression" или "Показ"
-                                    for (const impKeyword of impressionKeywords) {
-                                        if (text.includes(impKeyword)) {
-                                            // Ищем число в формате "170.6K", "403.2M" и т.д.
-                                            const patterns = [
-                                                new RegExp(impKeyword + '[\\s:]*([\\d.,]+[KM]?)', 'i'),
-                                                new RegExp('([\\d.,]+[KM]?)\\s*' + impKeyword, 'i')
-                                            ];
-                                            
-                                            for (const pattern of patterns) {
-                                                const match = text.match(pattern);
-                                                if (match && match[1]) {
-                                                    const value = match[1];
-                                                    // Проверяем, что это не слишком большое число (не шаблонное)
-                                                    // Обычно реальные impressions от 50K до 500M
-                                                    const numValue = parseFloat(value.replace(/[KM]/i, ''));
-                                                    if (numValue >= 0.05 && numValue <= 1000) {
-                                                        return value;
-                                                    }
-                                                }
-                                            }
-                                        }
+                            if (!dataKeywords.some(dataKeyword => text.includes(dataKeyword))) {
+                                continue;
+                            }
+                            // В этом разделе ищем "Impression" или "Показ"
+                            for (const [impKeyword, patterns] of impressionPatterns) {
+                                if (text.includes(impKeyword)) {
+                                    const value = matchImpression(text, patterns);
+                                    if (value) {
+                                        return value;
                                     }
                                 }
                             }
                         }
                         
                         // Fallback: ищем напрямую "Impression" или "Показ" (НЕ "Likes"!)
-                        for (const impKeyword of impressionKeywords) {
-                            const elements = Array.from(document.querySelectorAll('*')).filter(el => {
-                                const text = el.innerText || '';
-                                return text.includes(impKeyword) && !text.toLowerCase().includes('likes') && !text.toLowerCase().includes('нравится');
-                            });
-                            
-                            for (const el of elements) {
-                                const text = el.innerText || '';
-                                const patterns = [
-                                    new RegExp(impKeyword + '[\\s:]*([\\d.,]+[KM]?)', 'i'),
-                                    new RegExp('([\\d.,]+[KM]?)\\s*' + impKeyword, 'i')
-                                ];
-                                
-                                for (const pattern of patterns) {
-                                    const match = text.match(pattern);
-                                    if (match && match[1]) {
-                                        const value = match[1];
-                                        const numValue = parseFloat(value.replace(/[KM]/i, ''));
-                                        if (numValue >= 0.05 && numValue <= 1000) {
-                                            return value;
-                                        }
-                                    }
+                        for (const [impKeyword, patterns] of impressionPatterns) {
+                            for (const text of texts) {
+                                if (!text.includes(impKeyword)) {
+                                    continue;
+                                }
+                                const lower = text.toLowerCase();
+                                if (lower.includes('likes') || lower.includes('нравится')) {
+                                    continue;
+                                }
+                                const value = matchImpression(text, patterns);
+                                if (value) {
+                                    return value;
                                 }
                             }
                         }
@@ -2347,42 +2655,36 @@ class ParserEngine:
                 """)
                 
                 if impression_data:
-                    log.debug(f"Найдено impressions через JavaScript: {impression_data}")
+                    log.debug("Найдено impressions через JavaScript: %s", impression_data)
                     return impression_data
             except Exception as e:
-                log.debug(f"Ошибка при поиске impressions через JS: {e}")
+                log.debug("Ошибка при поиске impressions через JS: %s", e)
             
             # Метод 2: Поиск через локаторы (fallback)
-            data_keywords = ["Data", "Данные"]
-            
-            for keyword in data_keywords:
+            for keyword in _DATA_KWS:
                 try:
-                    data_locator = self.page.locator(f'text=/{keyword}/i').first
-                    if await data_locator.count() > 0:
-                        impression_keywords = ["Impression", "Показ", "Показы"]
-                        for imp_keyword in impression_keywords:
-                            try:
-                                parent_text = await data_locator.locator("..").inner_text()
-                                if imp_keyword in parent_text and "Likes" not in parent_text and "Нравится" not in parent_text:
-                                    pattern = rf'{imp_keyword}[:\s]*([\d.,]+[KM]?)'
-                                    match = re.search(pattern, parent_text, re.IGNORECASE)
-                                    if match:
-                                        impression_str = match.group(1)
-                                        # Проверяем, что это не шаблонное значение
-                                        num_value = validator.parse_impressions(impression_str)
-                                        if num_value and 50000 <= num_value <= 1000000000:  # От 50K до 1B
-                                            log.debug(f"Найдено impressions в разделе Data: {impression_str}")
-                                            return impression_str
-                            except:
-                                continue
-                except:
+                    data_locator = self._keyword_locator(keyword)
+                    if await data_locator.count() == 0:
+                        continue
+                    parent_text = await data_locator.locator(_SECTION_XPATH).first.inner_text()
+                    if "Likes" in parent_text or "Нравится" in parent_text:
+                        continue
+                    match = _IMPRESSION_VALUE_RE.search(parent_text)
+                    if match:
+                        impression_str = match.group(1)
+                        # Проверяем, что это не шаблонное значение
+                        num_value = validator.parse_impressions(impression_str)
+                        if num_value and 50000 <= num_value <= 1000000000:  # От 50K до 1B
+                            log.debug("Найдено impressions в разделе Data: %s", impression_str)
+                            return impression_str
+                except (PlaywrightError, AttributeError):
                     continue
             
             log.warning("Не удалось найти 'Impression' или 'Показ' в разделе Data")
             return None
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении impressions: {e}")
+            log.debug("Ошибка при извлечении impressions: %s", e)
             return None
     
     async def _extract_script(self) -> Optional[str]:
@@ -2404,120 +2706,98 @@ class ParserEngine:
                     # Ждем появления элемента
                     try:
                         await self.page.wait_for_selector('li#ai-script', timeout=5000, state="visible")
-                    except:
+                    except (PlaywrightError, AttributeError):
                         if attempt < 2:
-                            log.debug(f"      → Попытка {attempt + 1}: элемент li#ai-script не появился, ждем еще...")
+                            log.debug("      → Попытка %s: элемент li#ai-script не появился, ждем еще...", attempt + 1)
                             await self.human_delay(1, 2)
                             continue
                         else:
-                            log.debug(f"      → Элемент li#ai-script не появился за 15 секунд")
+                            log.debug("      → Элемент li#ai-script не появился за 15 секунд")
                     
                     script_element = await self.page.query_selector('li#ai-script p.content-text')
                     if script_element:
                         script = await script_element.inner_text()
                         if script and len(script.strip()) > 10:
-                            log.info(f"      ✅ Script найден через селектор li#ai-script p.content-text ({len(script)} символов)")
+                            log.info("      ✅ Script найден через селектор li#ai-script p.content-text (%s символов)", len(script))
                             return script.strip()
                     else:
                         if attempt < 2:
-                            log.debug(f"      → Попытка {attempt + 1}: элемент p.content-text не найден, ждем еще...")
+                            log.debug("      → Попытка %s: элемент p.content-text не найден, ждем еще...", attempt + 1)
                             await self.human_delay(1, 2)
                             continue
                         else:
-                            log.debug(f"      → Элемент li#ai-script p.content-text не найден")
+                            log.debug("      → Элемент li#ai-script p.content-text не найден")
                 except Exception as e:
                     if attempt < 2:
-                        log.debug(f"      → Попытка {attempt + 1}: ошибка {e}, пробуем еще раз...")
+                        log.debug("      → Попытка %s: ошибка %s, пробуем еще раз...", attempt + 1, e)
                         await self.human_delay(1, 2)
                         continue
                     else:
-                        log.debug(f"      → Селектор li#ai-script не сработал: {e}")
+                        log.debug("      → Селектор li#ai-script не сработал: %s", e)
             
             # Метод 1: Поиск через локаторы (английский и русский)
-            script_keywords = ["Script", "Сценарий", "Transcript", "Анализ транскрипта", "Транскрипт"]
-            
-            for keyword in script_keywords:
+            for keyword in _SCRIPT_KWS:
                 try:
                     # Ищем элемент с текстом
-                    locator = self.page.locator(f'text=/{keyword}/i').first
-                    if await locator.count() > 0:
-                        # Способ 1: Текст родительского элемента
-                        try:
-                            parent_text = await locator.locator("..").inner_text()
-                            if keyword in parent_text:
-                                parts = parent_text.split(keyword, 1)
-                                if len(parts) > 1:
-                                    script = parts[1].strip()
-                                    # Убираем лишние метки
-                                    stop_words = ["Hook", "Хук", "Target Audience", "Целевая аудитория", 
-                                                "First seen", "Впервые замечено", "Impressions", "Показы",
-                                                "Limited Time Offer", "Annual Plan", "Promotion Period", "50% OFF",
-                                                "Privacy", "Terms", "Copyright", "PIPIADS", "All Rights Reserved",
-                                                "AI-agent", "cosmobeauty", "credits", "subscription", "invoice",
-                                                "Monthly Credits", "Extra Credits", "data cost", "detail costs",
-                                                "Team Setting", "Affiliate Dashboard", "Logout"]
-                                    # Проверяем, что это не футер/меню
-                                    footer_menu_keywords = ["Privacy", "Terms", "Copyright", "PIPIADS", "AI-agent", 
-                                                           "cosmobeauty", "credits", "subscription", "invoice", 
-                                                           "Monthly Credits", "Extra Credits", "@gmail.com"]
-                                    is_footer_menu = any(keyword in script for keyword in footer_menu_keywords)
-                                    
-                                    for stop_word in stop_words:
-                                        if stop_word in script:
-                                            script = script.split(stop_word)[0].strip()
-                                    # Фильтруем метаданные (Video Text Translator, Quality, Size и т.д.)
-                                    metadata_keywords = ["Video Text Translator", "Translator", "Quality", "Size", "Resolution", 
-                                                        "Width", "Height", "Duration", "Format", "Codec", "Frame Rate"]
-                                    is_metadata = any(keyword in script for keyword in metadata_keywords)
-                                    
-                                    # Убираем теги (строки, начинающиеся с #) и служебные слова
-                                    lines = script.split('\n')
-                                    cleaned_lines = []
-                                    skip_words = ['Tags', 'Script', 'Hooks', 'Tag', 'Hook']
-                                    for line in lines:
-                                        line = line.strip()
-                                        # Пропускаем теги (начинаются с #), пустые строки и служебные слова
-                                        if line and not line.startswith('#') and not any(skip in line for skip in skip_words):
-                                            cleaned_lines.append(line)
-                                    script = '\n'.join(cleaned_lines).strip()
-                                    
-                                    if script and len(script) > 10 and not is_footer_menu and not is_metadata:
-                                        log.debug(f"Script найден через '{keyword}' (родитель)")
-                                        return script
-                        except:
-                            pass
-                        
-                        # Способ 2: Текст следующего элемента
-                        try:
-                            next_sibling = await locator.evaluate_handle("el => el.nextElementSibling")
-                            if next_sibling:
-                                script = await next_sibling.as_element().inner_text()
-                                # Проверяем, что это не футер/меню
-                                footer_menu_keywords = ["Privacy", "Terms", "Copyright", "PIPIADS", "AI-agent", 
-                                                       "cosmobeauty", "credits", "subscription", "invoice", 
-                                                       "Monthly Credits", "Extra Credits", "@gmail.com"]
-                                is_footer_menu = any(keyword in script for keyword in footer_menu_keywords)
-                                # Фильтруем метаданные
-                                metadata_keywords = ["Video Text Translator", "Translator", "Quality", "Size", "Resolution"]
-                                is_metadata = any(keyword in script for keyword in metadata_keywords)
-                                
-                                # Убираем теги (строки, начинающиеся с #) и служебные слова
-                                lines = script.split('\n')
-                                cleaned_lines = []
-                                skip_words = ['Tags', 'Script', 'Hooks', 'Tag', 'Hook']
-                                for line in lines:
-                                    line = line.strip()
-                                    # Пропускаем теги (начинаются с #), пустые строки и служебные слова
-                                    if line and not line.startswith('#') and not any(skip in line for skip in skip_words):
-                                        cleaned_lines.append(line)
-                                script = '\n'.join(cleaned_lines).strip()
-                                
-                                if script and len(script) > 10 and not is_footer_menu and not is_metadata:
-                                    log.debug(f"Script найден через '{keyword}' (следующий элемент)")
-                                    return script.strip()
-                        except:
-                            pass
-                except:
+                    locator = self._keyword_locator(keyword)
+                    if await locator.count() == 0:
+                        continue
+                    # Способ 1: Текст родительского элемента
+                    try:
+                        parent_text = await locator.locator(_SECTION_XPATH).first.inner_text()
+                        after_keyword = _text_after_first_keyword(parent_text, _SCRIPT_KWS)
+                        if after_keyword is not None:
+                            script = after_keyword.strip()
+                            # Проверяем, что это не футер/меню
+                            is_footer_menu = _FOOTER_MENU_RE.search(script) is not None
+                            
+                            # Убираем лишние метки (обрезка по первому стоп-слову)
+                            script = _cut_at_stop_word(script, _SCRIPT_STOP_RE)
+                            # Фильтруем метаданные (Video Text Translator, Quality, Size и т.д.)
+                            is_metadata = _METADATA_RE.search(script) is not None
+                            
+                            # Убираем теги (строки, начинающиеся с #) и служебные слова
+                            lines = script.split('\n')
+                            cleaned_lines = []
+                            for line in lines:
+                                line = line.strip()
+                                # Пропускаем теги (начинаются с #), пустые строки и служебные слова
+                                if line and not line.startswith('#') and not _SKIP_LINE_RE.search(line):
+                                    cleaned_lines.append(line)
+                            script = '\n'.join(cleaned_lines).strip()
+                            
+                            if script and len(script) > 10 and not is_footer_menu and not is_metadata:
+                                log.debug("Script найден через '%s' (родитель)", keyword)
+                                return script
+                    except (PlaywrightError, AttributeError):
+                        pass
+                    
+                    # Способ 2: Текст следующего элемента
+                    try:
+                        next_sibling = await locator.evaluate_handle("el => el.nextElementSibling")
+                        if next_sibling:
+                            script = await next_sibling.as_element().inner_text()
+                            # Проверяем, что это не футер/меню
+                            is_footer_menu = _FOOTER_MENU_RE.search(script) is not None
+                            # Фильтруем метаданные
+                            is_metadata = _SIBLING_METADATA_RE.search(script) is not None
+                            
+                            # Убираем теги (строки, начинающиеся с #) и служебные слова
+                            lines = script.split('\n')
+                            cleaned_lines = []
+                            for line in lines:
+                                line = line.strip()
+                                # Пропускаем теги (начинаются с #), пустые строки и служебные слова
+                                if line and not line.startswith('#') and not _SKIP_LINE_RE.search(line):
+                                    cleaned_lines.append(line)
+                            script = '\n'.join(cleaned_lines).strip()
+                            
+                            if script and len(script) > 10 and not is_footer_menu and not is_metadata:
+                                log.debug("Script найден через '%s' (следующий элемент)", keyword)
+                                return script.strip()
+                    except (PlaywrightError, AttributeError):
+                        pass
+                except (PlaywrightError, AttributeError):
                     continue
             
             # Метод 2: Поиск через JavaScript (более агрессивный - по структуре DOM)
@@ -2529,106 +2809,119 @@ class ParserEngine:
                                           'First seen', 'Впервые замечено', 'Impressions', 'Показы',
                                           'Analysis', 'Advertiser', 'Display Name', 'Ad Copy',
                                           'Limited Time Offer', 'Annual Plan', 'Promotion Period', '50% OFF'];
+                        // Стоп-слова не содержат спецсимволов регулярных выражений
+                        const stopRe = new RegExp(stopWords.join('|'));
+                        // Самое раннее вхождение любого ключевого слова в тексте
+                        const firstKeyword = (text) => {
+                            let best = null;
+                            let bestPos = text.length;
+                            for (const kw of keywords) {
+                                const pos = text.indexOf(kw);
+                                if (pos >= 0 && pos < bestPos) {
+                                    best = kw;
+                                    bestPos = pos;
+                                }
+                            }
+                            return best;
+                        };
                         
                         // Ищем элементы с ключевыми словами
                         const allElements = document.querySelectorAll('*');
                         for (const el of allElements) {
                             const text = el.innerText || '';
                             
-                            for (const keyword of keywords) {
-                                if (text.includes(keyword)) {
-                                    // Ищем следующий элемент после ключевого слова (обычно это сам script)
-                                    let scriptText = null;
-                                    
-                                    // Способ 1: Текст следующего sibling элемента
-                                    let nextSibling = el.nextElementSibling;
-                                    if (nextSibling) {
-                                        scriptText = nextSibling.innerText || '';
+                            const keyword = firstKeyword(text);
+                            if (keyword) {
+                                // Ищем следующий элемент после ключевого слова (обычно это сам script)
+                                let scriptText = null;
+                                
+                                // Способ 1: Текст следующего sibling элемента
+                                let nextSibling = el.nextElementSibling;
+                                if (nextSibling) {
+                                    scriptText = nextSibling.innerText || '';
+                                }
+                                
+                                // Способ 2: Текст родительского элемента после ключевого слова
+                                if (!scriptText || scriptText.length < 10) {
+                                    const parentText = el.parentElement ? el.parentElement.innerText || '' : '';
+                                    if (parentText.includes(keyword)) {
+                                        const parts = parentText.split(keyword);
+                                        if (parts.length > 1) {
+                                            scriptText = parts[1].trim();
+                                        }
                                     }
-                                    
-                                    // Способ 2: Текст родительского элемента после ключевого слова
-                                    if (!scriptText || scriptText.length < 10) {
-                                        const parentText = el.parentElement ? el.parentElement.innerText || '' : '';
-                                        if (parentText.includes(keyword)) {
-                                            const parts = parentText.split(keyword);
-                                            if (parts.length > 1) {
-                                                scriptText = parts[1].trim();
-                                            }
+                                }
+                                
+                                // Способ 3: Ищем в дочерних элементах (обычно script в отдельном блоке)
+                                if (!scriptText || scriptText.length < 10) {
+                                    const children = el.querySelectorAll('p, div, span');
+                                    for (const child of children) {
+                                        const childText = child.innerText || '';
+                                        // Пропускаем метаданные и промо-тексты
+                                        if (childText.length > 20 && 
+                                            !childText.includes('Advertiser') && 
+                                            !childText.includes('Display Name') &&
+                                            !childText.includes('Analysis') &&
+                                            !childText.includes('Generator') &&
+                                            !childText.includes('Limited Time Offer') &&
+                                            !childText.includes('Annual Plan') &&
+                                            !childText.includes('Promotion Period') &&
+                                            !childText.includes('50% OFF')) {
+                                            scriptText = childText;
+                                            break;
                                         }
                                     }
+                                }
+                                
+                                if (scriptText) {
+                                    // Убираем стоп-слова и метаданные (обрезка по первому вхождению)
+                                    const stopPos = scriptText.search(stopRe);
+                                    if (stopPos >= 0) {
+                                        scriptText = scriptText.substring(0, stopPos);
+                                    }
                                     
-                                    // Способ 3: Ищем в дочерних элементах (обычно script в отдельном блоке)
-                                    if (!scriptText || scriptText.length < 10) {
-                                        const children = el.querySelectorAll('p, div, span');
-                                        for (const child of children) {
-                                            const childText = child.innerText || '';
-                                            // Пропускаем метаданные и промо-тексты
-                                            if (childText.length > 20 && 
-                                                !childText.includes('Advertiser') && 
-                                                !childText.includes('Display Name') &&
-                                                !childText.includes('Analysis') &&
-                                                !childText.includes('Generator') &&
-                                                !childText.includes('Limited Time Offer') &&
-                                                !childText.includes('Annual Plan') &&
-                                                !childText.includes('Promotion Period') &&
-                                                !childText.includes('50% OFF')) {
-                                                scriptText = childText;
-                                                break;
-                                            }
+                                    scriptText = scriptText.trim();
+                                    
+                                    // Убираем теги (строки, начинающиеся с #) и служебные слова
+                                    const skipWords = ['Tags', 'Script', 'Hooks', 'Tag', 'Hook'];
+                                    const lines = scriptText.split('\\n');
+                                    const cleanedLines = [];
+                                    for (const line of lines) {
+                                        const trimmedLine = line.trim();
+                                        // Пропускаем теги (начинаются с #), пустые строки и служебные слова
+                                        if (trimmedLine && !trimmedLine.startsWith('#') && 
+                                            !skipWords.some(word => trimmedLine.includes(word))) {
+                                            cleanedLines.push(trimmedLine);
                                         }
                                     }
+                                    scriptText = cleanedLines.join('\\n').trim();
                                     
-                                    if (scriptText) {
-                                        // Убираем стоп-слова и метаданные
-                                        for (const stopWord of stopWords) {
-                                            if (scriptText.includes(stopWord)) {
-                                                scriptText = scriptText.split(stopWord)[0];
-                                            }
-                                        }
-                                        
-                                        scriptText = scriptText.trim();
-                                        
-                                        // Убираем теги (строки, начинающиеся с #) и служебные слова
-                                        const skipWords = ['Tags', 'Script', 'Hooks', 'Tag', 'Hook'];
-                                        const lines = scriptText.split('\\n');
-                                        const cleanedLines = [];
-                                        for (const line of lines) {
-                                            const trimmedLine = line.trim();
-                                            // Пропускаем теги (начинаются с #), пустые строки и служебные слова
-                                            if (trimmedLine && !trimmedLine.startsWith('#') && 
-                                                !skipWords.some(word => trimmedLine.includes(word))) {
-                                                cleanedLines.push(trimmedLine);
-                                            }
-                                        }
-                                        scriptText = cleanedLines.join('\\n').trim();
-                                        
-                                        // Проверяем, что это похоже на реальный script (не метаданные, не промо-текст, не футер/меню)
-                                        const footerMenuKeywords = ['Privacy', 'Terms', 'Copyright', 'PIPIADS', 'All Rights Reserved',
-                                                                   'AI-agent', 'cosmobeauty', 'credits', 'subscription', 'invoice',
-                                                                   'Monthly Credits', 'Extra Credits', 'data cost', 'detail costs',
-                                                                   'Team Setting', 'Affiliate Dashboard', 'Logout', '@gmail.com',
-                                                                   'English', 'Français', 'Deutsch', 'Español', 'Português'];
-                                        const isFooterMenu = footerMenuKeywords.some(keyword => scriptText.includes(keyword));
-                                        
-                                        // Фильтруем короткие тексты и метаданные
-                                    const metadataKeywords = ['Video Text Translator', 'Translator', 'Quality', 'Size', 'Resolution', 
-                                                             'Width', 'Height', 'Duration', 'Format', 'Codec', 'Frame Rate'];
-                                    const isMetadata = metadataKeywords.some(keyword => scriptText.includes(keyword));
+                                    // Проверяем, что это похоже на реальный script (не метаданные, не промо-текст, не футер/меню)
+                                    const footerMenuKeywords = ['Privacy', 'Terms', 'Copyright', 'PIPIADS', 'All Rights Reserved',
+                                                               'AI-agent', 'cosmobeauty', 'credits', 'subscription', 'invoice',
+                                                               'Monthly Credits', 'Extra Credits', 'data cost', 'detail costs',
+                                                               'Team Setting', 'Affiliate Dashboard', 'Logout', '@gmail.com',
+                                                               'English', 'Français', 'Deutsch', 'Español', 'Português'];
+                                    const isFooterMenu = footerMenuKeywords.some(keyword => scriptText.includes(keyword));
                                     
-                                    if (scriptText && scriptText.length > 20 && 
-                                            !scriptText.startsWith('Analysis') &&
-                                            !scriptText.includes('shop.tiktok.com') &&
-                                            !scriptText.includes('Generator Image') &&
-                                            !scriptText.includes('Limited Time Offer') &&
-                                            !scriptText.includes('Annual Plan') &&
-                                            !scriptText.includes('Promotion Period') &&
-                                            !scriptText.includes('50% OFF') &&
-                                            !scriptText.toLowerCase().includes('q4') &&
-                                            !scriptText.toLowerCase().includes('monthly plan') &&
-                                            !isFooterMenu &&
-                                            !isMetadata) {
-                                            return scriptText;
-                                        }
+                                    // Фильтруем короткие тексты и метаданные
+                                const metadataKeywords = ['Video Text Translator', 'Translator', 'Quality', 'Size', 'Resolution', 
+                                                         'Width', 'Height', 'Duration', 'Format', 'Codec', 'Frame Rate'];
+                                const isMetadata = metadataKeywords.some(keyword => scriptText.includes(keyword));
+                                
+                                if (scriptText && scriptText.length > 20 && 
+                                        !scriptText.startsWith('Analysis') &&
+                                        !scriptText.includes('shop.tiktok.com') &&
+                                        !scriptText.includes('Generator Image') &&
+                                        !scriptText.includes('Limited Time Offer') &&
+                                        !scriptText.includes('Annual Plan') &&
+                                        !scriptText.includes('Promotion Period') &&
+                                        !scriptText.includes('50% OFF') &&
+                                        !scriptText.toLowerCase().includes('q4') &&
+                                        !scriptText.toLowerCase().includes('monthly plan') &&
+                                        !isFooterMenu &&
+                                        !isMetadata) {
+                                        return scriptText;
                                     }
                                 }
                             }
@@ -2640,12 +2933,12 @@ class ParserEngine:
                     log.debug("Script найден через JavaScript")
                     return script.strip()
             except Exception as e:
-                log.debug(f"Ошибка при поиске script через JS: {e}")
+                log.debug("Ошибка при поиске script через JS: %s", e)
             
             return None
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении сценария: {e}")
+            log.debug("Ошибка при извлечении сценария: %s", e)
             return None
     
     async def _extract_hook(self) -> Optional[str]:
@@ -2660,6 +2953,14 @@ class ParserEngine:
             </div>
         </li>
         """
+        # Ограниченное ожидание секции Hook вместо слепого повторного поиска:
+        # если на странице нет ни li#ai-hook, ни текста Hook/Хук - искать нечего
+        try:
+            await self.page.wait_for_selector('li#ai-hook, :text-matches("Hooks?|Хуки?", "i")', state="attached", timeout=2000)
+        except PlaywrightTimeoutError:
+            log.debug("      → Секция Hook не появилась за 2 секунды")
+            return None
+        
         try:
             # МЕТОД 0: Прямой поиск по селектору из документации (самый надежный)
             # Пробуем несколько раз с ожиданием (элементы могут загружаться динамически)
@@ -2668,117 +2969,163 @@ class ParserEngine:
                     # Ждем появления элемента
                     try:
                         await self.page.wait_for_selector('li#ai-hook', timeout=5000, state="visible")
-                    except:
+                    except (PlaywrightError, AttributeError):
                         if attempt < 2:
-                            log.debug(f"      → Попытка {attempt + 1}: элемент li#ai-hook не появился, ждем еще...")
+                            log.debug("      → Попытка %s: элемент li#ai-hook не появился, ждем еще...", attempt + 1)
                             await self.human_delay(1, 2)
                             continue
                         else:
-                            log.debug(f"      → Элемент li#ai-hook не появился за 15 секунд")
+                            log.debug("      → Элемент li#ai-hook не появился за 15 секунд")
                     
                     hook_element = await self.page.query_selector('li#ai-hook p.content-text')
                     if hook_element:
                         hook = await hook_element.inner_text()
                         if hook and len(hook.strip()) > 5:
-                            log.info(f"      ✅ Hook найден через селектор li#ai-hook p.content-text ({len(hook)} символов)")
+                            log.info("      ✅ Hook найден через селектор li#ai-hook p.content-text (%s символов)", len(hook))
                             return hook.strip()
                     else:
                         if attempt < 2:
-                            log.debug(f"      → Попытка {attempt + 1}: элемент p.content-text не найден, ждем еще...")
+                            log.debug("      → Попытка %s: элемент p.content-text не найден, ждем еще...", attempt + 1)
                             await self.human_delay(1, 2)
                             continue
                         else:
-                            log.debug(f"      → Элемент li#ai-hook p.content-text не найден")
+                            log.debug("      → Элемент li#ai-hook p.content-text не найден")
                 except Exception as e:
                     if attempt < 2:
-                        log.debug(f"      → Попытка {attempt + 1}: ошибка {e}, пробуем еще раз...")
+                        log.debug("      → Попытка %s: ошибка %s, пробуем еще раз...", attempt + 1, e)
                         await self.human_delay(1, 2)
                         continue
                     else:
-                        log.debug(f"      → Селектор li#ai-hook не сработал: {e}")
+                        log.debug("      → Селектор li#ai-hook не сработал: %s", e)
             
             # НОВЫЙ МЕТОД: Ищем Script, затем ищем Hook в следующем элементе/секции
             try:
                 # Сначала находим Script
-                script_keywords = ["Script", "Сценарий", "Transcript", "Анализ транскрипта"]
-                for script_keyword in script_keywords:
+                for script_keyword in _HOOK_SCRIPT_KWS:
                     try:
-                        script_locator = self.page.locator(f'text=/{script_keyword}/i').first
-                        if await script_locator.count() > 0:
-                            # Ищем следующий элемент после Script, который содержит "Hook" или "Hooks"
-                            # Или просто следующий текстовый блок после Script
-                            try:
-                                # Способ 1: Ищем элемент с "Hook" или "Hooks" после Script
-                                parent = script_locator.locator("..")
-                                parent_text = await parent.inner_text()
+                        script_locator = self._keyword_locator(script_keyword)
+                        if await script_locator.count() == 0:
+                            continue
+                        # Ищем следующий элемент после Script, который содержит "Hook" или "Hooks"
+                        # Или просто следующий текстовый блок после Script
+                        try:
+                            # Способ 1: Ищем элемент с "Hook" или "Hooks" после Script
+                            parent = script_locator.locator("..")
+                            parent_text = await parent.inner_text()
+                            
+                            # Ищем "Hook" или "Hooks" в том же родительском элементе
+                            if "Hook" in parent_text or "Hooks" in parent_text or "Хук" in parent_text or "Хуки" in parent_text:
+                                # Находим позицию Script и Hook в тексте
+                                script_pos = parent_text.find(script_keyword)
+                                hook_pos = -1
+                                for hook_word in ["Hook", "Hooks", "Хук", "Хуки"]:
+                                    pos = parent_text.find(hook_word, script_pos)
+                                    if pos > script_pos:
+                                        hook_pos = pos
+                                        break
                                 
-                                # Ищем "Hook" или "Hooks" в том же родительском элементе
-                                if "Hook" in parent_text or "Hooks" in parent_text or "Хук" in parent_text or "Хуки" in parent_text:
-                                    # Находим позицию Script и Hook в тексте
-                                    script_pos = parent_text.find(script_keyword)
-                                    hook_pos = -1
-                                    for hook_word in ["Hook", "Hooks", "Хук", "Хуки"]:
-                                        pos = parent_text.find(hook_word, script_pos)
-                                        if pos > script_pos:
-                                            hook_pos = pos
-                                            break
+                                if hook_pos > script_pos:
+                                    # Извлекаем текст после "Hook" или "Hooks"
+                                    hook_section = parent_text[hook_pos:]
+                                    # Убираем "Hook" или "Hooks" из начала
+                                    hook_section = re.sub(r'^Hooks?\s*:?\s*', '', hook_section, flags=re.IGNORECASE)
+                                    hook_section = re.sub(r'^Хуки?\s*:?\s*', '', hook_section, flags=re.IGNORECASE)
+                                    hook_text = hook_section.strip()
                                     
-                                    if hook_pos > script_pos:
-                                        # Извлекаем текст после "Hook" или "Hooks"
-                                        hook_section = parent_text[hook_pos:]
-                                        # Убираем "Hook" или "Hooks" из начала
-                                        hook_section = re.sub(r'^Hooks?\s*:?\s*', '', hook_section, flags=re.IGNORECASE)
-                                        hook_section = re.sub(r'^Хуки?\s*:?\s*', '', hook_section, flags=re.IGNORECASE)
-                                        hook_text = hook_section.strip()
-                                        
-                                        # Убираем следующие секции (Target Audience, First seen и т.д.)
-                                        stop_words = ["Target Audience", "Целевая аудитория", "First seen", "Впервые замечено", 
-                                                    "Impressions", "Показы", "Country", "Страна", "Country/Region", "Страна/регион"]
-                                        for stop_word in stop_words:
-                                            if stop_word in hook_text:
-                                                hook_text = hook_text.split(stop_word)[0].strip()
-                                        
-                                        # Убираем метаданные
-                                        hook_text = re.sub(r'Quality\s*:?\s*[^\n]*', '', hook_text, flags=re.IGNORECASE)
-                                        hook_text = re.sub(r'Size\s*:?\s*[^\n]*', '', hook_text, flags=re.IGNORECASE)
-                                        hook_text = re.sub(r'Resolution\s*:?\s*[^\n]*', '', hook_text, flags=re.IGNORECASE)
-                                        hook_text = re.sub(r'--', '', hook_text)
-                                        hook_text = re.sub(r'\n{2,}', '\n', hook_text).strip()
-                                        
-                                        # Убираем служебные слова в начале
-                                        hook_text = re.sub(r'^(Tags|Script|Hooks?)\s*:?\s*', '', hook_text, flags=re.IGNORECASE)
-                                        
-                                        if hook_text and len(hook_text) > 5 and len(hook_text) < 500:
-                                            log.debug(f"Hook найден после Script через '{script_keyword}'")
-                                            return hook_text
-                            except:
-                                pass
-                            
-                            # Способ 2: Ищем следующий sibling элемент после Script
-                            try:
-                                script_element = await script_locator.element_handle()
-                                if script_element:
-                                    # Ищем следующий элемент с текстом "Hook" или "Hooks"
-                                    next_elements = await self.page.evaluate("""
-                                        (scriptEl) => {
-                                            let current = scriptEl;
-                                            // Ищем следующий элемент с "Hook" или "Hooks"
-                                            for (let i = 0; i < 10; i++) {
-                                                current = current.nextElementSibling;
-                                                if (!current) break;
-                                                const text = current.innerText || '';
-                                                if (text.includes('Hook') || text.includes('Hooks') || 
-                                                    text.includes('Хук') || text.includes('Хуки')) {
-                                                    // Извлекаем текст после "Hook" или "Hooks"
-                                                    const parts = text.split(/Hooks?\\s*:?\\s*|Хуки?\\s*:?\\s*/i);
-                                                    if (parts.length > 1) {
-                                                        let hookText = parts[1].trim();
+                                    # Убираем следующие секции (Target Audience, First seen и т.д.)
+                                    hook_text = _cut_at_stop_word(hook_text, _HOOK_SECTION_STOP_RE)
+                                    
+                                    # Убираем метаданные
+                                    hook_text = re.sub(r'Quality\s*:?\s*[^\n]*', '', hook_text, flags=re.IGNORECASE)
+                                    hook_text = re.sub(r'Size\s*:?\s*[^\n]*', '', hook_text, flags=re.IGNORECASE)
+                                    hook_text = re.sub(r'Resolution\s*:?\s*[^\n]*', '', hook_text, flags=re.IGNORECASE)
+                                    hook_text = re.sub(r'--', '', hook_text)
+                                    hook_text = re.sub(r'\n{2,}', '\n', hook_text).strip()
+                                    
+                                    # Убираем служебные слова в начале
+                                    hook_text = re.sub(r'^(Tags|Script|Hooks?)\s*:?\s*', '', hook_text, flags=re.IGNORECASE)
+                                    
+                                    if hook_text and len(hook_text) > 5 and len(hook_text) < 500:
+                                        log.debug("Hook найден после Script через '%s'", script_keyword)
+                                        return hook_text
+                        except (PlaywrightError, AttributeError):
+                            pass
+                        
+                        # Способ 2: Ищем следующий sibling элемент после Script
+                        try:
+                            script_element = await script_locator.element_handle()
+                            if script_element:
+                                # Ищем следующий элемент с текстом "Hook" или "Hooks"
+                                next_elements = await self.page.evaluate("""
+                                    (scriptEl) => {
+                                        let current = scriptEl;
+                                        // Ищем следующий элемент с "Hook" или "Hooks"
+                                        for (let i = 0; i < 10; i++) {
+                                            current = current.nextElementSibling;
+                                            if (!current) break;
+                                            const text = current.innerText || '';
+                                            if (text.includes('Hook') || text.includes('Hooks') || 
+                                                text.includes('Хук') || text.includes('Хуки')) {
+                                                // Извлекаем текст после "Hook" или "Hooks"
+                                                const parts = text.split(/Hooks?\\s*:?\\s*|Хуки?\\s*:?\\s*/i);
+                                                if (parts.length > 1) {
+                                                    let hookText = parts[1].trim();
+                                                    // Убираем следующие секции
+                                                    const stopPos = hookText.search(/Target Audience|First seen|Impressions|Country/);
+                                                    if (stopPos >= 0) {
+                                                        hookText = hookText.substring(0, stopPos);
+                                                    }
+                                                    hookText = hookText.replace(/Quality\\s*:?\\s*[^\\n]*/gi, '');
+                                                    hookText = hookText.replace(/Size\\s*:?\\s*[^\\n]*/gi, '');
+                                                    hookText = hookText.replace(/Resolution\\s*:?\\s*[^\\n]*/gi, '');
+                                                    hookText = hookText.replace(/--/g, '');
+                                                    hookText = hookText.replace(/\\n{2,}/g, '\\n').trim();
+                                                    if (hookText && hookText.length > 5 && hookText.length < 500) {
+                                                        return hookText;
+                                                    }
+                                                }
+                                            }
+                                        }
+                                        return null;
+                                    }
+                                """, script_element)
+                                
+                                if next_elements:
+                                    log.debug("Hook найден в следующем элементе после Script")
+                                    return next_elements
+                        except (PlaywrightError, AttributeError):
+                            pass
+                        
+                        # Способ 3: Ищем Hook в родительском контейнере после Script
+                        try:
+                            # Получаем весь текст страницы и ищем паттерн "Script...Hook"
+                            page_text = await self.page.content()
+                            # Ищем через JavaScript более агрессивно
+                            hook_text = await self.page.evaluate("""
+                                () => {
+                                    // Ищем все элементы с текстом "Script"
+                                    const allElements = Array.from(document.querySelectorAll('*'));
+                                    for (const el of allElements) {
+                                        const text = el.innerText || '';
+                                        if (text.includes('Script') || text.includes('Сценарий')) {
+                                            // Ищем в этом же элементе или родительском "Hook" или "Hooks"
+                                            let searchEl = el;
+                                            for (let depth = 0; depth < 3; depth++) {
+                                                const searchText = searchEl.innerText || '';
+                                                if (searchText.includes('Hook') || searchText.includes('Hooks') || 
+                                                    searchText.includes('Хук') || searchText.includes('Хуки')) {
+                                                    // Извлекаем текст между Script и следующими секциями
+                                                    const scriptIndex = searchText.indexOf('Script');
+                                                    const hookIndex = searchText.indexOf('Hook', scriptIndex);
+                                                    if (hookIndex > scriptIndex) {
+                                                        let hookText = searchText.substring(hookIndex);
+                                                        // Убираем "Hook" или "Hooks" из начала
+                                                        hookText = hookText.replace(/^Hooks?\\s*:?\\s*/i, '');
+                                                        hookText = hookText.replace(/^Хуки?\\s*:?\\s*/i, '');
                                                         // Убираем следующие секции
-                                                        const stopWords = ['Target Audience', 'First seen', 'Impressions', 'Country'];
-                                                        for (const stop of stopWords) {
-                                                            if (hookText.includes(stop)) {
-                                                                hookText = hookText.split(stop)[0];
-                                                            }
+                                                        const stopPos = hookText.search(/Target Audience|First seen|Impressions|Country/);
+                                                        if (stopPos >= 0) {
+                                                            hookText = hookText.substring(0, stopPos);
                                                         }
                                                         hookText = hookText.replace(/Quality\\s*:?\\s*[^\\n]*/gi, '');
                                                         hookText = hookText.replace(/Size\\s*:?\\s*[^\\n]*/gi, '');
@@ -2790,168 +3137,71 @@ class ParserEngine:
                                                         }
                                                     }
                                                 }
+                                                searchEl = searchEl.parentElement;
+                                                if (!searchEl) break;
                                             }
-                                            return null;
                                         }
-                                    """, script_element)
-                                    
-                                    if next_elements:
-                                        log.debug(f"Hook найден в следующем элементе после Script")
-                                        return next_elements
-                            except:
-                                pass
-                            
-                            # Способ 3: Ищем Hook в родительском контейнере после Script
-                            try:
-                                # Получаем весь текст страницы и ищем паттерн "Script...Hook"
-                                page_text = await self.page.content()
-                                # Ищем через JavaScript более агрессивно
-                                hook_text = await self.page.evaluate("""
-                                    () => {
-                                        // Ищем все элементы с текстом "Script"
-                                        const allElements = Array.from(document.querySelectorAll('*'));
-                                        for (const el of allElements) {
-                                            const text = el.innerText || '';
-                                            if (text.includes('Script') || text.includes('Сценарий')) {
-                                                // Ищем в этом же элементе или родительском "Hook" или "Hooks"
-                                                let searchEl = el;
-                                                for (let depth = 0; depth < 3; depth++) {
-                                                    const searchText = searchEl.innerText || '';
-                                                    if (searchText.includes('Hook') || searchText.includes('Hooks') || 
-                                                        searchText.includes('Хук') || searchText.includes('Хуки')) {
-                                                        // Извлекаем текст между Script и следующими секциями
-                                                        const scriptIndex = searchText.indexOf('Script');
-                                                        const hookIndex = searchText.indexOf('Hook', scriptIndex);
-                                                        if (hookIndex > scriptIndex) {
-                                                            let hookText = searchText.substring(hookIndex);
-                                                            // Убираем "Hook" или "Hooks" из начала
-                                                            hookText = hookText.replace(/^Hooks?\\s*:?\\s*/i, '');
-                                                            hookText = hookText.replace(/^Хуки?\\s*:?\\s*/i, '');
-                                                            // Убираем следующие секции
-                                                            const stopWords = ['Target Audience', 'First seen', 'Impressions', 'Country'];
-                                                            for (const stop of stopWords) {
-                                                                if (hookText.includes(stop)) {
-                                                                    hookText = hookText.split(stop)[0];
-                                                                }
-                                                            }
-                                                            hookText = hookText.replace(/Quality\\s*:?\\s*[^\\n]*/gi, '');
-                                                            hookText = hookText.replace(/Size\\s*:?\\s*[^\\n]*/gi, '');
-                                                            hookText = hookText.replace(/Resolution\\s*:?\\s*[^\\n]*/gi, '');
-                                                            hookText = hookText.replace(/--/g, '');
-                                                            hookText = hookText.replace(/\\n{2,}/g, '\\n').trim();
-                                                            if (hookText && hookText.length > 5 && hookText.length < 500) {
-                                                                return hookText;
-                                                            }
-                                                        }
-                                                    }
-                                                    searchEl = searchEl.parentElement;
-                                                    if (!searchEl) break;
-                                                }
-                                            }
-                                        }
-                                        return null;
                                     }
-                                """)
-                                
-                                if hook_text:
-                                    log.debug(f"Hook найден через агрессивный поиск после Script")
-                                    return hook_text
-                            except:
-                                pass
-                    except:
+                                    return null;
+                                }
+                            """)
+                            
+                            if hook_text:
+                                log.debug("Hook найден через агрессивный поиск после Script")
+                                return hook_text
+                        except (PlaywrightError, AttributeError):
+                            pass
+                    except (PlaywrightError, AttributeError):
                         continue
-            except:
+            except (PlaywrightError, AttributeError):
                 pass
             
             # Метод 1: Поиск через локаторы (старый способ, оставляем как fallback)
-            hook_keywords = ["Hooks", "Hook", "Хуки", "Хук"]
-            
-            for keyword in hook_keywords:
+            for keyword in _HOOK_KWS:
                 try:
-                    locator = self.page.locator(f'text=/{keyword}/i').first
-                    if await locator.count() > 0:
-                        # Способ 1: Текст родительского элемента
-                        try:
-                            parent_text = await locator.locator("..").inner_text()
-                            if keyword in parent_text:
-                                parts = parent_text.split(keyword, 1)
-                                if len(parts) > 1:
-                                    hook = parts[1].strip()
-                                    # Убираем лишние метки
-                                    stop_words = ["Target Audience", "Целевая аудитория", "First seen", "Впервые замечено", 
-                                                "Transcript", "Анализ транскрипта", "Impressions", "Показы",
-                                                "Limited Time Offer", "Annual Plan", "Promotion Period", "50% OFF",
-                                                "Privacy", "Terms", "Copyright", "PIPIADS", "All Rights Reserved",
-                                                "AI-agent", "cosmobeauty", "credits", "subscription", "invoice",
-                                                "Monthly Credits", "Extra Credits", "data cost", "detail costs",
-                                                "Team Setting", "Affiliate Dashboard", "Logout"]
-                                    # Проверяем, что это не футер/меню
-                                    footer_menu_keywords = ["Privacy", "Terms", "Copyright", "PIPIADS", "AI-agent", 
-                                                           "cosmobeauty", "credits", "subscription", "invoice", 
-                                                           "Monthly Credits", "Extra Credits", "@gmail.com"]
-                                    is_footer_menu = any(keyword in hook for keyword in footer_menu_keywords)
-                                    
-                                    for stop_word in stop_words:
-                                        if stop_word in hook:
-                                            hook = hook.split(stop_word)[0].strip()
-                                    
-                                    # Убираем метаданные видео (Quality, Size, Resolution и т.д.)
-                                    metadata_patterns = [
-                                        r'Quality\s*:?\s*[^\n]*',
-                                        r'Size\s*:?\s*[^\n]*',
-                                        r'Resolution\s*:?\s*[^\n]*',
-                                        r'Width\s*:?\s*[^\n]*',
-                                        r'Height\s*:?\s*[^\n]*',
-                                        r'Duration\s*:?\s*[^\n]*',
-                                        r'Format\s*:?\s*[^\n]*',
-                                        r'Codec\s*:?\s*[^\n]*',
-                                        r'Frame Rate\s*:?\s*[^\n]*',
-                                        r'--',  # Убираем разделители "--"
-                                    ]
-                                    for pattern in metadata_patterns:
-                                        hook = re.sub(pattern, '', hook, flags=re.IGNORECASE)
-                                    hook = re.sub(r'\n{2,}', '\n', hook).strip()  # Убираем множественные переносы строк
-                                    
-                                    if hook and len(hook) > 5 and not is_footer_menu:
-                                        log.debug(f"Hook найден через '{keyword}' (родитель)")
-                                        return hook
-                        except:
-                            pass
-                        
-                        # Способ 2: Текст следующего элемента
-                        try:
-                            next_sibling = await locator.evaluate_handle("el => el.nextElementSibling")
-                            if next_sibling:
-                                hook = await next_sibling.as_element().inner_text()
-                                # Проверяем, что это не футер/меню
-                                footer_menu_keywords = ["Privacy", "Terms", "Copyright", "PIPIADS", "AI-agent", 
-                                                       "cosmobeauty", "credits", "subscription", "invoice", 
-                                                       "Monthly Credits", "Extra Credits", "@gmail.com"]
-                                is_footer_menu = any(keyword in hook for keyword in footer_menu_keywords)
-                                
-                                # Убираем метаданные видео (Quality, Size, Resolution и т.д.)
-                                metadata_patterns = [
-                                    r'Quality\s*:?\s*[^\n]*',
-                                    r'Size\s*:?\s*[^\n]*',
-                                    r'Resolution\s*:?\s*[^\n]*',
-                                    r'Width\s*:?\s*[^\n]*',
-                                    r'Height\s*:?\s*[^\n]*',
-                                    r'Duration\s*:?\s*[^\n]*',
-                                    r'Format\s*:?\s*[^\n]*',
-                                    r'Codec\s*:?\s*[^\n]*',
-                                    r'Frame Rate\s*:?\s*[^\n]*',
-                                    r'--',  # Убираем разделители "--"
-                                ]
-                                for pattern in metadata_patterns:
-                                    hook = re.sub(pattern, '', hook, flags=re.IGNORECASE)
-                                hook = re.sub(r'\n{2,}', '\n', hook).strip()  # Убираем множественные переносы строк
-                                
-                                if hook and len(hook) > 5 and not is_footer_menu:
-                                    log.debug(f"Hook найден через '{keyword}' (следующий элемент)")
-                                    return hook.strip()
-                        except:
-                            pass
-                except:
+                    locator = self._keyword_locator(keyword)
+                    if await locator.count() == 0:
+                        continue
+                    # Способ 1: Текст родительского элемента
+                    try:
+                        parent_text = await locator.locator(_SECTION_XPATH).first.inner_text()
+                        after_keyword = _text_after_first_keyword(parent_text, _HOOK_KWS)
+                        if after_keyword is not None:
+                            hook = after_keyword.strip()
+                            # Проверяем, что это не футер/меню
+                            is_footer_menu = _FOOTER_MENU_RE.search(hook) is not None
+                            
+                            # Убираем лишние метки (обрезка по первому стоп-слову)
+                            hook = _cut_at_stop_word(hook, _HOOK_STOP_RE)
+                            
+                            # Убираем метаданные видео (Quality, Size, Resolution и т.д.)
+                            hook = _HOOK_METADATA_RE.sub('', hook)
+                            hook = _MULTI_NEWLINE_RE.sub('\n', hook).strip()  # Убираем множественные переносы строк
+                            
+                            if hook and len(hook) > 5 and not is_footer_menu:
+                                log.debug("Hook найден через '%s' (родитель)", keyword)
+                                return hook
+                    except (PlaywrightError, AttributeError):
+                        pass
+                    
+                    # Способ 2: Текст следующего элемента
+                    try:
+                        next_sibling = await locator.evaluate_handle("el => el.nextElementSibling")
+                        if next_sibling:
+                            hook = await next_sibling.as_element().inner_text()
+                            # Проверяем, что это не футер/меню
+                            is_footer_menu = _FOOTER_MENU_RE.search(hook) is not None
+                            
+                            # Убираем метаданные видео (Quality, Size, Resolution и т.д.)
+                            hook = _HOOK_METADATA_RE.sub('', hook)
+                            hook = _MULTI_NEWLINE_RE.sub('\n', hook).strip()  # Убираем множественные переносы строк
+                            
+                            if hook and len(hook) > 5 and not is_footer_menu:
+                                log.debug("Hook найден через '%s' (следующий элемент)", keyword)
+                                return hook.strip()
+                    except (PlaywrightError, AttributeError):
+                        pass
+                except (PlaywrightError, AttributeError):
                     continue
             
             # Метод 2: Поиск через JavaScript (более агрессивный - по структуре DOM)
@@ -2963,92 +3213,105 @@ class ParserEngine:
                                          'Transcript', 'Анализ транскрипта', 'Impressions', 'Показы',
                                          'Script', 'Сценарий', 'Analysis',
                                          'Limited Time Offer', 'Annual Plan', 'Promotion Period', '50% OFF'];
+                        // Стоп-слова не содержат спецсимволов регулярных выражений
+                        const stopRe = new RegExp(stopWords.join('|'));
+                        // Самое раннее вхождение любого ключевого слова в тексте
+                        const firstKeyword = (text) => {
+                            let best = null;
+                            let bestPos = text.length;
+                            for (const kw of keywords) {
+                                const pos = text.indexOf(kw);
+                                if (pos >= 0 && pos < bestPos) {
+                                    best = kw;
+                                    bestPos = pos;
+                                }
+                            }
+                            return best;
+                        };
                         
                         // Ищем элементы с ключевыми словами
                         const allElements = document.querySelectorAll('*');
                         for (const el of allElements) {
                             const text = el.innerText || '';
                             
-                            for (const keyword of keywords) {
-                                if (text.includes(keyword)) {
-                                    let hookText = null;
-                                    
-                                    // Способ 1: Текст следующего sibling элемента
-                                    let nextSibling = el.nextElementSibling;
-                                    if (nextSibling) {
-                                        hookText = nextSibling.innerText || '';
+                            const keyword = firstKeyword(text);
+                            if (keyword) {
+                                let hookText = null;
+                                
+                                // Способ 1: Текст следующего sibling элемента
+                                let nextSibling = el.nextElementSibling;
+                                if (nextSibling) {
+                                    hookText = nextSibling.innerText || '';
+                                }
+                                
+                                // Способ 2: Текст родительского элемента после ключевого слова
+                                if (!hookText || hookText.length < 5) {
+                                    const parentText = el.parentElement ? el.parentElement.innerText || '' : '';
+                                    if (parentText.includes(keyword)) {
+                                        const parts = parentText.split(keyword);
+                                        if (parts.length > 1) {
+                                            hookText = parts[1].trim();
+                                        }
                                     }
-                                    
-                                    // Способ 2: Текст родительского элемента после ключевого слова
-                                    if (!hookText || hookText.length < 5) {
-                                        const parentText = el.parentElement ? el.parentElement.innerText || '' : '';
-                                        if (parentText.includes(keyword)) {
-                                            const parts = parentText.split(keyword);
-                                            if (parts.length > 1) {
-                                                hookText = parts[1].trim();
-                                            }
+                                }
+                                
+                                // Способ 3: Ищем в дочерних элементах
+                                if (!hookText || hookText.length < 5) {
+                                    const children = el.querySelectorAll('p, div, span');
+                                    for (const child of children) {
+                                        const childText = child.innerText || '';
+                                        if (childText.length > 5 && childText.length < 200) {
+                                            hookText = childText;
+                                            break;
                                         }
                                     }
+                                }
+                                
+                                if (hookText) {
+                                    // Убираем стоп-слова (обрезка по первому вхождению)
+                                    const stopPos = hookText.search(stopRe);
+                                    if (stopPos >= 0) {
+                                        hookText = hookText.substring(0, stopPos);
+                                    }
                                     
-                                    // Способ 3: Ищем в дочерних элементах
-                                    if (!hookText || hookText.length < 5) {
-                                        const children = el.querySelectorAll('p, div, span');
-                                        for (const child of children) {
-                                            const childText = child.innerText || '';
-                                            if (childText.length > 5 && childText.length < 200) {
-                                                hookText = childText;
-                                                break;
-                                            }
-                                        }
+                                    hookText = hookText.trim();
+                                    
+                                    // Проверяем, что это похоже на реальный hook (короткая фраза, не промо-текст, не футер/меню)
+                                    const footerMenuKeywords = ['Privacy', 'Terms', 'Copyright', 'PIPIADS', 'All Rights Reserved',
+                                                               'AI-agent', 'cosmobeauty', 'credits', 'subscription', 'invoice',
+                                                               'Monthly Credits', 'Extra Credits', 'data cost', 'detail costs',
+                                                               'Team Setting', 'Affiliate Dashboard', 'Logout', '@gmail.com',
+                                                               'English', 'Français', 'Deutsch', 'Español', 'Português'];
+                                    const isFooterMenu = footerMenuKeywords.some(keyword => hookText.includes(keyword));
+                                    
+                                    // Убираем метаданные видео (Quality, Size, Resolution и т.д.)
+                                    const metadataPatterns = [
+                                        /Quality\s*:?\s*[^\n]*/gi,
+                                        /Size\s*:?\s*[^\n]*/gi,
+                                        /Resolution\s*:?\s*[^\n]*/gi,
+                                        /Width\s*:?\s*[^\n]*/gi,
+                                        /Height\s*:?\s*[^\n]*/gi,
+                                        /Duration\s*:?\s*[^\n]*/gi,
+                                        /Format\s*:?\s*[^\n]*/gi,
+                                        /Codec\s*:?\s*[^\n]*/gi,
+                                        /Frame Rate\s*:?\s*[^\n]*/gi,
+                                        /--/g,  // Убираем разделители "--"
+                                    ];
+                                    let cleanedHook = hookText;
+                                    for (const pattern of metadataPatterns) {
+                                        cleanedHook = cleanedHook.replace(pattern, '');
                                     }
+                                    cleanedHook = cleanedHook.replace(/\n{2,}/g, '\n').trim();  // Убираем множественные переносы строк
                                     
-                                    if (hookText) {
-                                        // Убираем стоп-слова
-                                        for (const stopWord of stopWords) {
-                                            if (hookText.includes(stopWord)) {
-                                                hookText = hookText.split(stopWord)[0];
-                                            }
-                                        }
-                                        
-                                        hookText = hookText.trim();
-                                        
-                                        // Проверяем, что это похоже на реальный hook (короткая фраза, не промо-текст, не футер/меню)
-                                        const footerMenuKeywords = ['Privacy', 'Terms', 'Copyright', 'PIPIADS', 'All Rights Reserved',
-                                                                   'AI-agent', 'cosmobeauty', 'credits', 'subscription', 'invoice',
-                                                                   'Monthly Credits', 'Extra Credits', 'data cost', 'detail costs',
-                                                                   'Team Setting', 'Affiliate Dashboard', 'Logout', '@gmail.com',
-                                                                   'English', 'Français', 'Deutsch', 'Español', 'Português'];
-                                        const isFooterMenu = footerMenuKeywords.some(keyword => hookText.includes(keyword));
-                                        
-                                        // Убираем метаданные видео (Quality, Size, Resolution и т.д.)
-                                        const metadataPatterns = [
-                                            /Quality\s*:?\s*[^\n]*/gi,
-                                            /Size\s*:?\s*[^\n]*/gi,
-                                            /Resolution\s*:?\s*[^\n]*/gi,
-                                            /Width\s*:?\s*[^\n]*/gi,
-                                            /Height\s*:?\s*[^\n]*/gi,
-                                            /Duration\s*:?\s*[^\n]*/gi,
-                                            /Format\s*:?\s*[^\n]*/gi,
-                                            /Codec\s*:?\s*[^\n]*/gi,
-                                            /Frame Rate\s*:?\s*[^\n]*/gi,
-                                            /--/g,  // Убираем разделители "--"
-                                        ];
-                                        let cleanedHook = hookText;
-                                        for (const pattern of metadataPatterns) {
-                                            cleanedHook = cleanedHook.replace(pattern, '');
-                                        }
-                                        cleanedHook = cleanedHook.replace(/\n{2,}/g, '\n').trim();  // Убираем множественные переносы строк
-                                        
-                                        if (cleanedHook && cleanedHook.length > 5 && cleanedHook.length < 300 &&
-                                            !cleanedHook.includes('Limited Time Offer') &&
-                                            !cleanedHook.includes('Annual Plan') &&
-                                            !cleanedHook.includes('Promotion Period') &&
-                                            !cleanedHook.includes('50% OFF') &&
-                                            !cleanedHook.toLowerCase().includes('q4') &&
-                                            !cleanedHook.toLowerCase().includes('monthly plan') &&
-                                            !isFooterMenu) {
-                                            return cleanedHook;
-                                        }
+                                    if (cleanedHook && cleanedHook.length > 5 && cleanedHook.length < 300 &&
+                                        !cleanedHook.includes('Limited Time Offer') &&
+                                        !cleanedHook.includes('Annual Plan') &&
+                                        !cleanedHook.includes('Promotion Period') &&
+                                        !cleanedHook.includes('50% OFF') &&
+                                        !cleanedHook.toLowerCase().includes('q4') &&
+                                        !cleanedHook.toLowerCase().includes('monthly plan') &&
+                                        !isFooterMenu) {
+                                        return cleanedHook;
                                     }
                                 }
                             }
@@ -3060,17 +3323,17 @@ class ParserEngine:
                     log.debug("Hook найден через JavaScript")
                     return hook.strip()
             except Exception as e:
-                log.debug(f"Ошибка при поиске hook через JS: {e}")
+                log.debug("Ошибка при поиске hook через JS: %s", e)
             
             return None
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении hook: {e}")
+            log.debug("Ошибка при извлечении hook: %s", e)
             return None
     
-    async def _extract_audience(self) -> Optional[Dict[str, str]]:
+    async def _extract_audience(self, body_text: str = "") -> Optional[Dict[str, str]]:
         """
-        Извлечь возраст из поля Audience
+        Извлечь возраст из поля Audience (сначала по снимку текста страницы body_text)
         
         Структура HTML:
         <div class="addel-info-item">
@@ -3085,6 +3348,14 @@ class ParserEngine:
         try:
             audience_data = {"age": "N/A", "platform": "N/A"}
             
+            # МЕТОД 0: Регулярное выражение по снимку текста страницы
+            if body_text:
+                age_match = _BODY_AUDIENCE_RE.search(body_text)
+                if age_match:
+                    audience_data["age"] = age_match.group(1)
+                    log.debug("      → Audience age найден в тексте страницы: %s", audience_data['age'])
+                    return audience_data
+            
             # МЕТОД 1: Структурный поиск через селекторы (самый надежный)
             try:
                 # Ищем блок с названием "Audience"
@@ -3101,41 +3372,35 @@ class ParserEngine:
                             if audience_info:
                                 text = await audience_info.inner_text()
                                 # Извлекаем возраст в формате "45-55" (может быть 2 цифры)
-                                age_match = re.search(r'(\d{1,2}-\d{1,2})', text)
+                                age_match = _AGE_RANGE_RE.search(text)
                                 if age_match:
                                     audience_data["age"] = age_match.group(1)
-                                    log.debug(f"      → Audience age найден через структурный селектор: {audience_data['age']}")
+                                    log.debug("      → Audience age найден через структурный селектор: %s", audience_data['age'])
                                     return audience_data
             except Exception as e:
-                log.debug(f"      → Ошибка при структурном поиске audience: {e}")
+                log.debug("      → Ошибка при структурном поиске audience: %s", e)
             
             # МЕТОД 2: Fallback через локаторы (если структурный не сработал)
-            audience_keywords = ["Audience", "Аудитория", "Target Audience", "Целевая аудитория"]
             
-            for keyword in audience_keywords:
+            for keyword in _AUDIENCE_KWS:
                 try:
-                    locator = self.page.locator(f'text=/{keyword}/i').first
-                    if await locator.count() > 0:
-                        # Ищем текст аудитории рядом
-                        text = await locator.locator("..").inner_text()
-                        
-                        # Ищем возраст в формате "25-35" или "45-55"
-                        age_patterns = [
-                            r'Возраст[:\s]+(\d{1,2}-\d{1,2})',
-                            r'Age[:\s]+(\d{1,2}-\d{1,2})',
-                            r'(\d{1,2}-\d{1,2})',  # Просто возраст
-                        ]
-                        
-                        for pattern in age_patterns:
-                            age_match = re.search(pattern, text, re.IGNORECASE)
-                            if age_match:
-                                audience_data["age"] = age_match.group(1)
-                                log.debug(f"      → Audience age найден через локатор: {audience_data['age']}")
-                                break
-                        
-                        if audience_data["age"] != "N/A":
-                            return audience_data
-                except:
+                    locator = self._keyword_locator(keyword)
+                    if await locator.count() == 0:
+                        continue
+                    # Ищем текст аудитории рядом
+                    text = await locator.locator(_SECTION_XPATH).first.inner_text()
+                    
+                    # Ищем возраст в формате "25-35" или "45-55"
+                    for pattern in _AGE_PATTERNS:
+                        age_match = pattern.search(text)
+                        if age_match:
+                            audience_data["age"] = age_match.group(1)
+                            log.debug("      → Audience age найден через локатор: %s", audience_data['age'])
+                            break
+                    
+                    if audience_data["age"] != "N/A":
+                        return audience_data
+                except (PlaywrightError, AttributeError):
                     continue
             
             # Метод 2: Поиск через JavaScript (более агрессивный)
@@ -3191,24 +3456,43 @@ class ParserEngine:
                     audience_data.update(result)
                     return audience_data
             except Exception as e:
-                log.debug(f"Ошибка при поиске audience через JS: {e}")
+                log.debug("Ошибка при поиске audience через JS: %s", e)
             
             return audience_data
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении аудитории: {e}")
+            log.debug("Ошибка при извлечении аудитории: %s", e)
             return None
     
-    async def _extract_country(self) -> Optional[str]:
+    async def _extract_country(self, body_text: str = "") -> Optional[str]:
+        """Извлечь страну (значение запоминается для URL страницы при повторном посещении)"""
+        key = (self.page.url, "country")
+        if key in self._field_cache:
+            return self._field_cache[key]
+        country = await self._find_country(body_text)
+        self._remember_field(key, country)
+        return country
+    
+    async def _find_country(self, body_text: str = "") -> Optional[str]:
         """Извлечь страну из поля 'Country/Region' или 'Страна/регион' (ОТДЕЛЬНО от Audience!)"""
         try:
+            # Поиск по снимку текста страницы: строка сразу после заголовка поля
+            if body_text:
+                match = _BODY_COUNTRY_RE.search(body_text)
+                if match:
+                    country = match.group(1).strip()
+                    # Следующая строка может оказаться подписью другого поля ("First seen"),
+                    # поэтому принимаем только известную страну
+                    if country and _COUNTRY_UNION.search(country):
+                        log.info("      ✅ Country найден в тексте страницы: %s", country)
+                        return country
+            
             # Ждем появления элементов
             try:
                 await self.page.wait_for_selector('div.addel-info-item', timeout=5000, state="visible")
-            except:
-                log.debug(f"      → Элементы div.addel-info-item не появились за 5 секунд")
+            except (PlaywrightError, AttributeError):
+                log.debug("      → Элементы div.addel-info-item не появились за 5 секунд")
             
-            country_keywords = ["Country/Region", "Страна/регион", "Country", "Страна", "Region", "Регион"]
             
             # МЕТОД 0: Структурный поиск через селекторы (самый надежный)
             try:
@@ -3225,193 +3509,105 @@ class ParserEngine:
                             if value_elem:
                                 country_text = await value_elem.inner_text()
                                 # Убираем (1) и т.д.
-                                country = re.sub(r'\([0-9]+\)', '', country_text).strip()
+                                country = country_text.partition('(')[0].strip()
                                 if country and len(country) > 0:
-                                    log.info(f"      ✅ Country найден через структурный селектор: {country}")
+                                    log.info("      ✅ Country найден через структурный селектор: %s", country)
                                     return country
-            except Exception as e:
-                log.debug(f"      → Ошибка при структурном поиске country: {e}")
+            except (PlaywrightError, asyncio.TimeoutError) as e:
+                log.debug("      → Ошибка при структурном поиске country: %s", e)
             
-            for keyword in country_keywords:
+            for keyword in _COUNTRY_KWS:
                 try:
-                    locator = self.page.locator(f'text=/{keyword}/i').first
-                    if await locator.count() > 0:
-                        # Ищем текст страны рядом
-                        text = await locator.locator("..").inner_text()
-                        
-                        # Ищем страну (расширенный список)
-                        country_patterns = [
-                            r'United States(?:\([0-9]+\))?',  # United States(1)
-                            r'USA(?:\([0-9]+\))?',
-                            r'US(?:\([0-9]+\))?',
-                            r'Philippines(?:\([0-9]+\))?',
-                            r'Филиппины(?:\([0-9]+\))?',
-                            r'Russia(?:\([0-9]+\))?',
-                            r'Россия(?:\([0-9]+\))?',
-                            r'China(?:\([0-9]+\))?',
-                            r'Китай(?:\([0-9]+\))?',
-                            r'India(?:\([0-9]+\))?',
-                            r'Индия(?:\([0-9]+\))?',
-                            r'Brazil(?:\([0-9]+\))?',
-                            r'Бразилия(?:\([0-9]+\))?',
-                            r'Germany(?:\([0-9]+\))?',
-                            r'Германия(?:\([0-9]+\))?',
-                            r'France(?:\([0-9]+\))?',
-                            r'Франция(?:\([0-9]+\))?',
-                            r'UK(?:\([0-9]+\))?',
-                            r'United Kingdom(?:\([0-9]+\))?',
-                        ]
-                        
-                        for pattern in country_patterns:
-                            match = re.search(pattern, text, re.IGNORECASE)
-                            if match:
-                                country = match.group(0)
-                                # Убираем (1) и т.д.
-                                country = re.sub(r'\([0-9]+\)', '', country).strip()
-                                log.debug(f"Country найден через '{keyword}': {country}")
-                                return country
-                except:
+                    locator = self._keyword_locator(keyword)
+                    if await locator.count() == 0:
+                        continue
+                    # Ищем текст страны рядом
+                    text = await locator.locator(_SECTION_XPATH).first.inner_text(timeout=FIELD_TEXT_TIMEOUT_MS)
+                    
+                    # Ищем страну (расширенный список, одна альтернация)
+                    match = _COUNTRY_UNION.search(text)
+                    if match:
+                        country = match.group('name')
+                        log.debug("Country найден через '%s': %s", keyword, country)
+                        return country
+                except (PlaywrightError, asyncio.TimeoutError) as e:
+                    log.debug("      → Country: ошибка для '%s': %s", keyword, e)
                     continue
             
             # Метод 2: Поиск через JavaScript
             try:
-                country = await self.page.evaluate("""
-                    () => {
-                        const keywords = ['Country/Region', 'Страна/регион', 'Country', 'Страна'];
-                        const countryPatterns = [
-                            /United States(?:\\([0-9]+\\))?/i,
-                            /USA(?:\\([0-9]+\\))?/i,
-                            /Philippines(?:\\([0-9]+\\))?/i,
-                            /Russia(?:\\([0-9]+\\))?/i,
-                            /China(?:\\([0-9]+\\))?/i,
-                            /India(?:\\([0-9]+\\))?/i
-                        ];
-                        
-                        const allElements = document.querySelectorAll('*');
-                        for (const el of allElements) {
-                            const text = el.innerText || '';
-                            
-                            for (const keyword of keywords) {
-                                if (text.includes(keyword)) {
-                                    for (const pattern of countryPatterns) {
-                                        const match = text.match(pattern);
-                                        if (match) {
-                                            return match[0].replace(/\\([0-9]+\\)/g, '').trim();
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                        return null;
-                    }
-                """)
+                country = (await self._evaluate_text_fields()).get("country")
                 if country:
-                    log.debug(f"Country найден через JavaScript: {country}")
+                    log.debug("Country найден через JavaScript: %s", country)
                     return country.strip()
-            except Exception as e:
-                log.debug(f"Ошибка при поиске country через JS: {e}")
+            except (PlaywrightError, asyncio.TimeoutError) as e:
+                log.debug("Ошибка при поиске country через JS: %s", e)
             
             return None
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении country: {e}")
+            log.debug("Ошибка при извлечении country: %s", e)
             return None
     
-    async def _extract_first_seen(self) -> Optional[str]:
+    async def _extract_first_seen(self, body_text: str = "") -> Optional[str]:
+        """Извлечь First seen (значение запоминается для URL страницы при повторном посещении)"""
+        key = (self.page.url, "first_seen")
+        if key in self._field_cache:
+            return self._field_cache[key]
+        first_seen = await self._find_first_seen(body_text)
+        self._remember_field(key, first_seen)
+        return first_seen
+    
+    async def _find_first_seen(self, body_text: str = "") -> Optional[str]:
         """Извлечь First seen в формате 'Oct 27 2025' - только первую дату из 'Oct 28 2025 ~ Nov 10 2025'"""
         try:
+            # Метод 0: Первая дата после "First seen" в снимке текста страницы
+            if body_text:
+                date_match = _BODY_FIRST_SEEN_RE.search(body_text)
+                if date_match:
+                    date_str = date_match.group(1).replace(',', '').strip()
+                    log.debug("First seen найден в тексте страницы: %s", date_str)
+                    return date_str
+            
             # Метод 1: Поиск через локаторы
-            first_seen_keywords = ["First seen - Last seen", "First seen", "Впервые замечено", "First Seen"]
             
-            for keyword in first_seen_keywords:
+            for keyword in _FIRST_SEEN_KWS:
                 try:
-                    locator = self.page.locator(f'text=/{keyword}/i').first
-                    if await locator.count() > 0:
-                        # Ищем текст даты рядом
-                        text = await locator.locator("..").inner_text()
-                        
-                        # Ищем дату в формате "Oct 27 2025" или "Oct 27, 2025"
-                        # Ищем первую дату из диапазона "Oct 28 2025 ~ Nov 10 2025"
-                        date_patterns = [
-                            r'([A-Z][a-z]{2}\s+\d{1,2}\s+\d{4})',  # Oct 27 2025
-                            r'([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})',  # Oct 27, 2025
-                            r'(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})',  # 27 Oct 2025
-                        ]
-                        
-                        for pattern in date_patterns:
-                            # Ищем первую дату (до ~ или конца строки)
-                            date_match = re.search(pattern, text)
-                            if date_match:
-                                date_str = date_match.group(1)
-                                # Нормализуем формат (убираем запятую если есть)
-                                date_str = date_str.replace(',', '').strip()
-                                log.debug(f"First seen найден через '{keyword}': {date_str}")
-                                return date_str
-                        
-                        # Также пробуем найти дату после ключевых слов
-                        if keyword in text:
-                            parts = text.split(keyword, 1)
-                            if len(parts) > 1:
-                                # Берем только до ~ (если есть диапазон)
-                                after_keyword = parts[1].split('~')[0].strip()
-                                for pattern in date_patterns:
-                                    date_match = re.search(pattern, after_keyword)
-                                    if date_match:
-                                        date_str = date_match.group(1).replace(',', '').strip()
-                                        log.debug(f"First seen найден после '{keyword}': {date_str}")
-                                        return date_str
-                except:
+                    locator = self._keyword_locator(keyword)
+                    if await locator.count() == 0:
+                        continue
+                    # Ищем текст даты рядом
+                    text = await locator.locator(_SECTION_XPATH).first.inner_text(timeout=FIELD_TEXT_TIMEOUT_MS)
+                    
+                    # Без названия месяца дат нет - регулярные выражения не запускаем
+                    if not any(tok in text for tok in _MONTH_TOKENS):
+                        continue
+                    
+                    # Ищем дату в формате "Oct 27 2025" или "Oct 27, 2025"
+                    # Ищем первую дату из диапазона "Oct 28 2025 ~ Nov 10 2025"
+                    # Ищем первую дату (до ~ или конца строки)
+                    date_match = _DATE_RE.search(text)
+                    if date_match:
+                        # Нормализуем формат (убираем запятую если есть)
+                        date_str = date_match.group(1).replace(',', '').strip()
+                        log.debug("First seen найден через '%s': %s", keyword, date_str)
+                        return date_str
+                except (PlaywrightError, asyncio.TimeoutError) as e:
+                    log.debug("      → First seen: ошибка для '%s': %s", keyword, e)
                     continue
             
             # Метод 2: Поиск через JavaScript (более агрессивный - по структуре DOM)
             try:
-                first_seen = await self.page.evaluate("""
-                    () => {
-                        const keywords = ['First seen - Last seen', 'First seen', 'Впервые замечено', 'First Seen'];
-                        const datePatterns = [
-                            /([A-Z][a-z]{2}\\s+\\d{1,2}\\s+\\d{4})/,  // Oct 27 2025
-                            /([A-Z][a-z]{2}\\s+\\d{1,2},\\s+\\d{4})/,  // Oct 27, 2025
-                            /(\\d{1,2}\\s+[A-Z][a-z]{2}\\s+\\d{4})/   // 27 Oct 2025
-                        ];
-                        
-                        const allElements = document.querySelectorAll('*');
-                        for (const el of allElements) {
-                            const text = el.innerText || '';
-                            
-                            for (const keyword of keywords) {
-                                if (text.includes(keyword)) {
-                                    // Ищем дату после ключевого слова
-                                    const index = text.indexOf(keyword);
-                                    let afterKeyword = text.substring(index + keyword.length);
-                                    
-                                    // Берем только до ~ (если есть диапазон)
-                                    if (afterKeyword.includes('~')) {
-                                        afterKeyword = afterKeyword.split('~')[0];
-                                    }
-                                    
-                                    for (const pattern of datePatterns) {
-                                        const match = afterKeyword.match(pattern);
-                                        if (match) {
-                                            const dateStr = match[1].replace(',', '').trim();
-                                            // Возвращаем первую найденную дату (без проверок - фильтрация будет в _filter_videos)
-                                            return dateStr;
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                        return null;
-                    }
-                """)
+                first_seen = (await self._evaluate_text_fields()).get("first_seen")
                 if first_seen:
-                    log.debug(f"First seen найден через JavaScript: {first_seen}")
+                    log.debug("First seen найден через JavaScript: %s", first_seen)
                     return first_seen.strip()
-            except Exception as e:
-                log.debug(f"Ошибка при поиске first_seen через JS: {e}")
+            except (PlaywrightError, asyncio.TimeoutError) as e:
+                log.debug("Ошибка при поиске first_seen через JS: %s", e)
             
             return None
             
         except Exception as e:
-            log.debug(f"Ошибка при извлечении first_seen: {e}")
+            log.debug("Ошибка при извлечении first_seen: %s", e)
             return None
 
@@ -2,9 +2,14 @@
 Sheets Writer - запись данных в Google Sheets
 """
 
+import traceback
+from functools import lru_cache
+
 import gspread
 from google.oauth2.service_account import Credentials
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from . import config
@@ -13,6 +18,61 @@ from . import validator
 
 log = logger.get_logger("SheetsWriter")
 
+# Сколько первых строк столбца A читать при поиске пустой строки
+# (весь столбец читается, только если это окно заполнено целиком)
+COLUMN_A_WINDOW = 200
+
+# Столбцы, которые должны быть заполнены для полной строки (A-Z кроме C)
+_REQUIRED_COLUMNS = frozenset(config.SHEET_COLUMNS.values())
+
+# Столбцы полей каждого из 3 видео (по порядку _VIDEO_FIELDS) - вместо f"video{i}_..." на каждую ячейку
+_VIDEO_FIELDS = ("tiktok", "impression", "script", "hook", "audience", "country", "first_seen")
+_VIDEO_COLS = tuple(
+    tuple(config.SHEET_COLUMNS[f"video{i + 1}_{field}"] for field in _VIDEO_FIELDS)
+    for i in range(3)
+)
+
+# Права сервисного аккаунта
+_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+)
+
+
+def _tune_http_session(client: gspread.Client):
+    """
+    Пул keep-alive соединений для HTTP-сессии gspread: все запросы к Sheets API
+    переиспользуют TLS-соединения вместо нового рукопожатия
+    """
+    # gspread 5.x: client.session, gspread 6.x: client.http_client.session
+    http_client = getattr(client, "http_client", client)
+    session = getattr(http_client, "session", None)
+    if session is None:
+        return
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=3)
+    session.mount("https://", adapter)
+
+
+@lru_cache(maxsize=1)
+def get_client(credentials_path: Path) -> gspread.Client:
+    """
+    Авторизованный клиент gspread (один на процесс: подпись JWT и обмен токена
+    выполняются только при первом вызове)
+    
+    Args:
+        credentials_path: Путь к JSON-ключу сервисного аккаунта
+    
+    Returns:
+        Клиент gspread
+    """
+    credentials = Credentials.from_service_account_file(
+        str(credentials_path),
+        scopes=_SCOPES
+    )
+    client = gspread.authorize(credentials)
+    _tune_http_session(client)
+    return client
+
 
 class SheetsWriter:
     """Класс для записи данных в Google Sheets"""
@@ -22,6 +82,12 @@ class SheetsWriter:
         self.spreadsheet: Optional[gspread.Spreadsheet] = None
         self.worksheet: Optional[gspread.Worksheet] = None  # Основной лист (черновик)
         self.success_worksheet: Optional[gspread.Worksheet] = None  # Лист для успешных записей
+        # Следующая свободная строка (кэш вместо чтения столбца A перед каждой записью).
+        # Хранится, только если ниже нее гарантированно пусто; None - нужно пересканировать
+        self._next_row: Optional[int] = None
+        self._next_success_row: Optional[int] = None
+        # Значения, записанные в строки "Черновик" за эту сессию (для is_row_complete без чтения листа)
+        self._row_state: Dict[int, Dict[str, str]] = {}
         
     def connect(self) -> bool:
         """
@@ -39,18 +105,8 @@ class SheetsWriter:
                 log.error(f"❌ Файл credentials не найден: {credentials_path}")
                 return False
             
-            # Авторизация
-            SCOPE = [
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-            
-            credentials = Credentials.from_service_account_file(
-                str(credentials_path),
-                scopes=SCOPE
-            )
-            
-            self.client = gspread.authorize(credentials)
+            # Авторизация (клиент общий для всех SheetsWriter в процессе)
+            self.client = get_client(credentials_path)
             log.info("✅ Авторизация успешна")
             
             # Открытие таблицы
@@ -89,7 +145,6 @@ class SheetsWriter:
             
         except Exception as e:
             log.error(f"❌ Ошибка при подключении к Google Sheets: {e}")
-            import traceback
             log.error(traceback.format_exc())
             return False
     
@@ -135,61 +190,30 @@ class SheetsWriter:
             # Записываем только базовые данные
             log.info(f"  → Запись в {len(values)} ячеек (базовые данные)...")
             
-            # Записываем по одной ячейке (более надежно)
-            written_count = 0
-            import time
-            for col, value in values.items():
-                cell = f"{col}{row_number}"
-                try:
-                    str_value = str(value)
-                    if len(str_value) > 50000:
-                        str_value = str_value[:50000] + "..."
-                    
-                    # Записываем значение (пробуем update_acell)
-                    try:
-                        self.worksheet.update_acell(cell, str_value)
-                    except Exception as update_error:
-                        # Если update_acell не работает, пробуем update
-                        log.warning(f"  ⚠️ update_acell не сработал для {cell}, пробуем update: {update_error}")
-                        try:
-                            self.worksheet.update(cell, [[str_value]])
-                        except Exception as update2_error:
-                            log.error(f"  ❌ Оба метода записи не сработали для {cell}: {update2_error}")
-                            raise update2_error
-                    
-                    # Проверяем, что записалось (с небольшой задержкой)
-                    time.sleep(0.1)  # Небольшая задержка для синхронизации
-                    
-                    try:
-                        written_value = self.worksheet.acell(cell).value
-                        if written_value == str_value or (written_value and str(written_value).strip() == str(str_value).strip()):
-                            written_count += 1
-                            log.info(f"  ✅ {cell} = '{str(str_value)[:50]}...' (проверено)")
-                        else:
-                            log.warning(f"  ⚠️ {cell}: записано '{str_value[:50]}...', но прочитано '{written_value}'")
-                            written_count += 1  # Все равно считаем успешным
-                    except Exception as check_error:
-                        # Если не удалось проверить, считаем успешным
-                        written_count += 1
-                        log.info(f"  ✅ {cell} = '{str(str_value)[:50]}...' (записано, проверка не удалась: {check_error})")
-                        
-                except Exception as e2:
-                    log.error(f"  ❌ Ошибка записи в {cell}: {e2}")
-                    import traceback
-                    log.error(traceback.format_exc())
-                    return 0
+            # Записываем все ячейки одним запросом
+            try:
+                written_count = self._write_cells(row_number, values)
+            except Exception as e2:
+                log.error(f"  ❌ Ошибка записи в строку {row_number}: {e2}")
+                log.error(traceback.format_exc())
+                self._next_row = None
+                return 0
             
             if written_count == 0:
                 log.error("  ❌ Ничего не записалось!")
                 return 0
             
+            # Строка записана в конец данных - следующая свободная сразу под ней
+            if self._next_row == row_number:
+                self._next_row = row_number + 1
+            
             log.info(f"✅ Базовые данные товара записаны в строку {row_number} ({written_count} ячеек)")
             return row_number
             
         except Exception as e:
             log.error(f"❌ Ошибка при записи базовых данных товара: {e}")
-            import traceback
             log.error(traceback.format_exc())
+            self._next_row = None
             return 0
     
     def write_product_data(self, row_number: int, product_data: Dict[str, Any], update_basic: bool = False) -> bool:
@@ -240,9 +264,7 @@ class SheetsWriter:
             log.info(f"  → Получено {len(videos)} видео для записи")
             
             # Заполняем до 3 видео (если меньше - заполняем N/A)
-            for video_index in range(3):
-                video_prefix = f"video{video_index + 1}_"
-                
+            for video_index, video_cols in enumerate(_VIDEO_COLS):
                 if video_index < len(videos):
                     video = videos[video_index]
                     log.info(f"  → Видео {video_index + 1}: tiktok_link={video.get('tiktok_link', 'N/A')[:50]}, impression={video.get('impression', 0)}, script={len(str(video.get('script', 'N/A')))} символов")
@@ -262,93 +284,52 @@ class SheetsWriter:
                 # Ad-search ссылка (вместо TikTok ссылки)
                 ad_search_url = video.get("ad_search_url", "N/A")
                 if ad_search_url and ad_search_url != "N/A":
-                    values[config.SHEET_COLUMNS[f"{video_prefix}tiktok"]] = ad_search_url
+                    link = ad_search_url
                 else:
                     # Fallback на tiktok_link если ad_search_url нет
-                    tiktok_link = video.get("tiktok_link", "N/A")
-                    values[config.SHEET_COLUMNS[f"{video_prefix}tiktok"]] = tiktok_link
+                    link = video.get("tiktok_link", "N/A")
                 
                 # Impression (может быть строкой "170.6K" или числом)
                 impression = video.get("impression", "N/A")
                 if isinstance(impression, str) and impression != "N/A":
-                    values[config.SHEET_COLUMNS[f"{video_prefix}impression"]] = impression
+                    impression_value = impression
                 elif isinstance(impression, (int, float)) and impression > 0:
                     # Форматируем число в формат "170.6K"
-                    values[config.SHEET_COLUMNS[f"{video_prefix}impression"]] = validator.format_impressions(int(impression))
+                    impression_value = validator.format_impressions(int(impression))
                 else:
-                    values[config.SHEET_COLUMNS[f"{video_prefix}impression"]] = "N/A"
+                    impression_value = "N/A"
                 
-                # Script
+                # Script, Hook, Audience (уже в формате "35-45 Android"), Country,
+                # First seen (формат "Oct 27 2025", не преобразовывать!)
                 script = video.get("script", "N/A")
-                values[config.SHEET_COLUMNS[f"{video_prefix}script"]] = script if script and script != "N/A" else "N/A"
-                
-                # Hook
                 hook = video.get("hook", "N/A")
-                values[config.SHEET_COLUMNS[f"{video_prefix}hook"]] = hook if hook and hook != "N/A" else "N/A"
-                
-                # Audience (уже в формате "35-45 Android")
                 audience_age = video.get("audience_age", "N/A")
-                values[config.SHEET_COLUMNS[f"{video_prefix}audience"]] = audience_age if audience_age and audience_age != "N/A" else "N/A"
-                
-                # Country
                 country = video.get("country", "N/A")
-                values[config.SHEET_COLUMNS[f"{video_prefix}country"]] = country if country and country != "N/A" else "N/A"
-                
-                # First seen (формат "Oct 27 2025", не преобразовывать!)
                 first_seen = video.get("first_seen", "N/A")
-                values[config.SHEET_COLUMNS[f"{video_prefix}first_seen"]] = first_seen if first_seen and first_seen != "N/A" else "N/A"
+                
+                values.update(zip(video_cols, (
+                    link,
+                    impression_value,
+                    script if script and script != "N/A" else "N/A",
+                    hook if hook and hook != "N/A" else "N/A",
+                    audience_age if audience_age and audience_age != "N/A" else "N/A",
+                    country if country and country != "N/A" else "N/A",
+                    first_seen if first_seen and first_seen != "N/A" else "N/A",
+                )))
             
             # Записываем данные в ячейки
             log.info(f"  → Запись в {len(values)} ячеек...")
             log.info(f"  → Данные для записи:")
-            for col, value in sorted(values.items()):
+            for col, value in values.items():  # Порядок вставки уже A→Z
                 log.info(f"      {col}{row_number}: {str(value)[:100]}")
             
-            # Записываем по одной ячейке (более надежно)
-            written_count = 0
-            import time
-            for col, value in sorted(values.items()):  # Сортируем для предсказуемого порядка
-                cell = f"{col}{row_number}"
-                try:
-                    str_value = str(value)
-                    if len(str_value) > 50000:  # Ограничение Google Sheets
-                        str_value = str_value[:50000] + "..."
-                    
-                    log.debug(f"  → Запись {cell} = '{str_value[:100]}'")
-                    
-                    # Записываем значение (пробуем update_acell)
-                    try:
-                        self.worksheet.update_acell(cell, str_value)
-                    except Exception as update_error:
-                        # Если update_acell не работает, пробуем update
-                        log.warning(f"  ⚠️ update_acell не сработал для {cell}, пробуем update: {update_error}")
-                        try:
-                            self.worksheet.update(cell, [[str_value]])
-                        except Exception as update2_error:
-                            log.error(f"  ❌ Оба метода записи не сработали для {cell}: {update2_error}")
-                            raise update2_error
-                    
-                    # Проверяем, что записалось (с небольшой задержкой)
-                    time.sleep(0.1)  # Небольшая задержка для синхронизации
-                    
-                    try:
-                        written_value = self.worksheet.acell(cell).value
-                        if written_value == str_value or (written_value and str(written_value).strip() == str(str_value).strip()):
-                            written_count += 1
-                            log.info(f"  ✅ {cell} = '{str(str_value)[:50]}...' (проверено)")
-                        else:
-                            log.warning(f"  ⚠️ {cell}: записано '{str_value[:50]}...', но прочитано '{written_value}'")
-                            written_count += 1  # Все равно считаем успешным
-                    except Exception as check_error:
-                        # Если не удалось проверить, считаем успешным
-                        written_count += 1
-                        log.info(f"  ✅ {cell} = '{str(str_value)[:50]}...' (записано, проверка не удалась: {check_error})")
-                        
-                except Exception as e2:
-                    log.error(f"  ❌ Ошибка записи в {cell}: {e2}")
-                    import traceback
-                    log.error(traceback.format_exc())
-                    return False
+            # Записываем все ячейки одним запросом
+            try:
+                written_count = self._write_cells(row_number, values)
+            except Exception as e2:
+                log.error(f"  ❌ Ошибка записи в строку {row_number}: {e2}")
+                log.error(traceback.format_exc())
+                return False
             
             if written_count == 0:
                 log.error("  ❌ Ничего не записалось!")
@@ -361,10 +342,61 @@ class SheetsWriter:
             
         except Exception as e:
             log.error(f"❌ Ошибка при записи данных товара: {e}")
-            import traceback
             log.error(traceback.format_exc())
             return False
     
+    def _write_cells(self, row_number: int, values: Dict[str, Any]) -> int:
+        """
+        Записать ячейки строки одним прямоугольным диапазоном (вместо update_acell на каждую ячейку)
+        
+        Пропущенные столбцы внутри диапазона (C) передаются как None - API их не трогает.
+        
+        Args:
+            row_number: Номер строки
+            values: Значения по буквам столбцов ({"A": 1, "B": "..."})
+        
+        Returns:
+            Количество записанных ячеек (ошибки API пробрасываются исключением)
+        """
+        columns = {col: a1_to_rowcol(f"{col}{row_number}")[1] for col in values}
+        first_col, last_col = min(columns.values()), max(columns.values())
+        
+        row_values: List[Any] = [None] * (last_col - first_col + 1)
+        for col, value in values.items():
+            # Числа передаем как есть (в таблице остаются числами), остальное - строкой
+            if not isinstance(value, (int, float)):
+                value = str(value)
+                if len(value) > 50000:  # Ограничение Google Sheets
+                    value = value[:50000] + "..."
+            row_values[columns[col] - first_col] = value
+        
+        cell_range = f"{rowcol_to_a1(row_number, first_col)}:{rowcol_to_a1(row_number, last_col)}"
+        # USER_ENTERED - как у update_acell (числа остаются числами)
+        self.worksheet.update(range_name=cell_range, values=[row_values], value_input_option="USER_ENTERED")
+        
+        self._row_state.setdefault(row_number, {}).update(
+            (col, str(row_values[index - first_col])) for col, index in columns.items()
+        )
+        
+        if config.SHEETS_VERIFY_WRITES:
+            self._verify_cells(cell_range, row_values)
+        
+        return len(values)
+    
+    def _verify_cells(self, cell_range: str, row_values: List[Any]):
+        """Отладочная проверка записи: диапазон перечитывается одним запросом"""
+        try:
+            written = self.worksheet.get(cell_range)
+            actual_row = written[0] if written else []
+            for i, expected in enumerate(row_values):
+                if expected is None:
+                    continue
+                actual = actual_row[i] if i < len(actual_row) else ""
+                if str(actual).strip() != str(expected).strip():
+                    log.warning(f"  ⚠️ {cell_range}[{i}]: записано '{str(expected)[:50]}...', но прочитано '{actual}'")
+        except Exception as check_error:
+            log.debug(f"  → Проверка записи не удалась: {check_error}")
+    
     def is_row_complete(self, row_number: int) -> bool:
         """
         Проверить, заполнена ли строка полностью (все столбцы A-Z кроме C)
@@ -378,6 +410,11 @@ class SheetsWriter:
         if not self.worksheet:
             return False
         
+        # Строка целиком записана в этой сессии - проверяем локально, без запроса к API
+        row_state = self._row_state.get(row_number)
+        if row_state is not None and _REQUIRED_COLUMNS.issubset(row_state):
+            return all(row_state[col].strip() not in ('', 'N/A') for col in _REQUIRED_COLUMNS)
+        
         try:
             # Читаем строку A-Z (столбцы 1-26)
             row_data = self.worksheet.row_values(row_number)
@@ -406,7 +443,8 @@ class SheetsWriter:
         """
         Скопировать успешную запись из "Черновик" на лист "Успешные"
         
-        Вызывается только если строка полностью заполнена (проверка через is_row_complete)
+        Вызывается только если строка полностью заполнена (проверка через is_row_complete),
+        поэтому строка заранее не читается - данные копируются на стороне Google одним запросом
         
         Args:
             row_number: Номер строки в листе "Черновик"
@@ -421,31 +459,53 @@ class SheetsWriter:
         try:
             log.info(f"📋 Копирование строки {row_number} на лист 'Успешные'...")
             
-            # Читаем всю строку из "Черновик"
-            row_data = self.worksheet.row_values(row_number)
-            
-            if not row_data:
-                log.error(f"❌ Строка {row_number} пуста")
-                return False
-            
-            # Находим первую пустую строку на листе "Успешные"
-            success_row = self._find_next_empty_row_in_sheet(self.success_worksheet)
-            
-            # Записываем данные на лист "Успешные"
-            # Обновляем первую ячейку (номер товара) для корректной нумерации
-            if row_data:
-                # Новый номер = success_row - SHEET_START_ROW + 1
-                row_data[0] = success_row - config.SHEET_START_ROW + 1
-            
-            self.success_worksheet.update(f'A{success_row}', [row_data])
+            # Находим первую пустую строку на листе "Успешные" (из кэша, если он есть)
+            if self._next_success_row is not None:
+                success_row, is_tail = self._next_success_row, True
+            else:
+                success_row, is_tail = self._find_next_empty_row_in_sheet(self.success_worksheet)
+            
+            # Копируем строку A-Z на стороне Google (copyPaste, только значения) и в том же
+            # запросе перенумеровываем первую ячейку: новый номер = success_row - SHEET_START_ROW + 1
+            self.spreadsheet.batch_update({
+                "requests": [
+                    {
+                        "copyPaste": {
+                            "source": {
+                                "sheetId": self.worksheet.id,
+                                "startRowIndex": row_number - 1,
+                                "endRowIndex": row_number,
+                                "startColumnIndex": 0,
+                                "endColumnIndex": 26,
+                            },
+                            "destination": {
+                                "sheetId": self.success_worksheet.id,
+                                "startRowIndex": success_row - 1,
+                                "endRowIndex": success_row,
+                                "startColumnIndex": 0,
+                                "endColumnIndex": 26,
+                            },
+                            "pasteType": "PASTE_VALUES",
+                        }
+                    },
+                    {
+                        "updateCells": {
+                            "rows": [{"values": [{"userEnteredValue": {"numberValue": success_row - config.SHEET_START_ROW + 1}}]}],
+                            "fields": "userEnteredValue",
+                            "start": {"sheetId": self.success_worksheet.id, "rowIndex": success_row - 1, "columnIndex": 0},
+                        }
+                    },
+                ]
+            })
+            self._next_success_row = success_row + 1 if is_tail else None
             
             log.info(f"  ✅ Строка скопирована в 'Успешные' (строка {success_row})")
             return True
             
         except Exception as e:
             log.error(f"❌ Ошибка при копировании на лист 'Успешные': {e}")
-            import traceback
             log.error(traceback.format_exc())
+            self._next_success_row = None
             return False
     
     def delete_incomplete_rows(self) -> int:
@@ -510,6 +570,9 @@ class SheetsWriter:
                     log.warning(f"  ⚠️ Не удалось удалить строку {row_number}: {e}")
             
             if deleted_count > 0:
+                # Строки сдвинулись - кэш следующей строки и записанных значений больше не верен
+                self._next_row = None
+                self._row_state.clear()
                 log.info(f"✅ Удалено {deleted_count} неполных строк")
             else:
                 log.info("✅ Неполных строк не найдено")
@@ -518,7 +581,6 @@ class SheetsWriter:
             
         except Exception as e:
             log.error(f"❌ Ошибка при удалении неполных строк: {e}")
-            import traceback
             log.error(traceback.format_exc())
             return 0
     
@@ -552,7 +614,6 @@ class SheetsWriter:
             
         except Exception as e:
             log.error(f"❌ Ошибка при получении последней строки: {e}")
-            import traceback
             log.error(traceback.format_exc())
             return 0
     
@@ -580,30 +641,47 @@ class SheetsWriter:
             
         except Exception as e:
             log.error(f"❌ Ошибка при копировании последней строки: {e}")
-            import traceback
             log.error(traceback.format_exc())
             return False
     
-    def _find_next_empty_row_in_sheet(self, worksheet: gspread.Worksheet) -> int:
-        """Найти первую пустую строку в указанном листе"""
+    def _find_next_empty_row_in_sheet(self, worksheet: gspread.Worksheet) -> Tuple[int, bool]:
+        """
+        Найти первую пустую строку в указанном листе
+        
+        Returns:
+            (номер строки, True если ниже нее данных нет - строку можно кэшировать)
+        """
         try:
             start_row = 2
             max_rows = 100
             
             # Читаем значения столбца A
-            values = worksheet.col_values(1, value_render_option='UNFORMATTED_VALUE')
+            values = self._column_a_values(worksheet, value_render_option='UNFORMATTED_VALUE')
             
             # Ищем первую пустую строку
             for i in range(start_row - 1, max_rows):
                 if i >= len(values) or not values[i]:
-                    return i + 1
+                    return i + 1, i >= len(values)
             
             # Если все заполнено, возвращаем следующую после последней
-            return len(values) + 1
+            return len(values) + 1, True
             
         except Exception as e:
             log.error(f"❌ Ошибка при поиске пустой строки: {e}")
-            return config.SHEET_START_ROW
+            return config.SHEET_START_ROW, False
+    
+    def _column_a_values(self, worksheet: gspread.Worksheet, **kwargs) -> List[Any]:
+        """
+        Значения столбца A (как col_values(1)), но читается только окно A1:A{COLUMN_A_WINDOW}
+        
+        Листы заполняются сверху вниз без больших разрывов, поэтому если в окне есть пустой хвост,
+        ниже него данных нет. Весь столбец запрашивается, только если окно заполнено до конца.
+        """
+        window = worksheet.get(f"A1:A{COLUMN_A_WINDOW}", major_dimension="COLUMNS", **kwargs)
+        values = window[0] if window else []
+        if len(values) >= COLUMN_A_WINDOW:
+            values = worksheet.col_values(1, **kwargs)
+        return values
     
     def find_next_empty_row(self) -> int:
         """
@@ -615,6 +693,10 @@ class SheetsWriter:
         if not self.worksheet:
             return config.SHEET_START_ROW
         
+        # Строка уже известна по предыдущей записи - столбец A не перечитываем
+        if self._next_row is not None:
+            return self._next_row
+        
         try:
             # Читаем столбец A начиная со строки 2 (пример) до строки 100
             # Ищем первую строку, где столбец A пустой
@@ -622,7 +704,7 @@ class SheetsWriter:
             max_rows = 100  # Максимальное количество строк для проверки
             
             # Читаем значения столбца A
-            column_a = self.worksheet.col_values(1)  # Столбец A
+            column_a = self._column_a_values(self.worksheet)
             
             # Ищем первую пустую строку после строки 2
             for row_num in range(start_row + 1, len(column_a) + 1):
@@ -636,6 +718,8 @@ class SheetsWriter:
             if next_row <= start_row:
                 next_row = start_row + 1
             log.info(f"Все строки заполнены, используем новую строку: {next_row}")
+            # Ниже последней заполненной строки пусто - дальше достаточно прибавлять по одной
+            self._next_row = next_row
             return next_row
             
         except Exception as e:
@@ -3,10 +3,31 @@
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, List, Optional
 import re
 
 
+# Словарь месяцев
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+
+# Дата вида "Oct 27 2025" (месяц, день, год)
+_DATE_RE = re.compile(r'([A-Z][a-z]{2})\s+(\d{1,2})\s+(\d{4})')
+
+# Множители суффиксов impressions ("15.1K", "1.5M")
+_IMPRESSION_MULTIPLIERS = {"K": 1000, "M": 1000000}
+
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+
 def parse_video_date(date_string: str) -> Optional[datetime]:
     """
     Парсит дату в формате "Oct 27 2025"
@@ -20,30 +41,17 @@ def parse_video_date(date_string: str) -> Optional[datetime]:
     if not date_string or date_string.strip() == "N/A":
         return None
     
-    # Словарь месяцев
-    months = {
-        "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-        "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
-    }
-    
-    # Разбиваем строку
-    parts = date_string.strip().split()
-    if len(parts) != 3:
+    match = _DATE_RE.fullmatch(date_string.strip())
+    if match is None:
         return None
     
-    month_str, day_str, year_str = parts
-    
     # Получаем месяц
-    month = months.get(month_str)
+    month = _MONTHS.get(match.group(1))
     if month is None:
         return None
     
-    # Парсим день и год
-    try:
-        day = int(day_str)
-        year = int(year_str)
-    except ValueError:
-        return None
+    day = int(match.group(2))
+    year = int(match.group(3))
     
     # Валидация
     if not (1 <= day <= 31) or year < 2020 or year > 2100:
@@ -55,13 +63,14 @@ def parse_video_date(date_string: str) -> Optional[datetime]:
         return None
 
 
-def is_date_within_days(date: Optional[datetime], days: int = 7) -> bool:
+def is_date_within_days(date: Optional[datetime], days: int = 7, today: Optional[datetime] = None) -> bool:
     """
     Проверяет, что дата находится в пределах последних N дней
     
     Args:
         date: Дата для проверки
         days: Количество дней назад
+        today: Текущая дата (если None - берется datetime.now()); для пачек передается один раз
     
     Returns:
         True если дата в пределах периода, False иначе
@@ -69,7 +78,7 @@ def is_date_within_days(date: Optional[datetime], days: int = 7) -> bool:
     if date is None:
         return False
     
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
     cutoff_date = today - timedelta(days=days)
     
     return date >= cutoff_date
@@ -109,26 +118,29 @@ def parse_impressions(impressions_str: str) -> Optional[int]:
     clean_str = impressions_str.strip().replace(",", "").replace(" ", "")
     
     # Обработка формата "15.1K", "1.5M" и т.д.
-    if clean_str.upper().endswith("K"):
-        try:
-            number = float(clean_str[:-1])
-            return int(number * 1000)
-        except ValueError:
-            return None
-    elif clean_str.upper().endswith("M"):
-        try:
-            number = float(clean_str[:-1])
-            return int(number * 1000000)
-        except ValueError:
-            return None
-    
-    # Обычное число
+    multiplier = _IMPRESSION_MULTIPLIERS.get(clean_str[-1:].upper())
     try:
+        if multiplier is not None:
+            return int(float(clean_str[:-1]) * multiplier)
+        # Обычное число
         return int(float(clean_str))
-    except ValueError:
+    except (ValueError, OverflowError):
         return None
 
 
+def parse_impressions_batch(impressions_strs: Iterable[str]) -> List[Optional[int]]:
+    """
+    Парсит пачку строк с impressions (как parse_impressions для каждой)
+    
+    Args:
+        impressions_strs: Строки с количеством показов
+    
+    Returns:
+        Список чисел impressions (None для невалидных) в порядке входных строк
+    """
+    return [parse_impressions(s) for s in impressions_strs]
+
+
 def validate_url(url: str) -> bool:
     """
     Валидация URL
@@ -139,27 +151,37 @@ def validate_url(url: str) -> bool:
     Returns:
         True если URL валиден
     """
-    if not url or url.strip() == "N/A":
+    if not url:
         return False
     
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    url = url.strip()
+    return url != "N/A" and _URL_RE.match(url) is not None
+
+
+def validate_urls_batch(urls: Iterable[str]) -> List[bool]:
+    """
+    Валидация пачки URL (как validate_url для каждого)
     
-    return bool(url_pattern.match(url.strip()))
+    Args:
+        urls: URL для проверки
+    
+    Returns:
+        Список флагов валидности в порядке входных URL
+    """
+    match = _URL_RE.match
+    return [bool(url) and match(url.strip()) is not None for url in urls]
 
 
-def validate_video_date_string(date_string: str, days_back: int = 7) -> tuple[bool, Optional[str]]:
+def validate_video_date_string(
+    date_string: str, days_back: int = 7, today: Optional[datetime] = None
+) -> tuple[bool, Optional[str]]:
     """
     Валидация строки с датой видео (полная проверка)
     
     Args:
         date_string: Строка с датой в формате "Oct 27 2025"
         days_back: Количество дней назад для проверки
+        today: Текущая дата (если None - берется datetime.now())
     
     Returns:
         (is_valid, error_message)
@@ -171,12 +193,31 @@ def validate_video_date_string(date_string: str, days_back: int = 7) -> tuple[bo
     if parsed_date is None:
         return False, f"Не удалось распарсить дату: {date_string}"
     
-    if not is_date_within_days(parsed_date, days_back):
+    if not is_date_within_days(parsed_date, days_back, today):
         return False, f"Дата {date_string} старше {days_back} дней"
     
     return True, None
 
 
+def validate_video_dates_batch(
+    dates: Iterable[str], days_back: int = 7, now: Optional[datetime] = None
+) -> List[tuple[bool, Optional[str]]]:
+    """
+    Валидация пачки строк с датами видео (как validate_video_date_string для каждой)
+    
+    Args:
+        dates: Строки с датами в формате "Oct 27 2025"
+        days_back: Количество дней назад для проверки
+        now: Текущее время (если None - берется datetime.now() один раз на всю пачку)
+    
+    Returns:
+        Список (is_valid, error_message) в порядке входных дат
+    """
+    if now is None:
+        now = datetime.now()
+    return [validate_video_date_string(date_string, days_back, now) for date_string in dates]
+
+
 def format_audience(age: Optional[str], platform: Optional[str] = None) -> str:
     """
     Форматирует строку аудитории в формате "35-45 Android"
@@ -11,6 +11,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.browser_manager import BrowserManager
+from src import config
 from src import logger
 
 log = logger.get_logger("TestBrowserManager")
@@ -28,7 +29,8 @@ async def test_browser_manager():
     try:
         # Инициализация
         print("1. Инициализация браузера...")
-        success = await browser_manager.initialize(headless=False)  # headful для теста
+        # Режим берется из config (BROWSER_HEADLESS=false - окно для ручной проверки)
+        success = await browser_manager.initialize()
         if not success:
             print("❌ Ошибка инициализации браузера")
             return False
@@ -77,10 +79,11 @@ async def test_browser_manager():
         print("=" * 50)
         print("✅ ВСЕ ТЕСТЫ ПРОЙДЕНЫ")
         print("=" * 50)
-        print()
-        print("⚠️ Браузер останется открытым для проверки")
-        print("Нажмите Enter для закрытия...")
-        input()
+        if not config.BROWSER_HEADLESS:
+            print()
+            print("⚠️ Браузер останется открытым для проверки")
+            print("Нажмите Enter для закрытия...")
+            input()
         
         return True
         
@@ -99,6 +102,13 @@ if __name__ == "__main__":
     print("Тестирование Browser Manager")
     print("=" * 50 + "\n")
     
+    # uvloop (Linux/macOS), если установлен - быстрее стандартного event loop
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         success = asyncio.run(test_browser_manager())
         sys.exit(0 if success else 1)
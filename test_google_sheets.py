@@ -30,7 +30,7 @@ def test_google_sheets_connection():
     # Проверка установки библиотек
     try:
         import gspread
-        from google.oauth2.service_account import Credentials
+        from src.sheets_writer import get_client
         print("✅ Библиотеки установлены")
     except ImportError as e:
         print(f"❌ ОШИБКА: Библиотеки не установлены!")
@@ -39,17 +39,8 @@ def test_google_sheets_connection():
     
     # Попытка подключения
     try:
-        SCOPE = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_file(
-            str(credentials_path),
-            scopes=SCOPE
-        )
-        
-        client = gspread.authorize(credentials)
+        # Тот же кэшированный клиент, что использует SheetsWriter
+        client = get_client(credentials_path)
         print("✅ Успешная авторизация")
         
         # Попытка открыть таблицу
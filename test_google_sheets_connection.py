@@ -45,22 +45,37 @@ def test_connection():
     try:
         if sheets_writer.connect():
             log.info("✅ Подключение успешно")
-            log.info(f"  → Worksheet открыт: {sheets_writer.worksheet is not None}")
-            log.info(f"  → Success worksheet открыт: {sheets_writer.success_worksheet is not None}")
+            worksheet = sheets_writer.worksheet
+            success_worksheet = sheets_writer.success_worksheet
+            log.info(f"  → Worksheet открыт: {worksheet is not None}")
+            log.info(f"  → Success worksheet открыт: {success_worksheet is not None}")
             
-            if sheets_writer.worksheet:
-                log.info(f"  → Название листа 'Черновик': {sheets_writer.worksheet.title}")
-                # Получаем количество строк
-                try:
-                    all_values = sheets_writer.worksheet.get_all_values()
-                    log.info(f"  → Всего строк в 'Черновик': {len(all_values)}")
-                    if len(all_values) > 0:
-                        log.info(f"  → Последняя строка с данными: {len(all_values)}")
-                except Exception as e:
-                    log.warning(f"  ⚠️ Не удалось получить данные: {e}")
+            # Количество строк обоих листов - одним batchGet только по столбцу A
+            worksheets = [ws for ws in (worksheet, success_worksheet) if ws]
+            row_counts = {}
+            try:
+                response = sheets_writer.spreadsheet.values_batch_get(
+                    [f"'{ws.title}'!A:A" for ws in worksheets]
+                )
+                for ws, value_range in zip(worksheets, response.get("valueRanges", [])):
+                    row_counts[ws.title] = len(value_range.get("values", []))
+            except Exception as e:
+                log.warning(f"  ⚠️ Не удалось получить данные: {e}")
             
-            if sheets_writer.success_worksheet:
-                log.info(f"  → Название листа 'Успешные': {sheets_writer.success_worksheet.title}")
+            if worksheet:
+                title = worksheet.title
+                log.info(f"  → Название листа 'Черновик': {title}")
+                if title in row_counts:
+                    row_count = row_counts[title]
+                    log.info(f"  → Всего строк в 'Черновик': {row_count}")
+                    if row_count > 0:
+                        log.info(f"  → Последняя строка с данными: {row_count}")
+            
+            if success_worksheet:
+                title = success_worksheet.title
+                log.info(f"  → Название листа 'Успешные': {title}")
+                if title in row_counts:
+                    log.info(f"  → Всего строк в 'Успешные': {row_counts[title]}")
             
             return True
         else:
@@ -3,8 +3,13 @@
 """
 
 import asyncio
+import json
+import os
 import sys
+import traceback
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, List, Set
 
 # Добавляем путь к src
 sys.path.insert(0, str(Path(__file__).parent))
@@ -17,31 +22,64 @@ from src import logger
 
 log = logger.get_logger("TestParserEngine")
 
+# Разделители в логах
+SEP60 = "=" * 60
+SEP80 = "=" * 80
+
+# Полностраничный скриншот при ошибке (по умолчанию - только видимая область)
+DEBUG_FULLPAGE_SCREENSHOT = os.getenv("DEBUG_FULLPAGE_SCREENSHOT", "false").lower() == "true"
+
+# Ban-list между запусками (PERSIST_BAN_LIST=true): уже проверенные товары не открываются повторно
+PERSIST_BAN_LIST = os.getenv("PERSIST_BAN_LIST", "false").lower() == "true"
+BAN_LIST_FILE = config.LOGS_DIR / "banned_products.json"
+
 # Проверка наличия credentials файла перед началом
 credentials_path = config.get_google_credentials_path()
 if not credentials_path.exists():
-    log.warning(f"⚠️ Файл Google credentials не найден: {credentials_path}")
+    log.warning("⚠️ Файл Google credentials не найден: %s", credentials_path)
     log.warning("  → Запись в Google Sheets будет недоступна")
 else:
-    log.info(f"✅ Файл Google credentials найден: {credentials_path}")
+    log.info("✅ Файл Google credentials найден: %s", credentials_path)
+
+
+def wait_for_enter(prompt: str):
+    """
+    Ждет нажатия Enter (вместо фиксированной паузы)
+    
+    input() вызывается напрямую: в этот момент на event loop больше ничего не выполняется,
+    а из потока executor'а Ctrl+C не прерывал бы ожидание.
+    """
+    # Без терминала (CI, вывод в пайп) ждать некого
+    if os.getenv("CI") == "true" or not sys.stdin.isatty():
+        return
+    try:
+        input(prompt)
+    except (EOFError, KeyboardInterrupt):
+        pass
 
 
 async def test_parser_engine():
     """Тестирование Parser Engine"""
     
     browser_manager = None
+    # Ban-list: URL товаров, которые уже обрабатывались (нормализованные).
+    # Объявлен до try, чтобы finally сохранил его и при Ctrl+C / ошибке
+    banned_products: Set[str] = set()
     try:
-        log.info("=" * 60)
+        log.info(SEP60)
         log.info("ТЕСТИРОВАНИЕ PARSER ENGINE")
-        log.info("=" * 60)
+        log.info(SEP60)
         
         # 1. Инициализация браузера
         log.info("\n1. Инициализация браузера...")
         browser_manager = BrowserManager()
-        success = await browser_manager.initialize(headless=False)  # headful для отладки
+        # Режим берется из config (BROWSER_HEADLESS=false - окно для отладки)
+        success = await browser_manager.initialize()
         if not success:
             log.error("❌ Не удалось инициализировать браузер")
             return
+        # Картинки/шрифты/аналитика для теста не нужны
+        await browser_manager.block_heavy_resources()
         
         # 2. Загрузка cookies (если есть)
         log.info("\n2. Загрузка cookies...")
@@ -58,7 +96,15 @@ async def test_parser_engine():
             log.error("❌ Не удалось загрузить страницу")
             return
         
-        await browser_manager.human_delay(2, 3)
+        # Ждем первую карточку товара или форму входа (вместо фиксированной паузы)
+        try:
+            await browser_manager.page.wait_for_selector(
+                'a[href*="/tiktok-shop-product/"], input[type="email"]',
+                state="attached",
+                timeout=15000
+            )
+        except Exception as e:
+            log.warning("⚠️ Ни карточки товаров, ни форма входа не появились: %s", e)
         
         # 4. Авторизация (если нужно)
         log.info("\n4. Проверка авторизации...")
@@ -86,22 +132,21 @@ async def test_parser_engine():
             log.info("  → Создан объект SheetsWriter")
             if sheets_writer.connect():
                 log.info("✅ Подключение к Google Sheets успешно")
-                log.info(f"  → Worksheet открыт: {sheets_writer.worksheet is not None}")
+                log.info("  → Worksheet открыт: %s", sheets_writer.worksheet is not None)
             else:
                 log.warning("⚠️ Не удалось подключиться к Google Sheets, продолжаем без записи")
                 log.warning("  → sheets_writer будет None, запись в таблицу не будет работать")
                 sheets_writer = None  # Явно устанавливаем None при неудаче
         except Exception as e:
-            log.error(f"❌ Критическая ошибка при подключении к Google Sheets: {e}")
-            import traceback
+            log.error("❌ Критическая ошибка при подключении к Google Sheets: %s", e)
             log.error(traceback.format_exc())
             log.warning("  → sheets_writer будет None, запись в таблицу не будет работать")
             sheets_writer = None  # Явно устанавливаем None при ошибке
         
         # 7. Цикл обработки товаров с главной страницы
-        log.info("\n" + "=" * 80)
+        log.info("\n" + SEP80)
         log.info("7. НАЧАЛО ОБРАБОТКИ ТОВАРОВ")
-        log.info("=" * 80)
+        log.info(SEP80)
         
         # Настройки обработки
         # УСЛАБЛЕНО для рабочей версии: снижены требования
@@ -111,10 +156,19 @@ async def test_parser_engine():
         
         successful_products = 0  # Счетчик успешно обработанных товаров
         checked_products = 0      # Счетчик проверенных товаров
-        skipped_products = []     # Список пропущенных товаров
-        banned_products = set()   # Ban-list: URL товаров, которые уже обрабатывались (нормализованные)
+        skipped_products: List[Dict[str, Any]] = []  # Список пропущенных товаров
+        if PERSIST_BAN_LIST and BAN_LIST_FILE.exists():
+            try:
+                banned_products.update(json.loads(BAN_LIST_FILE.read_text(encoding="utf-8")))
+                log.info("🚫 Загружен ban-list прошлых запусков: %s товаров", len(banned_products))
+            except (OSError, ValueError) as e:
+                log.warning("⚠️ Не удалось загрузить ban-list: %s", e)
         all_products_analytics = []  # Аналитика ВСЕХ товаров для summary-файла
         
+        def skip_product(name: str, reason: str, videos_found: int):
+            """Добавить товар в список пропущенных"""
+            skipped_products.append({"name": name, "reason": reason, "videos_found": videos_found})
+        
         def normalize_url(url: str) -> str:
             """Нормализовать URL (убрать слэш в конце, привести к единому виду)"""
             if not url:
@@ -129,23 +183,23 @@ async def test_parser_engine():
         while successful_products < MIN_PRODUCTS_TO_COLLECT and checked_products < MAX_PRODUCTS_TO_CHECK:
             
             # 7.1. Получение списка товаров с главной страницы (текущее состояние)
-            log.info(f"\n{'='*80}")
-            log.info(f"Получение товаров с главной страницы...")
-            log.info(f"Прогресс: {successful_products}/{MIN_PRODUCTS_TO_COLLECT} товаров обработано, "
-                    f"{checked_products}/{MAX_PRODUCTS_TO_CHECK} проверено")
-            log.info(f"{'='*80}")
+            log.info("\n" + SEP80)
+            log.info("Получение товаров с главной страницы...")
+            log.info("Прогресс: %s/%s товаров обработано, %s/%s проверено",
+                     successful_products, MIN_PRODUCTS_TO_COLLECT, checked_products, MAX_PRODUCTS_TO_CHECK)
+            log.info(SEP80)
             
             try:
                 products = await parser.get_products_from_search_page(count=PRODUCTS_PER_PAGE)
             except Exception as e:
-                log.error(f"❌ Ошибка при получении товаров: {e}")
+                log.error("❌ Ошибка при получении товаров: %s", e)
                 break
             
             if not products:
                 log.error("❌ Не удалось получить товары, завершаем")
                 break
             
-            log.info(f"✅ Получено {len(products)} товаров на текущей странице")
+            log.info("✅ Получено %s товаров на текущей странице", len(products))
             
             # 7.1.5. Дедупликация по URL (простая и надежная)
             # ВАЖНО: Используем banned_products для проверки, чтобы не обрабатывать товары, которые уже были обработаны
@@ -157,19 +211,19 @@ async def test_parser_engine():
                 product_url = normalize_url(product.get('url', ''))
                 
                 if not product_url:
-                    log.warning(f"⚠️ Пропуск товара без URL")
+                    log.warning("⚠️ Пропуск товара без URL")
                     continue
                 
                 # Проверяем против banned_products (уже обработанные товары)
                 if product_url in banned_products:
                     duplicate_count += 1
-                    log.info(f"⏭️  Дубликат товара пропущен (уже в ban-list): {product_url}")
+                    log.info("⏭️  Дубликат товара пропущен (уже в ban-list): %s", product_url)
                     continue
                 
                 # Проверяем на дубликаты внутри текущего списка
                 if product_url in seen_urls:
                     duplicate_count += 1
-                    log.info(f"⏭️  Дубликат товара пропущен (в текущем списке): {product_url}")
+                    log.info("⏭️  Дубликат товара пропущен (в текущем списке): %s", product_url)
                     continue
                 
                 seen_urls.add(product_url)
@@ -178,47 +232,48 @@ async def test_parser_engine():
                 unique_products.append(product)
             
             if duplicate_count > 0:
-                log.info(f"🔍 Найдено {duplicate_count} дубликатов, оставлено {len(unique_products)} уникальных товаров")
+                log.info("🔍 Найдено %s дубликатов, оставлено %s уникальных товаров", duplicate_count, len(unique_products))
             
             products = unique_products  # Используем только уникальные товары
-            log.info(f"✅ После дедупликации: {len(products)} уникальных товаров для обработки")
+            log.info("✅ После дедупликации: %s уникальных товаров для обработки", len(products))
             
             # 7.2. Цикл по товарам на текущей странице
             for product_index, product in enumerate(products):
                 
                 # Проверка достижения целевого количества
                 if successful_products >= MIN_PRODUCTS_TO_COLLECT:
-                    log.info(f"\n🎯 Цель достигнута! Собрано {MIN_PRODUCTS_TO_COLLECT} товаров")
+                    log.info("\n🎯 Цель достигнута! Собрано %s товаров", MIN_PRODUCTS_TO_COLLECT)
                     break
                 
                 # Проверка лимита проверенных товаров
                 if checked_products >= MAX_PRODUCTS_TO_CHECK:
-                    log.warning(f"\n⚠️ Достигнут лимит проверок ({MAX_PRODUCTS_TO_CHECK} товаров)")
+                    log.warning("\n⚠️ Достигнут лимит проверок (%s товаров)", MAX_PRODUCTS_TO_CHECK)
                     break
                 
-                # ⚠️ ПРОВЕРКА BAN-LIST: пропускаем товары, которые уже обрабатывались
-                product_url = normalize_url(product.get('url', ''))
-                
-                if not product_url:
-                    log.warning(f"⚠️ Не удалось нормализовать URL товара, пропускаем")
-                    continue
+                # URL уже нормализован и отфильтрован по ban-list при дедупликации (7.1.5)
+                product_url = product['url']
                 
                 # КРИТИЧНО: Проверяем ban-list ПЕРЕД обработкой
+                # (парсер мог добавить товар в ban-list, пока обрабатывались предыдущие)
                 if product_url in banned_products:
-                    log.warning(f"🚫 ПРОПУСК: Товар уже в ban-list: {product_url}")
-                    log.warning(f"   Это дубликат! Пропускаем обработку.")
+                    log.warning("🚫 ПРОПУСК: Товар уже в ban-list: %s", product_url)
+                    log.warning("   Это дубликат! Пропускаем обработку.")
                     continue
                 
                 checked_products += 1
+                product_name = product.get('name', 'N/A')
                 
-                # Логирование начала обработки товара
-                log.info(f"\n{'='*80}")
-                log.info(f"📦 ТОВАР {checked_products}/{MAX_PRODUCTS_TO_CHECK} "
-                        f"(успешных: {successful_products}/{MIN_PRODUCTS_TO_COLLECT})")
-                log.info(f"{'='*80}")
-                log.info(f"Название: {product.get('name', 'N/A')[:70]}...")
-                log.info(f"Категория: {product.get('category', 'N/A')}")
-                log.info(f"URL: {product_url}")
+                # Логирование начала обработки товара (одной записью)
+                log.info("\n".join((
+                    "",
+                    SEP80,
+                    f"📦 ТОВАР {checked_products}/{MAX_PRODUCTS_TO_CHECK} "
+                    f"(успешных: {successful_products}/{MIN_PRODUCTS_TO_COLLECT})",
+                    SEP80,
+                    f"Название: {product_name[:70]}...",
+                    f"Категория: {product.get('category', 'N/A')}",
+                    f"URL: {product_url}",
+                )))
                 
                 try:
                     # 7.3. Обработка товара (переход на страницу товара по URL)
@@ -231,22 +286,18 @@ async def test_parser_engine():
                     
                     # КРИТИЧНО: Добавляем товар в ban-list ПОСЛЕ обработки (независимо от результата)
                     banned_products.add(product_url)
-                    log.info(f"   ✅ Добавлен в ban-list ПОСЛЕ обработки: {product_url}")
+                    log.info("   ✅ Добавлен в ban-list ПОСЛЕ обработки: %s", product_url)
                     
                     # 7.4. Проверка результата
                     if product_data is None:
                         # Ошибка при обработке
-                        log.error(f"❌ Ошибка при обработке товара")
+                        log.error("❌ Ошибка при обработке товара")
                         
-                        skipped_products.append({
-                            "name": product.get('name', 'N/A'),
-                            "reason": "Ошибка при обработке",
-                            "videos_found": 0
-                        })
+                        skip_product(product_name, "Ошибка при обработке", 0)
                         
                         # Добавляем в аналитику (без данных о видео)
                         all_products_analytics.append({
-                            "product_name": product.get('name', 'N/A'),
+                            "product_name": product_name,
                             "product_url": product_url,
                             "success": False,
                             "videos_found": 0,
@@ -257,28 +308,26 @@ async def test_parser_engine():
                     # Проверка на дубликат (если вернулся статус "duplicate")
                     if isinstance(product_data, dict) and product_data.get("status") == "duplicate":
                         duplicate_url = product_data.get('product_url', 'N/A')
-                        log.warning(f"🚫 ПРОПУСК: Товар уже обработан (дубликат): {duplicate_url}")
+                        log.warning("🚫 ПРОПУСК: Товар уже обработан (дубликат): %s", duplicate_url)
                         duplicate_count += 1
                         continue
                     
                     if isinstance(product_data, dict) and product_data.get("status") == "insufficient_videos":
                         # Недостаточно видео - пропускаем
-                        log.warning(f"⏭️  ПРОПУСК: недостаточно видео")
-                        log.warning(f"   Найдено: {product_data.get('videos_found', 0)} видео")
-                        log.warning(f"   Нужно: {product_data.get('videos_required', 3)} видео")
+                        videos_found = product_data.get('videos_found', 0)
+                        skipped_name = product_data.get('product_name', product_name)
+                        log.warning("⏭️  ПРОПУСК: недостаточно видео")
+                        log.warning("   Найдено: %s видео", videos_found)
+                        log.warning("   Нужно: %s видео", product_data.get('videos_required', 3))
                         
-                        skipped_products.append({
-                            "name": product_data.get('product_name', product.get('name', 'N/A')),
-                            "reason": product_data.get('reason', 'Недостаточно видео'),
-                            "videos_found": product_data.get('videos_found', 0)
-                        })
+                        skip_product(skipped_name, product_data.get('reason', 'Недостаточно видео'), videos_found)
                         
                         # Добавляем в аналитику (без данных о видео - товар вернул insufficient_videos)
                         all_products_analytics.append({
-                            "product_name": product_data.get('product_name', product.get('name', 'N/A')),
+                            "product_name": skipped_name,
                             "product_url": product_url,
                             "success": False,
-                            "videos_found": product_data.get('videos_found', 0),
+                            "videos_found": videos_found,
                             "top_3_videos": []  # Нет данных о топ-3
                         })
                         continue
@@ -310,54 +359,49 @@ async def test_parser_engine():
                         successful_products += 1
                         analytics_entry["success"] = True
                         
-                        log.info(f"\n✅ УСПЕХ! Товар обработан ({successful_products}/{MIN_PRODUCTS_TO_COLLECT})")
-                        log.info(f"   Название: {product_data.product_name[:70]}...")
-                        log.info(f"   Количество видео: {len(product_data.videos)}")
+                        log.info("\n✅ УСПЕХ! Товар обработан (%s/%s)", successful_products, MIN_PRODUCTS_TO_COLLECT)
+                        log.info("   Название: %s...", product_data.product_name[:70])
+                        log.info("   Количество видео: %s", len(product_data.videos))
                         
                         # Краткий вывод данных видео
                         for i, video in enumerate(product_data.videos[:3], 1):
-                            log.info(f"   Видео {i}: {video.get('impression', 0)} impressions, "
-                                    f"{video.get('country', 'N/A')}, {video.get('audience_age', 'N/A')}")
+                            log.info("   Видео %s: %s impressions, %s, %s", i, video.get('impression', 0),
+                                     video.get('country', 'N/A'), video.get('audience_age', 'N/A'))
                         
                         # Проверяем заполненность строки и копируем в "Успешные" если все поля заполнены
                         if sheets_writer and hasattr(product_data, '_sheets_row'):
                             try:
                                 # Проверяем, что все столбцы A-Z (кроме C) заполнены
-                                if sheets_writer.is_row_complete(product_data._sheets_row):
-                                    sheets_writer.copy_to_success_sheet(product_data._sheets_row)
-                                    log.info(f"  ✅ Строка {product_data._sheets_row} полностью заполнена → скопирована в 'Успешные'")
+                                if await asyncio.to_thread(sheets_writer.is_row_complete, product_data._sheets_row):
+                                    await asyncio.to_thread(sheets_writer.copy_to_success_sheet, product_data._sheets_row)
+                                    log.info("  ✅ Строка %s полностью заполнена → скопирована в 'Успешные'", product_data._sheets_row)
                                 else:
-                                    log.warning(f"  ⚠️ Строка {product_data._sheets_row} не полностью заполнена (есть пустые ячейки)")
+                                    log.warning("  ⚠️ Строка %s не полностью заполнена (есть пустые ячейки)", product_data._sheets_row)
                             except Exception as e:
-                                log.warning(f"  ⚠️ Не удалось обработать копирование в 'Успешные': {e}")
+                                log.warning("  ⚠️ Не удалось обработать копирование в 'Успешные': %s", e)
                     
                     # Добавляем в аналитику
                     all_products_analytics.append(analytics_entry)
                     
                     # 7.7. Если видео меньше 3 - пропускаем
                     if not analytics_entry["success"]:
-                        log.warning(f"⚠️ Товар обработан, но меньше 3 видео")
+                        log.warning("⚠️ Товар обработан, но меньше 3 видео")
                         
-                        skipped_products.append({
-                            "name": getattr(product_data, 'product_name', product.get('name', 'N/A')),
-                            "reason": "Меньше 3 видео после обработки",
-                            "videos_found": len(getattr(product_data, 'videos', []))
-                        })
+                        skip_product(
+                            getattr(product_data, 'product_name', product_name),
+                            "Меньше 3 видео после обработки",
+                            analytics_entry["videos_found"]
+                        )
                 
                 except Exception as e:
-                    log.error(f"❌ Ошибка при обработке товара: {e}")
-                    import traceback
+                    log.error("❌ Ошибка при обработке товара: %s", e)
                     log.error(traceback.format_exc())
                     
                     # Добавляем в ban-list даже при ошибке, чтобы не обрабатывать повторно
                     banned_products.add(product_url)
-                    log.info(f"   ✅ Добавлен в ban-list после ошибки: {product_url}")
+                    log.info("   ✅ Добавлен в ban-list после ошибки: %s", product_url)
                     
-                    skipped_products.append({
-                        "name": product.get('name', 'N/A'),
-                        "reason": f"Исключение: {str(e)[:50]}",
-                        "videos_found": 0
-                    })
+                    skip_product(product_name, f"Исключение: {str(e)[:50]}", 0)
             
             # 7.6. Проверка условий выхода из главного цикла
             if successful_products >= MIN_PRODUCTS_TO_COLLECT:
@@ -366,183 +410,200 @@ async def test_parser_engine():
             if checked_products >= MAX_PRODUCTS_TO_CHECK:
                 break
         
-        # 8. Итоговый отчет
-        log.info(f"\n{'='*80}")
-        log.info("📊 ИТОГОВЫЙ ОТЧЕТ")
-        log.info(f"{'='*80}")
-        log.info(f"✅ Успешно обработано товаров: {successful_products}")
-        log.info(f"⏭️  Пропущено товаров: {len(skipped_products)}")
-        log.info(f"🔍 Всего проверено товаров: {checked_products}")
-        log.info(f"🚫 Товаров в ban-list: {len(banned_products)}")
-        log.info(f"{'='*80}")
+        # 8. Итоговый отчет (одной записью)
+        log.info("\n".join((
+            "",
+            SEP80,
+            "📊 ИТОГОВЫЙ ОТЧЕТ",
+            SEP80,
+            f"✅ Успешно обработано товаров: {successful_products}",
+            f"⏭️  Пропущено товаров: {len(skipped_products)}",
+            f"🔍 Всего проверено товаров: {checked_products}",
+            f"🚫 Товаров в ban-list: {len(banned_products)}",
+            SEP80,
+        )))
         
         # Вывод ban-list
         if banned_products:
-            log.info(f"\n🚫 BAN-LIST (обработанные товары):")
+            log.info("\n🚫 BAN-LIST (обработанные товары):")
             for i, product_url in enumerate(sorted(banned_products), 1):
-                log.info(f"   {i}. {product_url}")
+                log.info("   %s. %s", i, product_url)
         
         if skipped_products:
-            log.info(f"\n⏭️  СПИСОК ПРОПУЩЕННЫХ ТОВАРОВ:")
+            log.info("\n⏭️  СПИСОК ПРОПУЩЕННЫХ ТОВАРОВ:")
             for i, skipped in enumerate(skipped_products, 1):
-                log.info(f"   {i}. {skipped['name'][:60]}...")
-                log.info(f"      Причина: {skipped['reason']}")
-                log.info(f"      Видео найдено: {skipped['videos_found']}")
+                log.info("   %s. %s...", i, skipped['name'][:60])
+                log.info("      Причина: %s", skipped['reason'])
+                log.info("      Видео найдено: %s", skipped['videos_found'])
         
         if successful_products >= MIN_PRODUCTS_TO_COLLECT:
-            log.info(f"\n🎉 ЦЕЛЬ ДОСТИГНУТА! Собрано {MIN_PRODUCTS_TO_COLLECT} товаров")
+            log.info("\n🎉 ЦЕЛЬ ДОСТИГНУТА! Собрано %s товаров", MIN_PRODUCTS_TO_COLLECT)
         elif checked_products >= MAX_PRODUCTS_TO_CHECK:
-            log.warning(f"\n⚠️ Достигнут лимит проверок ({MAX_PRODUCTS_TO_CHECK} товаров)")
-            log.warning(f"   Собрано только {successful_products} товаров из {MIN_PRODUCTS_TO_COLLECT}")
+            log.warning("\n⚠️ Достигнут лимит проверок (%s товаров)", MAX_PRODUCTS_TO_CHECK)
+            log.warning("   Собрано только %s товаров из %s", successful_products, MIN_PRODUCTS_TO_COLLECT)
         
         # 9. Создание summary-файла итерации с подробной аналитикой
-        log.info("\n" + "=" * 60)
+        log.info("\n" + SEP60)
         log.info("📝 Создание summary-файла итерации с аналитикой видео...")
-        log.info("=" * 60)
+        log.info(SEP60)
         try:
-            from datetime import datetime
-            import os
-            
             summary_dir = "logs/summaries"
             os.makedirs(summary_dir, exist_ok=True)
             
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
             summary_file = f"{summary_dir}/iteration_{timestamp}.md"
             
-            with open(summary_file, "w", encoding="utf-8") as f:
-                f.write(f"# 📊 Итерация тестирования: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                
-                f.write("## ✅ Результаты\n\n")
-                f.write(f"- **Успешно обработано:** {successful_products} товаров\n")
-                f.write(f"- **Пропущено:** {len(skipped_products)} товаров\n")
-                f.write(f"- **Проверено:** {checked_products} товаров\n")
-                f.write(f"- **Ban-list:** {len(banned_products)} товаров\n\n")
-                
-                if successful_products > 0:
-                    f.write("### 🎉 SUCCESS\n\n")
-                    f.write(f"✅ Обработано {successful_products} товаров с >= 3 видео\n\n")
+            # Документ собирается в памяти и пишется на диск одним вызовом
+            parts: List[str] = []
+            parts.append(f"# 📊 Итерация тестирования: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            
+            parts.append("## ✅ Результаты\n\n")
+            parts.append(f"- **Успешно обработано:** {successful_products} товаров\n")
+            parts.append(f"- **Пропущено:** {len(skipped_products)} товаров\n")
+            parts.append(f"- **Проверено:** {checked_products} товаров\n")
+            parts.append(f"- **Ban-list:** {len(banned_products)} товаров\n\n")
+            
+            if successful_products > 0:
+                parts.append("### 🎉 SUCCESS\n\n")
+                parts.append(f"✅ Обработано {successful_products} товаров с >= 3 видео\n\n")
+            
+            # ═══════════════════════════════════════════════════════
+            # НОВЫЙ БЛОК: Подробная аналитика ТОП-3 видео по товарам
+            # ═══════════════════════════════════════════════════════
+            if all_products_analytics:
+                parts.append("---\n\n")
+                parts.append("## 📹 Подробная аналитика видео по товарам\n\n")
+                parts.append(f"**Критерии фильтрации:** >= 5K impressions, возраст <= 30 дней\n\n")
                 
-                # ═══════════════════════════════════════════════════════
-                # НОВЫЙ БЛОК: Подробная аналитика ТОП-3 видео по товарам
-                # ═══════════════════════════════════════════════════════
-                if all_products_analytics:
-                    f.write("---\n\n")
-                    f.write("## 📹 Подробная аналитика видео по товарам\n\n")
-                    f.write(f"**Критерии фильтрации:** >= 5K impressions, возраст <= 30 дней\n\n")
+                for idx, product in enumerate(all_products_analytics, 1):
+                    status_icon = "✅" if product["success"] else "❌"
+                    parts.append(f"### {status_icon} Товар #{idx}: {product['product_name'][:80]}\n\n")
+                    parts.append(f"- **Ссылка:** [{product['product_url']}]({product['product_url']})\n")
+                    parts.append(f"- **Статус:** {'УСПЕХ (>= 3 видео)' if product['success'] else 'ПРОПУЩЕН (< 3 видео)'}\n")
+                    parts.append(f"- **Найдено подходящих видео:** {product['videos_found']}\n\n")
                     
-                    for idx, product in enumerate(all_products_analytics, 1):
-                        status_icon = "✅" if product["success"] else "❌"
-                        f.write(f"### {status_icon} Товар #{idx}: {product['product_name'][:80]}\n\n")
-                        f.write(f"- **Ссылка:** [{product['product_url']}]({product['product_url']})\n")
-                        f.write(f"- **Статус:** {'УСПЕХ (>= 3 видео)' if product['success'] else 'ПРОПУЩЕН (< 3 видео)'}\n")
-                        f.write(f"- **Найдено подходящих видео:** {product['videos_found']}\n\n")
-                        
-                        # ТОП-3 видео (даже если они не проходят критерии)
-                        if product['top_3_videos']:
-                            f.write("#### 🏆 ТОП-3 видео по impression:\n\n")
-                            for video in product['top_3_videos']:
-                                impression = video['impression']
-                                first_seen = video['first_seen']
-                                ad_url = video['ad_search_url']
-                                
-                                # Проверка на соответствие критериям
-                                meets_criteria = impression >= 5000  # Проверка impression
-                                criteria_icon = "✅" if meets_criteria else "⚠️"
-                                
-                                f.write(f"{video['rank']}. {criteria_icon} **{impression:,} impressions** | "
-                                       f"First seen: {first_seen}\n")
-                                if ad_url and ad_url != 'N/A':
-                                    f.write(f"   - Ссылка: [{ad_url}]({ad_url})\n")
-                                f.write("\n")
-                        else:
-                            f.write("   ⚠️ Нет данных о видео (возможно, ошибка парсинга)\n\n")
-                        
-                        f.write("---\n\n")
-                
-                # Пропущенные товары
-                if skipped_products:
-                    f.write("### ⏭️ ПРОПУЩЕННЫЕ ТОВАРЫ (краткий список)\n\n")
-                    for i, skipped in enumerate(skipped_products, 1):
-                        f.write(f"{i}. **{skipped['name'][:60]}...**\n")
-                        f.write(f"   - Причина: {skipped['reason']}\n")
-                        f.write(f"   - Видео найдено: {skipped['videos_found']}\n\n")
-                
-                # Ban-list
-                if banned_products:
-                    f.write("### 🚫 Ban-list (обработанные товары)\n\n")
-                    for i, product_url in enumerate(sorted(banned_products), 1):
-                        f.write(f"{i}. `{product_url}`\n")
-                    f.write("\n")
-                
-                f.write("## 🔍 Технические детали\n\n")
-                f.write(f"- **Целевое количество:** {MIN_PRODUCTS_TO_COLLECT} товаров\n")
-                f.write(f"- **Лимит проверок:** {MAX_PRODUCTS_TO_CHECK} товаров\n")
-                f.write(f"- **Критерии видео:** >= 5K impressions, <= 30 дней\n\n")
-                
-                if successful_products >= MIN_PRODUCTS_TO_COLLECT:
-                    f.write("## 🎯 Статус: ЦЕЛЬ ДОСТИГНУТА ✅\n\n")
-                elif checked_products >= MAX_PRODUCTS_TO_CHECK:
-                    f.write("## ⚠️ Статус: Достигнут лимит проверок\n\n")
-                else:
-                    f.write("## ❌ Статус: Прервано\n\n")
+                    # ТОП-3 видео (даже если они не проходят критерии)
+                    if product['top_3_videos']:
+                        parts.append("#### 🏆 ТОП-3 видео по impression:\n\n")
+                        for video in product['top_3_videos']:
+                            impression = video['impression']
+                            first_seen = video['first_seen']
+                            ad_url = video['ad_search_url']
+                            
+                            # Проверка на соответствие критериям
+                            meets_criteria = impression >= 5000  # Проверка impression
+                            criteria_icon = "✅" if meets_criteria else "⚠️"
+                            
+                            parts.append(f"{video['rank']}. {criteria_icon} **{impression:,} impressions** | "
+                                         f"First seen: {first_seen}\n")
+                            if ad_url and ad_url != 'N/A':
+                                parts.append(f"   - Ссылка: [{ad_url}]({ad_url})\n")
+                            parts.append("\n")
+                    else:
+                        parts.append("   ⚠️ Нет данных о видео (возможно, ошибка парсинга)\n\n")
+                    
+                    parts.append("---\n\n")
+            
+            # Пропущенные товары
+            if skipped_products:
+                parts.append("### ⏭️ ПРОПУЩЕННЫЕ ТОВАРЫ (краткий список)\n\n")
+                for i, skipped in enumerate(skipped_products, 1):
+                    parts.append(f"{i}. **{skipped['name'][:60]}...**\n")
+                    parts.append(f"   - Причина: {skipped['reason']}\n")
+                    parts.append(f"   - Видео найдено: {skipped['videos_found']}\n\n")
             
-            log.info(f"✅ Summary с аналитикой сохранен: {summary_file}")
+            # Ban-list
+            if banned_products:
+                parts.append("### 🚫 Ban-list (обработанные товары)\n\n")
+                for i, product_url in enumerate(sorted(banned_products), 1):
+                    parts.append(f"{i}. `{product_url}`\n")
+                parts.append("\n")
+            
+            parts.append("## 🔍 Технические детали\n\n")
+            parts.append(f"- **Целевое количество:** {MIN_PRODUCTS_TO_COLLECT} товаров\n")
+            parts.append(f"- **Лимит проверок:** {MAX_PRODUCTS_TO_CHECK} товаров\n")
+            parts.append(f"- **Критерии видео:** >= 5K impressions, <= 30 дней\n\n")
+            
+            if successful_products >= MIN_PRODUCTS_TO_COLLECT:
+                parts.append("## 🎯 Статус: ЦЕЛЬ ДОСТИГНУТА ✅\n\n")
+            elif checked_products >= MAX_PRODUCTS_TO_CHECK:
+                parts.append("## ⚠️ Статус: Достигнут лимит проверок\n\n")
+            else:
+                parts.append("## ❌ Статус: Прервано\n\n")
+            
+            # Запись - в потоке, чтобы не блокировать event loop
+            await asyncio.to_thread(Path(summary_file).write_text, "".join(parts), encoding="utf-8")
+            
+            log.info("✅ Summary с аналитикой сохранен: %s", summary_file)
         except Exception as e:
-            log.error(f"❌ Ошибка при создании summary: {e}")
-            import traceback
+            log.error("❌ Ошибка при создании summary: %s", e)
             log.error(traceback.format_exc())
         
-        log.info("\n" + "=" * 60)
+        log.info("\n" + SEP60)
         log.info("✅ ТЕСТИРОВАНИЕ ЗАВЕРШЕНО УСПЕШНО")
-        log.info("=" * 60)
+        log.info(SEP60)
         
         # Удаление неполных строк из Google Sheets
         if sheets_writer and sheets_writer.worksheet:
             log.info("\n🧹 Удаление неполных строк из Google Sheets...")
-            deleted_count = sheets_writer.delete_incomplete_rows()
+            deleted_count = await asyncio.to_thread(sheets_writer.delete_incomplete_rows)
             if deleted_count > 0:
-                log.info(f"✅ Удалено {deleted_count} неполных строк")
+                log.info("✅ Удалено %s неполных строк", deleted_count)
             else:
                 log.info("✅ Неполных строк не найдено")
         
-        # Задержка перед закрытием (для просмотра результата)
-        log.info("\n⏸️ Ожидание 10 секунд перед закрытием браузера (для просмотра результата)...")
-        log.info("   Нажмите Ctrl+C, если хотите закрыть раньше")
-        try:
-            await asyncio.sleep(10)
-        except KeyboardInterrupt:
-            log.info("   Прервано пользователем")
+        # Пауза перед закрытием (для просмотра результата) - только с видимым окном
+        if not config.BROWSER_HEADLESS:
+            log.info("\n⏸️ Браузер открыт для просмотра результата")
+            wait_for_enter("   Нажмите Enter для закрытия...")
         
     except KeyboardInterrupt:
         log.warning("\n⚠️ Прервано пользователем (Ctrl+C)")
     except Exception as e:
-        log.error(f"\n{'='*60}")
-        log.error(f"❌ КРИТИЧЕСКАЯ ОШИБКА при тестировании: {e}")
-        log.error(f"{'='*60}")
-        import traceback
+        log.error("\n" + SEP60)
+        log.error("❌ КРИТИЧЕСКАЯ ОШИБКА при тестировании: %s", e)
+        log.error(SEP60)
         log.error("Полная трассировка:")
         log.error(traceback.format_exc())
         
         # Сохраняем скриншот при ошибке
         if browser_manager and browser_manager.page:
             try:
-                screenshot_path = config.SCREENSHOTS_DIR / f"error_test_{int(asyncio.get_event_loop().time())}.png"
-                await browser_manager.page.screenshot(path=str(screenshot_path), full_page=True)
-                log.info(f"📸 Скриншот сохранен: {screenshot_path}")
+                # Видимая область в JPEG - быстрее полностраничного PNG
+                screenshot_path = config.SCREENSHOTS_DIR / f"error_test_{int(asyncio.get_event_loop().time())}.jpg"
+                await browser_manager.page.screenshot(
+                    path=str(screenshot_path),
+                    type="jpeg",
+                    quality=60,
+                    full_page=DEBUG_FULLPAGE_SCREENSHOT,
+                    timeout=5000  # зависшая страница не должна задерживать обработку ошибки
+                )
+                log.info("📸 Скриншот сохранен: %s", screenshot_path)
             except Exception as e2:
-                log.error(f"Не удалось сохранить скриншот: {e2}")
+                log.error("Не удалось сохранить скриншот: %s", e2)
         
-        log.error("\n⚠️ Браузер останется открытым для отладки на 30 секунд...")
-        try:
-            await asyncio.sleep(30)
-        except:
-            pass
+        if not config.BROWSER_HEADLESS:
+            log.error("\n⚠️ Браузер остается открытым для отладки")
+            wait_for_enter("   Нажмите Enter для закрытия...")
     
     finally:
+        if PERSIST_BAN_LIST and banned_products:
+            try:
+                BAN_LIST_FILE.write_text(json.dumps(sorted(banned_products), ensure_ascii=False), encoding="utf-8")
+            except OSError as e:
+                log.warning("⚠️ Не удалось сохранить ban-list: %s", e)
         if browser_manager:
             await browser_manager.close()
 
 
 if __name__ == "__main__":
+    # uvloop (Linux/macOS), если установлен - быстрее стандартного event loop
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(test_parser_engine())
 
@@ -8,12 +8,13 @@ from pathlib import Path
 
 try:
     import gspread
-    from google.oauth2.service_account import Credentials
+    from src.sheets_writer import get_client
 except ImportError:
     print("❌ ОШИБКА: Библиотеки не установлены!")
     print("   Установите: pip install gspread google-auth google-auth-oauthlib")
     sys.exit(1)
 
+
 def write_test_to_sheets():
     """Записывает 'тест' в Google Sheets"""
     
@@ -28,36 +29,29 @@ def write_test_to_sheets():
         return False
     
     try:
-        # Настройка credentials
-        SCOPE = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_file(
-            str(credentials_path),
-            scopes=SCOPE
-        )
-        
-        # Подключение к таблице
-        client = gspread.authorize(credentials)
+        # Подключение к таблице и открытие листа
         spreadsheet_id = "1VJMixODvnIPBf7EjFoJ8XMH1lepycVlXREKQI7MVxWQ"
-        spreadsheet = client.open_by_key(spreadsheet_id)
-        print(f"✅ Таблица открыта: {spreadsheet.title}")
-        
-        # Открытие листа
         sheet_name = "шаблон выгрузуи 1.0"
+        spreadsheet = get_client(credentials_path).open_by_key(spreadsheet_id)
+        print(f"✅ Таблица открыта: {spreadsheet.title}")
         worksheet = spreadsheet.worksheet(sheet_name)
         print(f"✅ Лист найден: '{sheet_name}'")
         
         # Запись "тест" в ячейку (используем ячейку, которая не используется - например Z100)
         # Или можно в A1 для проверки, но лучше в безопасное место
         test_cell = "Z100"  # Безопасная ячейка, которая не используется
-        worksheet.update_acell(test_cell, "тест")  # Используем update_acell для одной ячейки
+        # Запись и чтение записанного значения - одним запросом (includeValuesInResponse)
+        response = worksheet.update(
+            range_name=test_cell,
+            values=[["тест"]],
+            value_input_option="USER_ENTERED",
+            include_values_in_response=True
+        )
         print(f"✅ Записано 'тест' в ячейку {test_cell}")
         
         # Проверка записи
-        value = worksheet.acell(test_cell).value
+        written = response.get("updatedData", {}).get("values", [[None]])
+        value = written[0][0] if written and written[0] else None
         if value == "тест":
             print(f"✅ Проверка: значение в {test_cell} = '{value}'")
             print("\n" + "=" * 50)